@@ -0,0 +1,336 @@
+"""
+Benchmark lado a lado: stack gRPC (service-a/b-python) vs REST (rest_version).
+
+Sobe cada stack localmente como subprocessos (um de cada vez, pois usam as
+mesmas portas 50051/50052), executa a mesma carga nos dois e grava um JSON
+com os resultados para comparar execuções ao longo do tempo.
+
+Cargas:
+  register  - rajada de registros (jogos x jogadores)
+  draw      - sorteios por jogo
+  mark      - cada jogador marca os números sorteados do seu jogo
+  bingo     - cada jogador confere o bingo
+
+Métricas por carga: vazão, latência p50/p95/p99, CPU dos servidores por
+requisição (via /proc, só Linux) e bytes de corpo por requisição (pedido +
+resposta: mensagens protobuf no gRPC, JSON no REST). Cabeçalhos e
+enquadramento ficam de fora nos dois: HTTP/2 comprime cabeçalhos com HPACK
+e não dá para medi-los do mesmo jeito que os do HTTP/1.1. Os ids que o REST
+leva na URL também ficam de fora, então a coluna compara a codificação dos
+corpos, não o tráfego total.
+
+Uso:
+  python benchmarks/compare_stacks.py
+  python benchmarks/compare_stacks.py --stacks grpc --games 50 --players 40
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRPC_GAME_DIR = os.path.join(ROOT, "service-a-python")
+GRPC_VALIDATION_DIR = os.path.join(ROOT, "service-b-python")
+REST_GAME_DIR = os.path.join(ROOT, "rest_version", "service-a-python")
+REST_VALIDATION_DIR = os.path.join(ROOT, "rest_version", "service-b-python")
+
+GAME_PORT = 50051
+VALIDATION_PORT = 50052
+
+WORKLOADS = ("register", "draw", "mark", "bingo")
+
+
+# ==========================================
+# Processos dos serviços
+# ==========================================
+
+def _cpu_seconds(pid):
+    """CPU (user + system) consumida pelo processo, lida de /proc."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _wait_port(port, timeout=20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Porta {port} não respondeu em {timeout}s")
+
+
+class Stack:
+    def __init__(self, name, processes):
+        self.name = name
+        self.specs = processes  # [(cwd, script, env_extra, port)]
+        self.procs = []
+
+    def __enter__(self):
+        for cwd, script, env_extra, port in self.specs:
+            env = dict(os.environ, PYTHONUNBUFFERED="1", **env_extra)
+            proc = subprocess.Popen(
+                [sys.executable, script], cwd=cwd, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            self.procs.append(proc)
+            _wait_port(port)
+        return self
+
+    def __exit__(self, *exc):
+        for proc in reversed(self.procs):
+            proc.terminate()
+        for proc in self.procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def cpu_seconds(self):
+        values = [_cpu_seconds(p.pid) for p in self.procs]
+        return None if any(v is None for v in values) else sum(values)
+
+
+def grpc_stack():
+    return Stack("grpc", [
+        (GRPC_VALIDATION_DIR, "validation_service.py", {}, VALIDATION_PORT),
+        # O stack REST não tem limite de taxa por jogador; desligado aqui para comparar igual
+        (GRPC_GAME_DIR, "game_service.py",
+         {"VALIDATION_SERVICE_ADDR": f"localhost:{VALIDATION_PORT}", "RATE_LIMIT_ENABLED": "0"}, GAME_PORT),
+    ])
+
+
+def rest_stack():
+    return Stack("rest", [
+        (REST_VALIDATION_DIR, "validation_service.py", {"PORT": str(VALIDATION_PORT)}, VALIDATION_PORT),
+        (REST_GAME_DIR, "game_service.py",
+         {"PORT": str(GAME_PORT), "VALIDATION_SERVICE_ADDR": f"localhost:{VALIDATION_PORT}"}, GAME_PORT),
+    ])
+
+
+# ==========================================
+# Clientes (mesma interface para os dois stacks)
+# Cada método retorna (resultado, bytes de corpo trocados)
+# ==========================================
+
+class GrpcDriver:
+    def __init__(self):
+        sys.path.insert(0, GRPC_GAME_DIR)
+        import grpc
+        import bingo_pb2
+        import bingo_pb2_grpc
+        self.pb = bingo_pb2
+        self.channel = grpc.insecure_channel(f"localhost:{GAME_PORT}")
+        grpc.channel_ready_future(self.channel).result(timeout=10)
+        self.stub = bingo_pb2_grpc.GameServiceStub(self.channel)
+
+    def close(self):
+        self.channel.close()
+
+    def _call(self, method, request):
+        response = method(request)
+        return response, request.ByteSize() + response.ByteSize()
+
+    def create_game(self, name):
+        resp, size = self._call(self.stub.CreateGame, self.pb.CreateGameRequest(game_name=name))
+        return resp.game_id, size
+
+    def register(self, game_id, name):
+        resp, size = self._call(self.stub.RegisterPlayer,
+                                self.pb.RegisterPlayerRequest(game_id=game_id, player_name=name))
+        return (resp.player_id, list(resp.card_numbers)) if resp.success else None, size
+
+    def draw(self, game_id):
+        resp, size = self._call(self.stub.DrawNumber, self.pb.DrawNumberRequest(game_id=game_id))
+        return resp.number if resp.success else None, size
+
+    def mark(self, game_id, player_id, number):
+        resp, size = self._call(self.stub.MarkNumber, self.pb.MarkNumberRequest(
+            game_id=game_id, player_id=player_id, number=number))
+        return resp.success, size
+
+    def check(self, game_id, player_id):
+        resp, size = self._call(self.stub.CheckBingo,
+                                self.pb.CheckBingoRequest(game_id=game_id, player_id=player_id))
+        return resp.bingo, size
+
+
+class RestDriver:
+    def __init__(self, concurrency):
+        import httpx
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        self.client = httpx.Client(base_url=f"http://localhost:{GAME_PORT}", limits=limits, timeout=30.0)
+
+    def close(self):
+        self.client.close()
+
+    def _call(self, method, url, **kwargs):
+        resp = self.client.request(method, url, **kwargs)
+        resp.raise_for_status()
+        # Só os corpos, como request/response.ByteSize() no GrpcDriver
+        return resp.json(), len(resp.request.content or b"") + len(resp.content)
+
+    def create_game(self, name):
+        data, size = self._call("POST", "/games", json={"game_name": name})
+        return data["game_id"], size
+
+    def register(self, game_id, name):
+        data, size = self._call("POST", f"/games/{game_id}/players", json={"player_name": name})
+        return (data["player_id"], data["card_numbers"]) if data.get("success") else None, size
+
+    def draw(self, game_id):
+        data, size = self._call("POST", f"/games/{game_id}/draw")
+        return data.get("number") if data.get("success") else None, size
+
+    def mark(self, game_id, player_id, number):
+        data, size = self._call("POST", f"/players/{player_id}/mark", json={"number": number})
+        return data.get("success", False), size
+
+    def check(self, game_id, player_id):
+        data, size = self._call("GET", f"/games/{game_id}/bingo", params={"player_id": player_id})
+        return data.get("bingo", False), size
+
+
+# ==========================================
+# Execução das cargas
+# ==========================================
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_workload(stack, fn, items, concurrency):
+    """Executa ``fn(*item)`` para cada item e devolve (resultados, estatísticas)."""
+    def timed(item):
+        start = time.perf_counter()
+        try:
+            result, size = fn(*item)
+            return result, size, time.perf_counter() - start, False
+        except Exception:
+            return None, 0, time.perf_counter() - start, True
+
+    cpu_before = stack.cpu_seconds()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed, items))
+    elapsed = time.perf_counter() - start
+    cpu_after = stack.cpu_seconds()
+
+    latencies = sorted(o[2] for o in outcomes)
+    count = len(outcomes)
+    errors = sum(1 for o in outcomes if o[3])
+    stats = {
+        "requests": count,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "cpu_ms_per_request": (
+            round((cpu_after - cpu_before) * 1000 / count, 4)
+            if count and cpu_before is not None and cpu_after is not None else None
+        ),
+        "body_bytes_per_request": round(sum(o[1] for o in outcomes) / count, 1) if count else 0.0,
+    }
+    return [o[0] for o in outcomes], stats
+
+
+def run_stack(stack_factory, driver_factory, args):
+    with stack_factory() as stack:
+        driver = driver_factory()
+        try:
+            game_ids = [driver.create_game(f"bench-{i}")[0] for i in range(args.games)]
+            results = {}
+
+            items = [(gid, f"p{g}-{p}") for g, gid in enumerate(game_ids) for p in range(args.players)]
+            registered, results["register"] = run_workload(stack, driver.register, items, args.concurrency)
+            players = [(gid, reg[0]) for (gid, _), reg in zip(items, registered) if reg]
+
+            items = [(gid,) for gid in game_ids for _ in range(args.draws)]
+            drawn, results["draw"] = run_workload(stack, driver.draw, items, args.concurrency)
+            drawn_by_game = {}
+            for (gid,), number in zip(items, drawn):
+                if number:
+                    drawn_by_game.setdefault(gid, []).append(number)
+
+            items = [(gid, pid, n) for gid, pid in players for n in drawn_by_game.get(gid, [])[:args.marks]]
+            _, results["mark"] = run_workload(stack, driver.mark, items, args.concurrency)
+
+            items = [(gid, pid) for gid, pid in players]
+            _, results["bingo"] = run_workload(stack, driver.check, items, args.concurrency)
+            return results
+        finally:
+            driver.close()
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(all_results):
+    print(f"\n{'stack':<6} {'carga':<9} {'req':>7} {'err':>5} {'req/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cpu ms/req':>11} {'body B/req':>10}")
+    for stack, results in all_results.items():
+        for workload in WORKLOADS:
+            r = results[workload]
+            cpu = "-" if r["cpu_ms_per_request"] is None else f"{r['cpu_ms_per_request']:.3f}"
+            print(f"{stack:<6} {workload:<9} {r['requests']:>7} {r['errors']:>5} {r['throughput_rps']:>9.1f} "
+                  f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {cpu:>11} {r['body_bytes_per_request']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stacks", nargs="+", choices=("grpc", "rest"), default=["grpc", "rest"])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=25, help="jogadores por jogo")
+    parser.add_argument("--draws", type=int, default=75, help="sorteios por jogo")
+    parser.add_argument("--marks", type=int, default=75, help="marcações por jogador (limitado aos sorteados)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: benchmarks/results/)")
+    args = parser.parse_args()
+
+    stacks = {
+        "grpc": (grpc_stack, GrpcDriver),
+        "rest": (rest_stack, lambda: RestDriver(args.concurrency)),
+    }
+
+    all_results = {}
+    for name in args.stacks:
+        stack_factory, driver_factory = stacks[name]
+        print(f"[BENCH] ▶ Rodando stack {name}...")
+        all_results[name] = run_stack(stack_factory, driver_factory, args)
+
+    print_table(all_results)
+
+    timestamp = datetime.now(timezone.utc)
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"stacks-{timestamp.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "timestamp": timestamp.isoformat(),
+            "git_revision": git_revision(),
+            "config": vars(args),
+            "results": all_results,
+        }, f, indent=2)
+    print(f"\n[BENCH] ✓ Resultados salvos em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+Microbenchmarks dos caminhos quentes do domínio, sem rede.
+
+Chama os métodos dos servicers diretamente com um contexto falso e com o
+ValidationService ligado em processo ao GameService:
+
+  register_player  - GameService.RegisterPlayer (+ RegisterCard)
+  draw_number      - GameService.DrawNumber, 75 sorteios por jogo
+  validate_number  - ValidationService.ValidateNumber
+  validate_bingo   - ValidationService.ValidateBingo (com 75 sorteados)
+
+Para cada um mede ops/s e bytes retidos por operação (tracemalloc, em uma
+passada separada para não distorcer o tempo). Compara com o baseline salvo
+e termina com código 1 se algum valor regrediu além da tolerância.
+
+ops/s absoluto só faz sentido na mesma máquina: o baseline não é versionado
+e guarda a máquina onde foi gravado (host, CPU, Python). Grave-o localmente
+no commit de referência antes de comparar. Sem baseline desta máquina (ou
+sem algum dos cenários medidos nele) o script não tem com o que comparar e
+termina com código 2: um gate que passa sem comparar não pega regressão.
+O mesmo vale se o cenário foi gravado com outros parâmetros (--players,
+--games, --ops): cada cenário guarda no baseline os parâmetros que usa.
+
+Uso:
+  git stash && python benchmarks/microbench.py --save-baseline && git stash pop
+  python benchmarks/microbench.py                  # compara com o baseline local
+  python benchmarks/microbench.py --players 100000 --games 2000
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "service-b-python"))
+sys.path.insert(0, os.path.join(ROOT, "service-a-python"))
+
+import grpc  # noqa: E402
+import bitmap  # noqa: E402
+import bingo_pb2  # noqa: E402
+import game_service  # noqa: E402
+import validation_service  # noqa: E402
+from card_generator import CardPool  # noqa: E402
+from validation_client import ValidationClient  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "microbench_baseline.json")
+
+
+class FakeContext:
+    """Contexto gRPC mínimo para chamar os servicers diretamente."""
+
+    def __init__(self, metadata=()):
+        self._metadata = tuple(metadata)
+        self.code = None
+        self.details = None
+
+    def invocation_metadata(self):
+        return self._metadata
+
+    def time_remaining(self):
+        return None
+
+    def is_active(self):
+        return True
+
+    def peer(self):
+        return "ipv4:127.0.0.1:0"
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+    def set_trailing_metadata(self, metadata):
+        pass
+
+    def add_callback(self, callback):
+        return True
+
+    def abort(self, code, details):
+        self.code = code
+        self.details = details
+        raise grpc.RpcError(details)
+
+
+class InProcessValidationStub:
+    """Encaminha as chamadas do GameService direto ao ValidationServiceServicer."""
+
+    def __init__(self, servicer):
+        self._servicer = servicer
+
+    def __getattr__(self, name):
+        method = getattr(self._servicer, name)
+        return lambda request, timeout=None, metadata=None, **kwargs: method(request, FakeContext(metadata or ()))
+
+
+# ==========================================
+# Cenários
+# ==========================================
+
+def make_services(players):
+    validation = validation_service.ValidationServiceServicer()
+    pool = CardPool(capacity=players, batch_size=5000).fill()
+    game = game_service.GameServiceServicer(ValidationClient(InProcessValidationStub(validation)), pool)
+    return game, validation
+
+
+def scenario_register_player(args):
+    game, _ = make_services(args.players)
+    ctx = FakeContext()
+    game_ids = [game.CreateGame(bingo_pb2.CreateGameRequest(game_name=f"g{i}"), ctx).game_id
+                for i in range(max(1, args.players // 1000))]
+    requests = [bingo_pb2.RegisterPlayerRequest(game_id=game_ids[i % len(game_ids)], player_name=f"p{i}")
+                for i in range(args.players)]
+
+    def run():
+        for request in requests:
+            game.RegisterPlayer(request, ctx)
+    return run, len(requests)
+
+
+def scenario_draw_number(args):
+    game, _ = make_services(0)
+    ctx = FakeContext()
+    requests = [bingo_pb2.DrawNumberRequest(
+        game_id=game.CreateGame(bingo_pb2.CreateGameRequest(game_name=f"g{i}"), ctx).game_id)
+        for i in range(args.games)]
+
+    def run():
+        for _ in range(75):
+            for request in requests:
+                game.DrawNumber(request, ctx)
+    return run, 75 * len(requests)
+
+
+def _registered_players(args):
+    game, validation = make_services(args.players)
+    ctx = FakeContext()
+    game_id = game.CreateGame(bingo_pb2.CreateGameRequest(game_name="bench"), ctx).game_id
+    players = [game.RegisterPlayer(bingo_pb2.RegisterPlayerRequest(game_id=game_id, player_name=f"p{i}"), ctx)
+               for i in range(args.players)]
+    return validation, players
+
+
+def scenario_validate_number(args):
+    validation, players = _registered_players(args)
+    ctx = FakeContext()
+    rng = random.Random(1)
+    requests = [bingo_pb2.ValidateNumberRequest(player_id=rng.choice(players).player_id,
+                                                number=rng.randint(1, 75))
+                for _ in range(args.ops)]
+
+    def run():
+        for request in requests:
+            validation.ValidateNumber(request, ctx)
+    return run, len(requests)
+
+
+def scenario_validate_bingo(args):
+    validation, players = _registered_players(args)
+    ctx = FakeContext()
+    drawn = random.Random(2).sample(range(1, 76), 75)
+    for player in players:
+        for number in drawn[:40]:
+            validation.ValidateNumber(bingo_pb2.ValidateNumberRequest(player_id=player.player_id, number=number), ctx)
+    drawn_bitmap = bitmap.encode(bitmap.numbers_mask(drawn))
+    requests = [bingo_pb2.ValidateBingoRequest(player_id=p.player_id, numbers_bitmap=drawn_bitmap) for p in players]
+
+    def run():
+        for request in requests:
+            validation.ValidateBingo(request, ctx)
+    return run, len(requests)
+
+
+SCENARIOS = {
+    "register_player": scenario_register_player,
+    "draw_number": scenario_draw_number,
+    "validate_number": scenario_validate_number,
+    "validate_bingo": scenario_validate_bingo,
+}
+
+# Argumentos que mudam o trabalho de cada cenário; gravados junto no baseline
+SCENARIO_PARAMS = {
+    "register_player": ("players",),
+    "draw_number": ("games",),
+    "validate_number": ("players", "ops"),
+    "validate_bingo": ("players",),
+}
+
+
+# ==========================================
+# Medição
+# ==========================================
+
+def measure(name, args):
+    scenario = SCENARIOS[name]
+    # Tempo: melhor de N repetições, cada uma com estado novo
+    best = None
+    for _ in range(args.repeat):
+        run, ops = scenario(args)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Alocações: passada separada com tracemalloc ligado
+    run, ops = scenario(args)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    run()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "params": {param: getattr(args, param) for param in SCENARIO_PARAMS[name]},
+        "ops": ops,
+        "ops_per_sec": round(ops / best, 1),
+        "retained_bytes_per_op": round(max(0, after - before) / ops, 1),
+        "peak_kib": round((peak - before) / 1024, 1),
+    }
+
+
+def machine_info():
+    """Identifica a máquina: ops/s de máquinas diferentes não são comparáveis."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return {
+        "host": platform.node(),
+        "cpu": cpu,
+        "cpus": os.cpu_count(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+    }
+
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for name, result in results.items():
+        base = baseline[name]
+        min_ops = base["ops_per_sec"] * (1 - tolerance)
+        if result["ops_per_sec"] < min_ops:
+            failures.append(f"{name}: ops/s {result['ops_per_sec']:,.0f} < {min_ops:,.0f} "
+                            f"(baseline {base['ops_per_sec']:,.0f})")
+        # Folga absoluta de 16 bytes para ruído do alocador em cenários quase sem retenção
+        max_bytes = base["retained_bytes_per_op"] * (1 + tolerance) + 16
+        if result["retained_bytes_per_op"] > max_bytes:
+            failures.append(f"{name}: bytes/op {result['retained_bytes_per_op']:,.1f} > {max_bytes:,.1f} "
+                            f"(baseline {base['retained_bytes_per_op']:,.1f})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"cenários a rodar (padrão: todos) - {', '.join(SCENARIOS)}")
+    parser.add_argument("--players", type=int, default=20000, help="jogadores registrados (até 100k)")
+    parser.add_argument("--games", type=int, default=1000, help="jogos no cenário de sorteio")
+    parser.add_argument("--ops", type=int, default=100000, help="chamadas de ValidateNumber")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="regressão máxima aceita (fração)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"cenário desconhecido: {', '.join(unknown)}")
+    results = {}
+    print(f"{'cenário':<16} {'ops':>8} {'ops/s':>12} {'bytes/op':>9} {'pico KiB':>9}")
+    for name in names:
+        # Os serviços imprimem a cada chamada; o benchmark mede só a lógica.
+        # devnull e não StringIO: o texto guardado contaria como bytes retidos
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = measure(name, args)
+        results[name] = result
+        print(f"{name:<16} {result['ops']:>8} {result['ops_per_sec']:>12,.0f} "
+              f"{result['retained_bytes_per_op']:>9,.1f} {result['peak_kib']:>9,.1f}")
+
+    machine = machine_info()
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != machine:
+            baseline = None if not args.save_baseline else {}
+            print(f"\n⚠️  Baseline em {args.baseline} é de outra máquina; ignorado")
+
+    if args.save_baseline:
+        scenarios = (baseline or {}).get("scenarios", {})
+        scenarios.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": machine, "scenarios": scenarios}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n✓ Baseline salvo em {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("\n❌ Nenhum baseline desta máquina; grave um com --save-baseline no commit de referência")
+        return 2
+    missing = [name for name in results if name not in baseline["scenarios"]]
+    if missing:
+        print(f"\n❌ Sem baseline para: {', '.join(missing)}; grave com --save-baseline no commit de referência")
+        return 2
+    mismatched = [f"{name} (baseline {baseline['scenarios'][name].get('params')}, agora {result['params']})"
+                  for name, result in results.items() if baseline["scenarios"][name].get("params") != result["params"]]
+    if mismatched:
+        print(f"\n❌ Parâmetros diferentes do baseline: {'; '.join(mismatched)}")
+        return 2
+
+    failures = compare(results, baseline["scenarios"], args.tolerance)
+    if failures:
+        print("\n❌ Regressões encontradas:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\n✓ Sem regressões em relação ao baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
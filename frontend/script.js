@@ -3,6 +3,8 @@ document.addEventListener('DOMContentLoaded', () => {
     let GAME_ID = null;
     let PLAYER_ID = null;
     let ROUND_NUMBER = 0;
+    let DRAWN = new Set(); // números já sorteados no jogo atual
+    let drawEvents = null; // EventSource de /game/draws
     const API_BASE_URL = 'http://bingo-api';
 
     // Referências aos elementos do DOM
@@ -66,6 +68,42 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Mostra um número sorteado, venha do botão ou do stream do jogo.
+    // O stream repete os números já sorteados ao reconectar: cada um conta uma vez só.
+    function showDraw(number) {
+        if (DRAWN.has(number)) {
+            return;
+        }
+        DRAWN.add(number);
+        ROUND_NUMBER = DRAWN.size;
+        roundNumberSpan.textContent = ROUND_NUMBER;
+        drawnNumberDiv.textContent = number;
+
+        // Realça o número sorteado no cartão do jogador, se existir.
+        const cellToMark = document.querySelector(`td[data-number="${number}"]`);
+        if (cellToMark && !cellToMark.classList.contains('marked')) {
+            cellToMark.classList.add('glow-on-draw'); // Adiciona classe para destaque visual temporário
+            setTimeout(() => {
+                cellToMark.classList.remove('glow-on-draw');
+            }, 1000);
+        }
+    }
+
+    // Acompanha os sorteios do jogo (inclusive os automáticos do servidor).
+    function watchDraws() {
+        if (drawEvents) {
+            drawEvents.close();
+        }
+        drawEvents = new EventSource(`${API_BASE_URL}/game/draws?game_id=${encodeURIComponent(GAME_ID)}`);
+        drawEvents.addEventListener('draw', (event) => {
+            showDraw(JSON.parse(event.data).number);
+        });
+        drawEvents.addEventListener('end', () => {
+            drawEvents.close();
+            drawBtn.disabled = true;
+        });
+    }
+
     async function startGame() {
         startGameBtn.disabled = true;
         displayMessage('Iniciando novo jogo...', 'success');
@@ -118,8 +156,10 @@ document.addEventListener('DOMContentLoaded', () => {
             drawBtn.disabled = false;
             startGameBtn.disabled = true;
             ROUND_NUMBER = 0;
+            DRAWN = new Set();
             roundNumberSpan.textContent = ROUND_NUMBER;
             drawnNumberDiv.textContent = '?';
+            watchDraws();
             displayMessage('Jogo iniciado! Cartão gerado com sucesso.', 'success');
 
         } catch (error) {
@@ -150,19 +190,8 @@ document.addEventListener('DOMContentLoaded', () => {
             const data = await response.json();
             
             if (data.success) {
-                ROUND_NUMBER++;
-                roundNumberSpan.textContent = ROUND_NUMBER;
-                drawnNumberDiv.textContent = data.number;
+                showDraw(data.number);
                 displayMessage(`Número sorteado: ${data.number}!`, 'success');
-                
-                // Realça o número sorteado no cartão do jogador, se existir.
-                const cellToMark = document.querySelector(`td[data-number="${data.number}"]`);
-                if (cellToMark && !cellToMark.classList.contains('marked')) {
-                    cellToMark.classList.add('glow-on-draw'); // Adiciona classe para destaque visual temporário
-                    setTimeout(() => {
-                        cellToMark.classList.remove('glow-on-draw');
-                    }, 1000);
-                }
 
             } else {
                 displayMessage('Erro: ' + (data.message || 'Não foi possível sortear o número.'), 'error');
@@ -187,8 +216,8 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
-        if (parseInt(drawnNumberDiv.textContent) !== number) {
-             displayMessage('Marque apenas o número que foi sorteado por último!', 'error');
+        if (!DRAWN.has(number)) {
+             displayMessage('Marque apenas números que já foram sorteados!', 'error');
              return;
         }
 
@@ -235,6 +264,9 @@ document.addEventListener('DOMContentLoaded', () => {
             if (checkData.bingo) {
                 displayMessage('PARABÉNS! VOCÊ FEZ BINGO!', 'success');
                 drawBtn.disabled = true;
+                if (drawEvents) {
+                    drawEvents.close();
+                }
             }
 
         } catch (error) {
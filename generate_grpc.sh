@@ -26,6 +26,12 @@ python3 -m grpc_tools.protoc \
     --grpc_python_out=./service-b-python \
     ./proto/bingo.proto
 
+python3 -m grpc_tools.protoc \
+    -I./proto \
+    --python_out=./stress_test \
+    --grpc_python_out=./stress_test \
+    ./proto/bingo.proto
+
 echo "[3/3] Gerando C++ para stub..."
 protoc \
     -I./proto \
@@ -0,0 +1,130 @@
+"""
+Benchmark das codificações de resposta dos serviços REST.
+
+Modo local (padrão): mede ops/s de cada codificador para os payloads mais
+pesados (registro de jogador e GetCard), incluindo o caminho padrão do
+FastAPI (validação do response_model + jsonable_encoder + json) e, se o
+bingo_pb2 estiver no PYTHONPATH, o protobuf usado pela versão gRPC.
+
+Modo HTTP: --url aponta para o GameService REST rodando e mede req/s de
+ponta a ponta para cada Accept.
+
+Uso:
+  python bench_encoding.py
+  python bench_encoding.py --url http://localhost:50051 --requests 2000
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from typing import List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import bingo_pb2
+except ImportError:
+    bingo_pb2 = None
+
+
+class RegisterPlayerResponse(BaseModel):
+    player_id: Optional[str] = None
+    card_numbers: Optional[List[int]] = None
+    success: bool
+
+
+class GetCardResponse(BaseModel):
+    card_numbers: List[int]
+
+
+def fastapi_default(model, data):
+    # O que o FastAPI faz com response_model: valida, converte e usa json.dumps
+    validated = model(**data)
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def build_encoders():
+    encoders = {
+        "fastapi-default": fastapi_default,
+        "json": lambda model, data: json.dumps(data, separators=(",", ":")).encode("utf-8"),
+    }
+    if orjson is not None:
+        encoders["orjson"] = lambda model, data: orjson.dumps(data)
+    if msgpack is not None:
+        encoders["msgpack"] = lambda model, data: msgpack.packb(data)
+    if bingo_pb2 is not None:
+        def protobuf(model, data):
+            if model is RegisterPlayerResponse:
+                return bingo_pb2.RegisterPlayerResponse(**data).SerializeToString()
+            return bingo_pb2.GetCardResponse(**data).SerializeToString()
+        encoders["protobuf"] = protobuf
+    return encoders
+
+
+def bench_local(iterations):
+    card = random.sample(range(1, 76), 24)
+    payloads = {
+        "register": (RegisterPlayerResponse,
+                     {"player_id": str(uuid.uuid4()), "card_numbers": card, "success": True}),
+        "get-card": (GetCardResponse, {"card_numbers": card}),
+    }
+    print(f"{'payload':<10} {'encoder':<16} {'ops/s':>12} {'bytes':>6}")
+    for name, (model, data) in payloads.items():
+        for enc_name, encode in build_encoders().items():
+            size = len(encode(model, data))
+            start = time.perf_counter()
+            for _ in range(iterations):
+                encode(model, data)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<10} {enc_name:<16} {iterations / elapsed:>12,.0f} {size:>6}")
+
+
+def bench_http(url, requests):
+    import httpx
+
+    accepts = {"json": "application/json"}
+    if msgpack is not None:
+        accepts["msgpack"] = "application/msgpack"
+
+    with httpx.Client(base_url=url.rstrip("/"), timeout=10.0) as client:
+        game_id = client.post("/games", json={"game_name": "bench-encoding"}).json()["game_id"]
+        print(f"{'endpoint':<10} {'accept':<10} {'req/s':>10} {'bytes':>6}")
+        for name, accept in accepts.items():
+            headers = {"accept": accept}
+            size = 0
+            start = time.perf_counter()
+            for i in range(requests):
+                resp = client.post(f"/games/{game_id}/players",
+                                   json={"player_name": f"p{i}"}, headers=headers)
+                size = len(resp.content)
+            elapsed = time.perf_counter() - start
+            print(f"{'register':<10} {name:<10} {requests / elapsed:>10,.0f} {size:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000, help="iterações por codificador (modo local)")
+    parser.add_argument("--url", help="GameService REST para o benchmark HTTP")
+    parser.add_argument("--requests", type=int, default=1000, help="requisições por Accept (modo HTTP)")
+    args = parser.parse_args()
+
+    if args.url:
+        bench_http(args.url, args.requests)
+    else:
+        bench_local(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
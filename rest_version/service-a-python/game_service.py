@@ -1,6 +1,11 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Tuple
+from prometheus_client import Gauge, make_asgi_app
+from typing import AsyncIterator, Dict, List, Literal, Optional, Set, Tuple
+import asyncio
+import json
+import os
 import uuid
 import random
 import httpx
@@ -15,6 +20,7 @@ class Game:
         self.game_name = game_name
         self.players: Dict[str, Dict[str, object]] = {}
         self.drawn_numbers: List[int] = []
+        self.winners: List[str] = []
 
     def register_player(self, player_name: str) -> Tuple[str, List[int]]:
         player_id = str(uuid.uuid4())
@@ -23,61 +29,237 @@ class Game:
         self.players[player_id] = {"name": player_name, "card": card}
         return player_id, card
 
+# -----------------------------
+# Response encoding (content negotiation)
+# -----------------------------
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack é opcional
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_ACCEPT = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+def dumps_json(data: Dict[str, object]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def encode_response(request: Request, data: Dict[str, object]) -> Response:
+    """Serializa ``data`` direto no formato pedido em Accept.
+
+    Retornar um Response pronto faz o FastAPI pular a validação do
+    response_model, que continua valendo só para a documentação.
+    """
+    accept = request.headers.get("accept", "")
+    if msgpack is not None and any(t in accept for t in MSGPACK_ACCEPT):
+        return Response(msgpack.packb(data), media_type=MSGPACK_MEDIA_TYPE)
+    return Response(dumps_json(data), media_type="application/json")
+
+# -----------------------------
+# Game events (SSE / WebSocket fan-out)
+# -----------------------------
+
+class GameEvent:
+    """Evento já serializado: o mesmo objeto é entregue a todos os assinantes."""
+
+    __slots__ = ("json", "sse")
+
+    def __init__(self, event_type: str, data: Dict[str, object]):
+        payload = dumps_json({"type": event_type, **data})
+        self.json = payload.decode("utf-8")
+        self.sse = b"event: " + event_type.encode("ascii") + b"\ndata: " + payload + b"\n\n"
+
+class EventHub:
+    """Assinantes por jogo. Cada evento é codificado uma vez por publicação.
+
+    Cada assinante tem uma fila limitada; quem não consome a tempo é
+    desconectado em vez de acumular memória no servidor.
+    """
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, game_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(game_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, game_id: str, queue: asyncio.Queue) -> None:
+        subs = self.subscribers.get(game_id)
+        if subs is not None:
+            subs.discard(queue)
+            if not subs:
+                del self.subscribers[game_id]
+
+    def publish(self, game_id: str, event_type: str, data: Dict[str, object]) -> None:
+        subs = self.subscribers.get(game_id)
+        if not subs:
+            return
+        event = GameEvent(event_type, data)
+        for queue in list(subs):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Assinante lento: sinaliza o fim e o remove
+                queue.get_nowait()
+                queue.put_nowait(None)
+                subs.discard(queue)
+
+    async def stream(self, game_id: str, queue: asyncio.Queue) -> AsyncIterator[GameEvent]:
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.unsubscribe(game_id, queue)
+
 # -----------------------------
 # Validation service (REST client)
 # -----------------------------
 
 class ValidationRESTClient:
-    def __init__(self, base_url: str = "http://localhost:50052"):
+    """Cliente assíncrono compartilhado para o ValidationService.
+
+    Um único httpx.AsyncClient mantém um pool de conexões keep-alive (e
+    HTTP/2 opcional), então as chamadas não ocupam threads do threadpool do
+    Starlette enquanto esperam a resposta.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:50052",
+        max_connections: int = 200,
+        max_keepalive_connections: int = 100,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 5.0,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.Client(timeout=5.0)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.timeout = timeout
+        # Contado aqui, não lido do pool do httpcore: em HTTP/1.1 cada
+        # requisição em andamento ocupa uma conexão, e acima de
+        # max_connections as demais esperam na fila do httpx
+        self.in_flight = 0
+        self.client: Optional[httpx.AsyncClient] = None
+        # Pede msgpack ao ValidationService quando disponível (cai para JSON se não)
+        self.headers = {"accept": MSGPACK_MEDIA_TYPE + ", application/json"} if msgpack else {}
+
+    @classmethod
+    def from_env(cls) -> "ValidationRESTClient":
+        addr = os.getenv("VALIDATION_SERVICE_ADDR", "localhost:50052")
+        return cls(
+            base_url=addr if "://" in addr else f"http://{addr}",
+            max_connections=int(os.getenv("VALIDATION_MAX_CONNECTIONS", "200")),
+            max_keepalive_connections=int(os.getenv("VALIDATION_MAX_KEEPALIVE", "100")),
+            keepalive_expiry=float(os.getenv("VALIDATION_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("VALIDATION_HTTP2", "0") == "1",
+        )
+
+    async def start(self) -> None:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                http2=self.http2,
+                timeout=self.timeout,
+            )
 
-    def register_card(self, player_id: str, card_numbers: List[int]) -> None:
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _post(self, path: str, payload: Dict[str, object]) -> Dict[str, object]:
+        self.in_flight += 1
         try:
-            resp = self.client.post(
-                f"{self.base_url}/register-card",
-                json={"player_id": player_id, "card_numbers": card_numbers},
-            )
-            resp.raise_for_status()
+            resp = await self.client.post(path, json=payload, headers=self.headers)
+        finally:
+            self.in_flight -= 1
+        resp.raise_for_status()
+        if resp.headers.get("content-type", "").startswith(MSGPACK_MEDIA_TYPE):
+            return msgpack.unpackb(resp.content)
+        return resp.json()
+
+    async def register_card(self, player_id: str, card_numbers: List[int]) -> None:
+        try:
+            await self._post("/register-card", {"player_id": player_id, "card_numbers": card_numbers})
         except httpx.HTTPError as e:
             print(f"[GAME SERVICE] Erro ao registrar cartela no ValidationService (REST): {e}")
 
-    def validate_number(self, player_id: str, number: int) -> bool:
+    async def validate_number(self, player_id: str, number: int) -> bool:
         try:
-            resp = self.client.post(
-                f"{self.base_url}/validate-number",
-                json={"player_id": player_id, "number": number},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+            data = await self._post("/validate-number", {"player_id": player_id, "number": number})
             return bool(data.get("success", False))
         except httpx.HTTPError as e:
             print(f"[GAME SERVICE] Erro ao validar número (REST): {e}")
             return False
 
-    def validate_bingo(self, player_id: str, numbers: List[int]) -> bool:
+    async def validate_bingo(self, player_id: str, numbers: List[int]) -> bool:
         try:
-            resp = self.client.post(
-                f"{self.base_url}/validate-bingo",
-                json={"player_id": player_id, "numbers": numbers},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+            data = await self._post("/validate-bingo", {"player_id": player_id, "numbers": numbers})
             return bool(data.get("bingo", False))
         except httpx.HTTPError as e:
             print(f"[GAME SERVICE] Erro ao verificar bingo (REST): {e}")
             return False
 
+    async def batch(self, operations: List[Dict[str, object]]) -> Optional[List[Dict[str, object]]]:
+        """Envia várias operações em uma única chamada ao /batch do ValidationService."""
+        if not operations:
+            return []
+        try:
+            data = await self._post("/batch", {"operations": operations})
+            return list(data.get("results", []))  # type: ignore
+        except httpx.HTTPError as e:
+            print(f"[GAME SERVICE] Erro no lote do ValidationService (REST): {e}")
+            return None
+
 # -----------------------------
 # FastAPI app & schemas
 # -----------------------------
 
 app = FastAPI(title="Game Service (REST)")
+app.mount("/metrics", make_asgi_app())
 
 games: Dict[str, Game] = {}
 player_to_game: Dict[str, str] = {}
 
-validation_client = ValidationRESTClient(base_url="http://localhost:50052")
+validation_client = ValidationRESTClient.from_env()
+events = EventHub()
+
+VALIDATION_IN_FLIGHT = Gauge(
+    "validation_http_in_flight",
+    "Requests to ValidationService waiting for a response",
+)
+VALIDATION_IN_FLIGHT.set_function(lambda: validation_client.in_flight)
+VALIDATION_MAX_CONNECTIONS = Gauge(
+    "validation_http_max_connections",
+    "Connection limit of the shared httpx pool to ValidationService",
+)
+VALIDATION_MAX_CONNECTIONS.set(validation_client.limits.max_connections or 0)
+
+@app.on_event("startup")
+async def startup():
+    await validation_client.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await validation_client.close()
 
 class CreateGameRequest(BaseModel):
     game_name: str = Field(..., description="Nome do jogo")
@@ -106,21 +288,58 @@ class MarkNumberResponse(BaseModel):
 class CheckBingoResponse(BaseModel):
     bingo: bool
 
+MAX_BATCH_SIZE = 1000
+
+class BatchOperation(BaseModel):
+    op: Literal["register", "draw", "mark", "check"]
+    game_id: Optional[str] = None
+    player_id: Optional[str] = None
+    player_name: Optional[str] = None
+    number: Optional[int] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+
+class BatchResponse(BaseModel):
+    results: List[Dict[str, object]]
+
+# -----------------------------
+# Shared game actions
+# -----------------------------
+
+def _draw(game_id: str, game: Game) -> Optional[int]:
+    if len(game.drawn_numbers) >= 75:
+        return None
+    number = random.randint(1, 75)
+    while number in game.drawn_numbers:
+        number = random.randint(1, 75)
+    game.drawn_numbers.append(number)
+
+    print(f"[GAME SERVICE] Número sorteado: {number}")
+    events.publish(game_id, "draw", {"number": number, "round": len(game.drawn_numbers)})
+    return number
+
+def _record_bingo(game_id: str, game: Game, player_id: str, bingo: bool) -> None:
+    print(f"[GAME SERVICE] Bingo verificado para {player_id}: {bingo}")
+    if bingo and player_id not in game.winners:
+        game.winners.append(player_id)
+        events.publish(game_id, "winner", {"player_id": player_id, "round": len(game.drawn_numbers)})
+
 # -----------------------------
 # Endpoints mapping 1:1 to RPCs
 # -----------------------------
 
 @app.post("/games", response_model=CreateGameResponse)
-def create_game(payload: CreateGameRequest):
+async def create_game(payload: CreateGameRequest, request: Request):
     game_id = str(uuid.uuid4())
     games[game_id] = Game(game_id, payload.game_name)
     print(f"[GAME SERVICE] Jogo criado: {payload.game_name} ({game_id})")
-    return CreateGameResponse(game_id=game_id)
+    return encode_response(request, {"game_id": game_id})
 
 @app.post("/games/{game_id}/players", response_model=RegisterPlayerResponse)
-def register_player(game_id: str, payload: RegisterPlayerRequest):
+async def register_player(game_id: str, payload: RegisterPlayerRequest, request: Request):
     if game_id not in games:
-        return RegisterPlayerResponse(success=False)
+        return encode_response(request, {"player_id": None, "card_numbers": None, "success": False})
 
     game = games[game_id]
     player_id, card = game.register_player(payload.player_name)
@@ -130,43 +349,158 @@ def register_player(game_id: str, payload: RegisterPlayerRequest):
     print(f"  Cartela: {card}")
 
     # Notify ValidationService
-    validation_client.register_card(player_id=player_id, card_numbers=card)
+    await validation_client.register_card(player_id=player_id, card_numbers=card)
     print(f"[GAME SERVICE] Cartela registrada no ValidationService para {player_id}")
 
-    return RegisterPlayerResponse(player_id=player_id, card_numbers=card, success=True)
+    return encode_response(request, {"player_id": player_id, "card_numbers": card, "success": True})
 
 @app.post("/games/{game_id}/draw", response_model=DrawNumberResponse)
-def draw_number(game_id: str):
+async def draw_number(game_id: str, request: Request):
     if game_id not in games:
-        return DrawNumberResponse(success=False)
-
-    game = games[game_id]
-    number = random.randint(1, 75)
-    while number in game.drawn_numbers:
-        number = random.randint(1, 75)
-    game.drawn_numbers.append(number)
+        return encode_response(request, {"number": None, "success": False})
 
-    print(f"[GAME SERVICE] Número sorteado: {number}")
-    return DrawNumberResponse(number=number, success=True)
+    number = _draw(game_id, games[game_id])
+    return encode_response(request, {"number": number, "success": number is not None})
 
 @app.post("/players/{player_id}/mark", response_model=MarkNumberResponse)
-def mark_number(player_id: str, payload: MarkNumberRequest):
-    ok = validation_client.validate_number(player_id=player_id, number=payload.number)
+async def mark_number(player_id: str, payload: MarkNumberRequest, request: Request):
+    ok = await validation_client.validate_number(player_id=player_id, number=payload.number)
     if ok:
         print(f"[GAME SERVICE] Número {payload.number} marcado para {player_id}")
     else:
         print(f"[GAME SERVICE] Número {payload.number} NÃO encontrado para {player_id}")
-    return MarkNumberResponse(success=ok)
+    return encode_response(request, {"success": ok})
 
 @app.get("/games/{game_id}/bingo", response_model=CheckBingoResponse)
-def check_bingo(game_id: str, player_id: str):
+async def check_bingo(game_id: str, player_id: str, request: Request):
     if game_id not in games:
         raise HTTPException(status_code=404, detail="Jogo não encontrado")
 
     game = games[game_id]
-    bingo = validation_client.validate_bingo(player_id=player_id, numbers=game.drawn_numbers)
-    print(f"[GAME SERVICE] Bingo verificado para {player_id}: {bingo}")
-    return CheckBingoResponse(bingo=bingo)
+    bingo = await validation_client.validate_bingo(player_id=player_id, numbers=game.drawn_numbers)
+    _record_bingo(game_id, game, player_id, bingo)
+    return encode_response(request, {"bingo": bingo})
+
+@app.post("/batch", response_model=BatchResponse)
+async def batch(payload: BatchRequest, request: Request):
+    """Executa as operações na ordem recebida.
+
+    As partes locais (registro, sorteio) rodam na hora; as chamadas ao
+    ValidationService são acumuladas, na mesma ordem, e enviadas em um único
+    lote no final. Cada check leva os sorteados até aquele ponto do lote.
+    """
+    if len(payload.operations) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Máximo de {MAX_BATCH_SIZE} operações por lote")
+
+    results: List[Dict[str, object]] = []
+    downstream: List[Dict[str, object]] = []
+    pending: List[Tuple[int, str]] = []  # (índice do resultado, campo a preencher)
+    checks: Dict[int, Tuple[str, Game, str]] = {}
+
+    for op in payload.operations:
+        game = games.get(op.game_id) if op.game_id else None
+
+        if op.op == "register":
+            if game is None:
+                results.append({"player_id": None, "card_numbers": None, "success": False})
+                continue
+            player_id, card = game.register_player(op.player_name or "")
+            player_to_game[player_id] = game.game_id
+            results.append({"player_id": player_id, "card_numbers": card, "success": True})
+            downstream.append({"op": "register-card", "player_id": player_id, "card_numbers": card})
+            pending.append((len(results) - 1, ""))
+
+        elif op.op == "draw":
+            number = _draw(game.game_id, game) if game is not None else None
+            results.append({"number": number, "success": number is not None})
+
+        elif op.op == "mark":
+            if not op.player_id or op.number is None:
+                results.append({"success": False})
+                continue
+            results.append({"success": False})
+            downstream.append({"op": "validate-number", "player_id": op.player_id, "number": op.number})
+            pending.append((len(results) - 1, "success"))
+
+        else:
+            if game is None or not op.player_id:
+                results.append({"bingo": False, "error": "Jogo não encontrado"})
+                continue
+            results.append({"bingo": False})
+            downstream.append({"op": "validate-bingo", "player_id": op.player_id,
+                               "numbers": list(game.drawn_numbers)})
+            pending.append((len(results) - 1, "bingo"))
+            checks[len(results) - 1] = (game.game_id, game, op.player_id)
+
+    downstream_results = await validation_client.batch(downstream)
+    if downstream_results is None:
+        for index, field in pending:
+            if field:
+                results[index]["error"] = "ValidationService indisponível"
+    else:
+        for (index, field), result in zip(pending, downstream_results):
+            if field:
+                results[index][field] = bool(result.get(field, False))
+        for index, (game_id, game, player_id) in checks.items():
+            _record_bingo(game_id, game, player_id, bool(results[index]["bingo"]))
+
+    return encode_response(request, {"results": results})
+
+@app.get("/games/{game_id}/events")
+async def game_events(game_id: str):
+    if game_id not in games:
+        raise HTTPException(status_code=404, detail="Jogo não encontrado")
+
+    async def sse() -> AsyncIterator[bytes]:
+        # Assina só quando a resposta começa: se o cliente cair antes, o
+        # gerador nunca roda e não sobra fila no EventHub
+        queue = events.subscribe(game_id)
+        try:
+            yield b": connected\n\n"
+            async for event in events.stream(game_id, queue):
+                yield event.sse
+        finally:
+            events.unsubscribe(game_id, queue)
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.websocket("/games/{game_id}/ws")
+async def game_events_ws(websocket: WebSocket, game_id: str):
+    if game_id not in games:
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+    queue = events.subscribe(game_id)
+
+    async def send_events() -> None:
+        async for event in events.stream(game_id, queue):
+            await websocket.send_text(event.json)
+
+    async def wait_disconnect() -> None:
+        # O cliente não manda nada; ler o socket é o que revela a desconexão
+        # sem esperar o próximo sorteio
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    sender = asyncio.create_task(send_events())
+    receiver = asyncio.create_task(wait_disconnect())
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        if receiver not in done:
+            sender.result()  # propaga erro de envio
+            # Fim do stream (assinante lento descartado pelo EventHub)
+            await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        events.unsubscribe(game_id, queue)
 
 # -----------------------------
 # Health endpoint (useful in tests)
@@ -178,7 +512,6 @@ def health():
 
 
 if __name__ == "__main__":
-    import os
     import uvicorn
     port = int(os.getenv("PORT", "50051"))
     uvicorn.run(app, host="0.0.0.0", port=port)
@@ -1,9 +1,40 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel, Field
-from typing import Dict, List, Set
+from typing import Dict, List, Literal, Optional, Set
+import json
 
 app = FastAPI(title="Validation Service (REST)")
 
+# -----------------------------
+# Response encoding (content negotiation)
+# -----------------------------
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack é opcional
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_ACCEPT = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+def encode_response(request: Request, data: Dict[str, object]) -> Response:
+    """Serializa ``data`` direto no formato pedido em Accept.
+
+    Retornar um Response pronto faz o FastAPI pular a validação do
+    response_model, que continua valendo só para a documentação.
+    """
+    accept = request.headers.get("accept", "")
+    if msgpack is not None and any(t in accept for t in MSGPACK_ACCEPT):
+        return Response(msgpack.packb(data), media_type=MSGPACK_MEDIA_TYPE)
+    if orjson is not None:
+        return Response(orjson.dumps(data), media_type="application/json")
+    return Response(json.dumps(data, separators=(",", ":")), media_type="application/json")
+
 players: Dict[str, Dict[str, object]] = {}
 
 # -----------------------------
@@ -34,52 +65,91 @@ class ValidateBingoResponse(BaseModel):
 class GetCardResponse(BaseModel):
     card_numbers: List[int]
 
+MAX_BATCH_SIZE = 5000
+
+class BatchOperation(BaseModel):
+    op: Literal["register-card", "validate-number", "validate-bingo"]
+    player_id: str
+    card_numbers: Optional[List[int]] = None
+    number: Optional[int] = None
+    numbers: Optional[List[int]] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+
+class BatchResponse(BaseModel):
+    results: List[Dict[str, bool]]
+
 # -----------------------------
 # Endpoints
 # -----------------------------
 
-@app.post("/register-card", response_model=RegisterCardResponse)
-def register_card(payload: RegisterCardRequest):
-    players[payload.player_id] = {
-        "card": list(payload.card_numbers),
-        "marked": set(),
+def _register_card(player_id: str, card_numbers: List[int]) -> bool:
+    card = list(card_numbers)
+    card_set = frozenset(card)
+    players[player_id] = {
+        "card": card,
+        "card_set": card_set,
+        "marked": set(),  # set.add é idempotente: chamadas concorrentes não contam duas vezes
+        "applied": 0,  # quantos números sorteados já foram aplicados
     }
-    print(f"[VALIDATION SERVICE] Cartela registrada para {payload.player_id}: {payload.card_numbers}")
-    return RegisterCardResponse(success=True)
+    print(f"[VALIDATION SERVICE] Cartela registrada para {player_id}: {card_numbers}")
+    return True
 
-@app.post("/validate-number", response_model=ValidateNumberResponse)
-def validate_number(payload: ValidateNumberRequest):
-    p = players.get(payload.player_id)
+def _validate_number(player_id: str, number: int) -> bool:
+    p = players.get(player_id)
+    if p and number in p["card_set"]:
+        p["marked"].add(number)  # type: ignore
+        return True
+    return False
+
+def _validate_bingo(player_id: str, numbers: List[int]) -> bool:
+    p = players.get(player_id)
     if p:
-        card: List[int] = p["card"]  # type: ignore
-        if payload.number in card:
-            if not isinstance(p["marked"], set):
-                p["marked"] = set(p["marked"])  # type: ignore
+        # A lista de sorteados só cresce: aplica apenas o que chegou desde a última chamada
+        applied: int = p["applied"]  # type: ignore
+        if len(numbers) > applied:
+            card_set: frozenset = p["card_set"]  # type: ignore
             marked: Set[int] = p["marked"]  # type: ignore
-            marked.add(payload.number)
-            return ValidateNumberResponse(success=True)
-    return ValidateNumberResponse(success=False)
+            marked.update(n for n in numbers[applied:] if n in card_set)
+            p["applied"] = len(numbers)
+        # marked só guarda números da cartela, então tamanhos iguais = cartela cheia
+        return len(p["marked"]) == len(p["card_set"])  # type: ignore
+    return False
+
+@app.post("/register-card", response_model=RegisterCardResponse)
+def register_card(payload: RegisterCardRequest, request: Request):
+    return encode_response(request, {"success": _register_card(payload.player_id, payload.card_numbers)})
+
+@app.post("/validate-number", response_model=ValidateNumberResponse)
+def validate_number(payload: ValidateNumberRequest, request: Request):
+    return encode_response(request, {"success": _validate_number(payload.player_id, payload.number)})
 
 @app.post("/validate-bingo", response_model=ValidateBingoResponse)
-def validate_bingo(payload: ValidateBingoRequest):
-    p = players.get(payload.player_id)
-    if p:
-        card_set = set(p["card"])  # type: ignore
-        marked_set = set(p["marked"])  # type: ignore
-        for n in payload.numbers:
-            if n in card_set:
-                marked_set.add(n)
-        p["marked"] = marked_set
-        if card_set.issubset(marked_set):
-            return ValidateBingoResponse(bingo=True)
-    return ValidateBingoResponse(bingo=False)
+def validate_bingo(payload: ValidateBingoRequest, request: Request):
+    return encode_response(request, {"bingo": _validate_bingo(payload.player_id, payload.numbers)})
+
+@app.post("/batch", response_model=BatchResponse)
+def batch(payload: BatchRequest, request: Request):
+    if len(payload.operations) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Máximo de {MAX_BATCH_SIZE} operações por lote")
+
+    results: List[Dict[str, object]] = []
+    for op in payload.operations:
+        if op.op == "register-card":
+            results.append({"success": _register_card(op.player_id, op.card_numbers or [])})
+        elif op.op == "validate-number":
+            results.append({"success": _validate_number(op.player_id, op.number or 0)})
+        else:
+            results.append({"bingo": _validate_bingo(op.player_id, op.numbers or [])})
+    return encode_response(request, {"results": results})
 
 @app.get("/card/{player_id}", response_model=GetCardResponse)
-def get_card(player_id: str):
+def get_card(player_id: str, request: Request):
     p = players.get(player_id)
     if p:
-        return GetCardResponse(card_numbers=list(p["card"]))  # type: ignore
-    return GetCardResponse(card_numbers=[])
+        return encode_response(request, {"card_numbers": p["card"]})
+    return encode_response(request, {"card_numbers": []})
 
 @app.get("/healthz")
 def health():
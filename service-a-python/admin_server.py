@@ -0,0 +1,308 @@
+"""
+Servidor HTTP de administração na porta de métricas.
+
+Serve /metrics do Prometheus (como o start_http_server) e rotas extras de
+diagnóstico registradas pelo serviço.
+
+A porta de métricas é exposta pelo Service do k8s, então as rotas /debug/*
+só funcionam com a variável ADMIN_TOKEN definida e o header
+``Authorization: Bearer <ADMIN_TOKEN>``; sem ela ficam desligadas (403).
+/metrics continua aberto para o Prometheus.
+
+  GET /debug/profile?seconds=10&hz=100&idle=0
+      Amostra as pilhas de todas as threads (workers gRPC incluídos) por um
+      tempo limitado e devolve as pilhas no formato "collapsed"
+      (uma linha "raiz;...;folha contagem"), que flamegraph.pl e
+      speedscope leem direto.
+
+  POST /debug/tracemalloc/start?frames=1    liga o tracemalloc
+  POST /debug/tracemalloc/stop              desliga e descarta os snapshots
+  POST /debug/tracemalloc/snapshot          tira um snapshot e devolve seu id
+  GET /debug/tracemalloc/top?id=N&limit=20&group=lineno
+  GET /debug/tracemalloc/diff?from=A&to=B&limit=20&group=lineno
+      Maiores sítios de alocação de um snapshot, ou o que cresceu entre
+      dois. Sem ``id``/``to`` usa o último snapshot; sem ``from`` usa o
+      anterior a ele. ``group`` pode ser lineno, filename ou traceback.
+
+Este arquivo é idêntico em service-a-python e service-b-python.
+"""
+import hmac
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from prometheus_client import MetricsHandler
+
+MAX_PROFILE_SECONDS = 60
+MAX_PROFILE_HZ = 1000
+MAX_SNAPSHOTS = 4
+MAX_TRACE_FRAMES = 25
+
+# Arquivos cujas funções no topo da pilha indicam thread ociosa/esperando
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", os.path.join("futures", "thread.py"))
+# Laço do servidor gRPC bloqueado no completion queue (código C)
+_IDLE_FUNCTIONS = {("_serve", os.path.join("grpc", "_server.py"))}
+
+
+# ==========================================
+# Profiler por amostragem
+# ==========================================
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame):
+    code = frame.f_code
+    if code.co_filename.endswith(_IDLE_FILES):
+        return True
+    return any(code.co_name == name and code.co_filename.endswith(path) for name, path in _IDLE_FUNCTIONS)
+
+
+def sample_stacks(seconds, hz, include_idle=False):
+    """Amostra as pilhas de todas as threads e devolve um Counter de pilhas colapsadas."""
+    own_id = threading.get_ident()
+    interval = 1.0 / hz
+    counts = Counter()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if not include_idle and _is_idle(frame):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+class SamplingProfiler:
+    """Garante um único profile por vez e limita duração e frequência."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def handle(self, params):
+        try:
+            seconds = float(params.get("seconds", ["10"])[0])
+            hz = int(params.get("hz", ["100"])[0])
+        except ValueError:
+            return 400, "text/plain; charset=utf-8", b"seconds/hz invalidos\n"
+        seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+        hz = min(max(hz, 1), MAX_PROFILE_HZ)
+        include_idle = params.get("idle", ["0"])[0] == "1"
+
+        if not self._lock.acquire(blocking=False):
+            return 409, "text/plain; charset=utf-8", b"profile ja em andamento\n"
+        try:
+            counts = sample_stacks(seconds, hz, include_idle)
+        finally:
+            self._lock.release()
+
+        body = "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+        return 200, "text/plain; charset=utf-8", body.encode("utf-8")
+
+
+# ==========================================
+# tracemalloc
+# ==========================================
+
+_TEXT = "text/plain; charset=utf-8"
+_GROUPS = ("lineno", "filename", "traceback")
+
+
+class TracemallocControl:
+    """Liga/desliga o tracemalloc e guarda os últimos snapshots para comparar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()  # id -> Snapshot
+        self._next_id = 1
+
+    def routes(self):
+        return {
+            "/debug/tracemalloc/top": self.top,
+            "/debug/tracemalloc/diff": self.diff,
+        }
+
+    def actions(self):
+        """Rotas que mudam estado (e custam caro): só por POST."""
+        return {
+            "/debug/tracemalloc/start": self.start,
+            "/debug/tracemalloc/stop": self.stop,
+            "/debug/tracemalloc/snapshot": self.snapshot,
+        }
+
+    def start(self, params):
+        try:
+            frames = min(max(int(params.get("frames", ["1"])[0]), 1), MAX_TRACE_FRAMES)
+        except ValueError:
+            return 400, _TEXT, b"frames invalido\n"
+        if tracemalloc.is_tracing():
+            return 409, _TEXT, b"tracemalloc ja ligado\n"
+        tracemalloc.start(frames)
+        return 200, _TEXT, f"tracemalloc ligado ({frames} frames)\n".encode("utf-8")
+
+    def stop(self, params):
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        return 200, _TEXT, b"tracemalloc desligado\n"
+
+    def snapshot(self, params):
+        if not tracemalloc.is_tracing():
+            return 409, _TEXT, b"tracemalloc desligado; use POST em /debug/tracemalloc/start\n"
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = snap
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+        current, peak = tracemalloc.get_traced_memory()
+        body = f"snapshot {snapshot_id}\ntraced {current / 1024:.1f} KiB (pico {peak / 1024:.1f} KiB)\n"
+        return 200, _TEXT, body.encode("utf-8")
+
+    def _options(self, params):
+        group = params.get("group", ["lineno"])[0]
+        limit = int(params.get("limit", ["20"])[0])
+        if group not in _GROUPS:
+            raise ValueError(group)
+        return group, max(1, limit)
+
+    def _get(self, params, name, default_offset):
+        with self._lock:
+            ids = list(self._snapshots)
+        if name in params:
+            snapshot_id = int(params[name][0])
+        elif len(ids) >= default_offset:
+            snapshot_id = ids[-default_offset]
+        else:
+            return None, None
+        return snapshot_id, self._snapshots.get(snapshot_id)
+
+    def top(self, params):
+        try:
+            group, limit = self._options(params)
+            snapshot_id, snap = self._get(params, "id", 1)
+        except ValueError:
+            return 400, _TEXT, b"parametros invalidos\n"
+        if snap is None:
+            return 404, _TEXT, b"snapshot nao encontrado\n"
+        stats = snap.statistics(group)
+        total = sum(stat.size for stat in stats)
+        lines = [f"snapshot {snapshot_id}: {total / 1024:.1f} KiB em {len(stats)} sitios"]
+        lines.extend(_format_stat(stat, group) for stat in stats[:limit])
+        return 200, _TEXT, ("\n".join(lines) + "\n").encode("utf-8")
+
+    def diff(self, params):
+        try:
+            group, limit = self._options(params)
+            new_id, new = self._get(params, "to", 1)
+            old_id, old = self._get(params, "from", 2)
+        except ValueError:
+            return 400, _TEXT, b"parametros invalidos\n"
+        if new is None or old is None:
+            return 404, _TEXT, b"sao necessarios dois snapshots\n"
+        stats = new.compare_to(old, group)
+        growth = sum(stat.size_diff for stat in stats)
+        lines = [f"snapshot {old_id} -> {new_id}: {growth / 1024:+.1f} KiB"]
+        lines.extend(_format_stat(stat, group) for stat in stats[:limit])
+        return 200, _TEXT, ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _format_stat(stat, group):
+    if group == "traceback":
+        frames = "\n    ".join(stat.traceback.format())
+        return f"{stat}\n    {frames}"
+    return str(stat)
+
+
+# ==========================================
+# Servidor HTTP
+# ==========================================
+
+class AdminHandler(MetricsHandler):
+    routes = {}   # GET
+    actions = {}  # POST
+    token = None
+
+    def _authorized(self):
+        if not self.token:
+            return False
+        header = self.headers.get("Authorization", "")
+        return hmac.compare_digest(header.encode("utf-8"), f"Bearer {self.token}".encode("utf-8"))
+
+    def _reply(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = self.routes.get(url.path)
+        if route is None:
+            if url.path in self.actions:
+                return self._reply(405, _TEXT, b"use POST\n")
+            return super().do_GET()
+        if not self._authorized():
+            return self._reply(403, _TEXT, b"rotas de debug exigem ADMIN_TOKEN\n")
+        self._reply(*route(parse_qs(url.query)))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        action = self.actions.get(url.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", "replace") if length else ""
+        if action is None:
+            return self._reply(404, _TEXT, b"rota desconhecida\n")
+        if not self._authorized():
+            return self._reply(403, _TEXT, b"rotas de debug exigem ADMIN_TOKEN\n")
+        # Parâmetros na query string ou no corpo (application/x-www-form-urlencoded)
+        params = parse_qs(url.query)
+        params.update(parse_qs(body))
+        self._reply(*action(params))
+
+
+def start_admin_server(port, routes=None, addr="0.0.0.0", token=None):
+    """Sobe o servidor de métricas + administração em uma thread daemon.
+
+    ``routes`` mapeia caminho -> função(params) que devolve
+    (status, content_type, corpo em bytes). ``token`` (padrão: variável
+    ADMIN_TOKEN) libera as rotas de debug; sem ele só /metrics responde.
+    """
+    tracemalloc_control = TracemallocControl()
+    all_routes = {"/debug/profile": SamplingProfiler().handle}
+    all_routes.update(tracemalloc_control.routes())
+    all_routes.update(routes or {})
+    token = token if token is not None else os.getenv("ADMIN_TOKEN")
+    handler = type("AdminHandler", (AdminHandler,), {
+        "routes": all_routes,
+        "actions": tracemalloc_control.actions(),
+        "token": token,
+    })
+
+    server = ThreadingHTTPServer((addr, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="admin-http", daemon=True)
+    thread.start()
+    return server
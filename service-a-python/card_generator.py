@@ -0,0 +1,114 @@
+"""
+Geração de cartelas 5x5 (B-I-N-G-O) com colunas corretas.
+
+Cada cartela é uma tupla de 24 números em ordem de linha, sem a casa FREE
+do centro (mesmo layout que renderCard no frontend espera):
+B = 1-15, I = 16-30, N = 31-45, G = 46-60, O = 61-75.
+Cada coluna fica em ordem crescente (layout canônico), então o conjunto
+de números basta para reconstruir a cartela e ela pode trafegar como
+bitmap (ver bitmap.py).
+
+As cartelas são pré-geradas em um pool reabastecido por uma thread em
+segundo plano, então o registro de jogadores apenas retira cartelas prontas.
+"""
+import random
+import threading
+from collections import deque
+
+GRID_SIZE = 5
+COLUMN_RANGES = [range(1 + 15 * c, 16 + 15 * c) for c in range(GRID_SIZE)]
+FREE_ROW = FREE_COL = 2
+
+
+def generate_card(rng=random):
+    columns = [
+        sorted(rng.sample(COLUMN_RANGES[c], GRID_SIZE - 1 if c == FREE_COL else GRID_SIZE))
+        for c in range(GRID_SIZE)
+    ]
+    card = []
+    for row in range(GRID_SIZE):
+        for col in range(GRID_SIZE):
+            if col == FREE_COL:
+                if row == FREE_ROW:
+                    continue
+                card.append(columns[col][row if row < FREE_ROW else row - 1])
+            else:
+                card.append(columns[col][row])
+    return tuple(card)
+
+
+def generate_cards(count, rng=random):
+    return [generate_card(rng) for _ in range(count)]
+
+
+class CardPool:
+    """Pool de cartelas pré-geradas com reabastecimento em segundo plano.
+
+    Quando o pool cai abaixo de ``low_water`` a thread de reabastecimento é
+    acordada e gera lotes de ``batch_size`` até voltar a ``capacity``.
+    Se o pool esvaziar, ``take`` gera a cartela na hora e chama ``on_miss``.
+    """
+
+    def __init__(self, capacity=20000, low_water=None, batch_size=500, on_miss=None):
+        self.capacity = capacity
+        self.low_water = low_water if low_water is not None else capacity // 2
+        self.batch_size = batch_size
+        self._cards = deque()
+        self._wakeup = threading.Event()
+        self._rng = random.Random()
+        self._thread = None
+        self._misses_lock = threading.Lock()
+        self.misses = 0
+        self.on_miss = on_miss
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __iter__(self):
+        """Cartelas prontas, na ordem em que serão entregues (para inspeção)."""
+        return iter(self._cards)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refill_loop, name="card-pool", daemon=True)
+            self._thread.start()
+            self._wakeup.set()
+        return self
+
+    def fill(self):
+        """Completa o pool até ``capacity`` na thread atual."""
+        while len(self._cards) < self.capacity:
+            batch = min(self.batch_size, self.capacity - len(self._cards))
+            self._cards.extend(generate_cards(batch, self._rng))
+        return self
+
+    def _refill_loop(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.fill()
+
+    def take(self):
+        try:
+            card = self._cards.popleft()
+        except IndexError:
+            with self._misses_lock:  # take roda nos workers do servidor
+                self.misses += 1
+            if self.on_miss is not None:
+                self.on_miss()
+            card = generate_card()
+        if len(self._cards) < self.low_water:
+            self._wakeup.set()
+        return card
+
+    def take_unique(self, seen):
+        """Retira uma cartela cuja chave ainda não está em ``seen`` e a registra.
+
+        Não é atômico: quem compartilha ``seen`` entre threads segura um lock
+        em volta da chamada.
+        """
+        card = self.take()
+        while card in seen:
+            card = self.take()
+        seen.add(card)
+        return card
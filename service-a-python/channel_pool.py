@@ -0,0 +1,180 @@
+"""
+Pool de canais gRPC para o ValidationService.
+
+Um único canal coloca todas as threads em uma só conexão HTTP/2, e com
+muitas RPCs por segundo essa conexão vira gargalo (limite de streams
+simultâneos e uma única thread de I/O por conexão no core do gRPC). O pool
+abre ``size`` canais independentes (cada um com sua própria conexão) e
+escolhe um por chamada:
+
+  round_robin        - um após o outro
+  least_outstanding  - o canal com menos chamadas em andamento
+
+Cada canal aceita no máximo ``max_outstanding`` chamadas ao mesmo tempo,
+o mesmo ``GRPC_MAX_CONCURRENT_STREAMS`` do ValidationService. Acima disso a
+conexão HTTP/2 enfileiraria a chamada por dentro, sem que o pool visse;
+com o teto, as duas políticas pulam canais cheios. Se todos estão cheios,
+a chamada espera uma vaga até o seu timeout e então falha com
+DEADLINE_EXCEEDED (``ChannelsSaturated``), como se o servidor não tivesse
+respondido a tempo.
+
+``ChannelPool.stub`` tem a mesma interface de um ValidationServiceStub
+(``stub.Metodo(req, timeout=...)`` e ``stub.Metodo.future(...)``), então o
+ValidationClient não precisa saber que existe um pool.
+"""
+import itertools
+import threading
+import time
+
+import grpc
+from prometheus_client import Counter, Gauge
+
+from validation_client import LocalRpcError
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+POLICIES = (ROUND_ROBIN, LEAST_OUTSTANDING)
+
+CHANNEL_OUTSTANDING = Gauge(
+    'validation_channel_outstanding',
+    'Validation calls in flight on each pooled channel',
+    ['channel']
+)
+CHANNEL_CALLS = Counter(
+    'validation_channel_calls_total',
+    'Validation calls sent on each pooled channel',
+    ['channel']
+)
+CHANNEL_SATURATED = Counter(
+    'validation_channel_saturated_total',
+    'Validation calls that found every pooled channel at its stream limit'
+)
+
+
+class ChannelsSaturated(LocalRpcError):
+    """Todos os canais no limite de streams até o fim do timeout."""
+
+    status_code = grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def __init__(self, limit):
+        super().__init__(f"Todos os canais com {limit} chamadas em andamento")
+
+
+def channel_options(keepalive_ms=30000, keepalive_timeout_ms=10000):
+    return [
+        # Cada canal do pool precisa da sua própria conexão
+        ('grpc.use_local_subchannel_pool', 1),
+        ('grpc.keepalive_time_ms', keepalive_ms),
+        ('grpc.keepalive_timeout_ms', keepalive_timeout_ms),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.max_pings_without_data', 0),
+    ]
+
+
+class ChannelPool:
+    def __init__(self, target, stub_class, size=4, policy=ROUND_ROBIN, options=None, max_outstanding=100):
+        if policy not in POLICIES:
+            raise ValueError(f"Política desconhecida: {policy}")
+        self.policy = policy
+        self.max_outstanding = max(1, max_outstanding)
+        self.channels = [grpc.insecure_channel(target, options=options or channel_options())
+                         for _ in range(max(1, size))]
+        self.stubs = [stub_class(channel) for channel in self.channels]
+        self.outstanding = [0] * len(self.channels)
+        self._labels = [str(i) for i in range(len(self.channels))]
+        self._round_robin = itertools.cycle(range(len(self.channels)))
+        self._slot_freed = threading.Condition()
+        self.stub = _PooledStub(self)
+
+        for i, label in enumerate(self._labels):
+            CHANNEL_OUTSTANDING.labels(channel=label).set_function(lambda i=i: self.outstanding[i])
+
+    def acquire(self, timeout=None):
+        """Escolhe um canal com vaga e conta a chamada como em andamento nele."""
+        with self._slot_freed:
+            index = self._pick()
+            if index is None:
+                CHANNEL_SATURATED.inc()
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while index is None:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise ChannelsSaturated(self.max_outstanding)
+                    self._slot_freed.wait(remaining)
+                    index = self._pick()
+            self.outstanding[index] += 1
+        CHANNEL_CALLS.labels(channel=self._labels[index]).inc()
+        return index
+
+    def _pick(self):
+        # Começa do próximo do round-robin: desempata sem favorecer o canal 0
+        start = next(self._round_robin)
+        n = len(self.channels)
+        candidates = [i for i in ((start + k) % n for k in range(n))
+                      if self.outstanding[i] < self.max_outstanding]
+        if not candidates:
+            return None
+        if self.policy == LEAST_OUTSTANDING:
+            return min(candidates, key=self.outstanding.__getitem__)
+        return candidates[0]
+
+    def release(self, index):
+        with self._slot_freed:
+            self.outstanding[index] -= 1
+            self._slot_freed.notify()
+
+    def close(self):
+        for channel in self.channels:
+            channel.close()
+
+
+class _PooledStub:
+    def __init__(self, pool):
+        self._pool = pool
+        self._methods = {}
+
+    def __getattr__(self, name):
+        method = self._methods.get(name)
+        if method is None:
+            if not hasattr(self._pool.stubs[0], name):
+                raise AttributeError(name)
+            method = self._methods.setdefault(name, _PooledMethod(self._pool, name))
+        return method
+
+
+class _PooledMethod:
+    def __init__(self, pool, name):
+        self._pool = pool
+        self._callables = [getattr(stub, name) for stub in pool.stubs]
+
+    def __call__(self, request, **kwargs):
+        index = self._pool.acquire(kwargs.get('timeout'))
+        try:
+            return self._callables[index](request, **kwargs)
+        finally:
+            self._pool.release(index)
+
+    def future(self, request, **kwargs):
+        index = self._pool.acquire(kwargs.get('timeout'))
+        try:
+            future = self._callables[index].future(request, **kwargs)
+        except Exception:
+            self._pool.release(index)
+            raise
+        future.add_done_callback(lambda _: self._pool.release(index))
+        return future
+
+
+def pool_from_env(env, target, stub_class):
+    return ChannelPool(
+        target,
+        stub_class,
+        size=int(env.get('VALIDATION_CHANNELS', '4')),
+        policy=env.get('VALIDATION_CHANNEL_POLICY', LEAST_OUTSTANDING),
+        options=channel_options(
+            keepalive_ms=int(env.get('VALIDATION_KEEPALIVE_MS', '30000')),
+            keepalive_timeout_ms=int(env.get('VALIDATION_KEEPALIVE_TIMEOUT_MS', '10000')),
+        ),
+        # Mesmo limite que o ValidationService anuncia em grpc.max_concurrent_streams
+        max_outstanding=int(env.get('GRPC_MAX_CONCURRENT_STREAMS', '100')),
+    )
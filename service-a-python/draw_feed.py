@@ -0,0 +1,76 @@
+"""
+Entrega dos números sorteados para quem acompanha um jogo (WatchDraws).
+
+Cada sorteio, manual ou do DrawScheduler (``on_draw``), chama ``publish``,
+que acorda só quem acompanha aquele jogo. O stream não guarda fila própria:
+lê ``game.drawn_numbers`` a partir da última rodada enviada, então um
+cliente lento ou que reconecta com ``from_round`` recebe tudo em ordem.
+
+No servidor síncrono do grpcio cada stream aberto prende uma thread do
+executor até terminar. Por isso há no máximo ``max_watchers`` streams ao
+mesmo tempo (os demais recebem RESOURCE_EXHAUSTED) e o servidor reserva
+essa mesma quantidade de workers a mais, para que eles não tirem vaga das
+RPCs unárias. Um gateway deve abrir um stream por jogo e repassar aos seus
+clientes, não um por cliente.
+"""
+import threading
+
+import grpc
+from prometheus_client import Gauge
+
+import bingo_pb2
+
+# Intervalo para notar cancelamento do cliente e fim do jogo sem sorteio novo
+POLL_INTERVAL = 1.0
+
+DRAW_WATCHERS = Gauge('draw_feed_watchers', 'Open WatchDraws streams')
+
+
+class DrawFeed:
+    def __init__(self, max_watchers=32):
+        self.max_watchers = max_watchers
+        self._lock = threading.Lock()
+        self._games = {}  # game_id -> [Condition, streams abertos]
+        self._watchers = 0
+        DRAW_WATCHERS.set_function(lambda: self._watchers)
+
+    def publish(self, game, number=None):
+        """Avisa quem acompanha ``game``; chamado depois de o número entrar no jogo."""
+        slot = self._games.get(game.game_id)
+        if slot is not None:
+            with slot[0]:
+                slot[0].notify_all()
+
+    def watch(self, game, from_round, context):
+        """Gera DrawEvent a partir da rodada ``from_round`` (inclusive) até o jogo terminar.
+
+        Rodadas começam em 1; ``from_round`` 0 também começa do primeiro sorteio.
+        """
+        with self._lock:
+            if self._watchers >= self.max_watchers:
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Limite de WatchDraws abertos atingido")
+            self._watchers += 1
+            slot = self._games.setdefault(game.game_id, [threading.Condition(), 0])
+            slot[1] += 1
+        cond = slot[0]
+        sent = max(from_round, 1) - 1
+        try:
+            while context.is_active():
+                with cond:
+                    # Conferido sob a condição: um publish entre a conferência
+                    # e o wait não se perde
+                    if len(game.drawn_numbers) <= sent and not game.finished:
+                        cond.wait(POLL_INTERVAL)
+                numbers = game.drawn_numbers[sent:]
+                for number in numbers:
+                    sent += 1
+                    yield bingo_pb2.DrawEvent(number=number, round=sent)
+                if game.finished and len(game.drawn_numbers) <= sent:
+                    return
+        finally:
+            with self._lock:
+                self._watchers -= 1
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._games[game.game_id]
+
@@ -0,0 +1,100 @@
+"""
+Sorteio automático para jogos criados com ``draw_interval_ms``.
+
+Uma única thread mantém um heap (instante do próximo sorteio, jogo) e
+dorme até o sorteio mais próximo; quando acorda, sorteia em todos os jogos
+vencidos de uma vez e reagenda cada um em ``instante + intervalo`` (taxa
+fixa, sem acumular atraso). Não há thread nem cliente por jogo.
+
+O primeiro sorteio de cada jogo cai numa fase aleatória dentro do primeiro
+intervalo. Sem isso, jogos criados juntos (ou um lote grande de jogos com o
+mesmo intervalo) vencem todos no mesmo instante e a thread sorteia o lote
+em série: cada sorteio custa ~1 us, então 50k jogos juntos atrasam os
+últimos em dezenas de ms. Espalhados no intervalo, cada acordar pega poucos
+jogos.
+
+O atraso de cada sorteio em relação ao horário agendado vai para o
+histograma ``draw_scheduler_lag_seconds``.
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from prometheus_client import Gauge, Histogram
+
+DRAW_LAG = Histogram(
+    'draw_scheduler_lag_seconds',
+    'Delay between the scheduled and the actual time of automatic draws',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+SCHEDULED_GAMES = Gauge('draw_scheduler_games', 'Games with automatic draws pending')
+
+
+class DrawScheduler:
+    def __init__(self, on_draw=None, clock=time.monotonic):
+        self.on_draw = on_draw  # on_draw(game, number), chamado fora do lock
+        self.clock = clock
+        self._heap = []
+        self._seq = itertools.count()  # desempate estável no heap
+        self._cond = threading.Condition()
+        self._thread = None
+        SCHEDULED_GAMES.set_function(lambda: len(self._heap))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="draw-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def schedule(self, game, interval):
+        """Agenda sorteios a cada ``interval`` segundos até o jogo terminar."""
+        with self._cond:
+            due = self.clock() + interval * (1.0 - random.random())  # fase em (0, interval]
+            wake = not self._heap or due < self._heap[0][0]
+            heapq.heappush(self._heap, (due, next(self._seq), interval, game))
+            if wake:
+                self._cond.notify()
+
+    def _pop_due(self):
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - self.clock()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                now = self.clock()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap))
+                return due
+
+    def _run(self):
+        while True:
+            self.run_due(self._pop_due())
+
+    def run_due(self, entries):
+        reschedule = []
+        for due, _, interval, game in entries:
+            if game.finished:
+                continue  # bingo confirmado depois que a entrada foi agendada
+            number = game.draw_random()
+            DRAW_LAG.observe(max(0.0, self.clock() - due))
+            if number is None:
+                continue
+            if self.on_draw is not None:
+                self.on_draw(game, number)
+            if not game.finished:
+                reschedule.append((due + interval, next(self._seq), interval, game))
+
+        if reschedule:
+            with self._cond:
+                for entry in reschedule:
+                    heapq.heappush(self._heap, entry)
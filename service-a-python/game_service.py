@@ -5,7 +5,19 @@ import bingo_pb2_grpc
 import uuid
 import random
 import os
-from prometheus_client import start_http_server, Counter, Histogram
+import threading
+import bitmap
+from card_generator import CardPool
+from draw_feed import DrawFeed
+from channel_pool import pool_from_env
+from draw_scheduler import DrawScheduler
+from idempotency import interceptor_from_env
+from load_shedding import CRITICAL, LoadSheddingInterceptor, limiter_from_env
+from rate_limiter import limiter_from_env as rate_limiter_from_env
+from runtime_stats import RuntimeStats
+from validation_client import CircuitBreaker, ValidationClient
+from admin_server import start_admin_server
+from prometheus_client import Counter, Gauge, Histogram
 
 # ==========================================
 # MÉTRICAS PROMETHEUS
@@ -23,33 +35,118 @@ GRPC_REQUEST_LATENCY = Histogram(
     ['method', 'status']
 )
 
+CARD_POOL_AVAILABLE = Gauge('card_pool_available', 'Number of pre-generated cards waiting in the pool')
+CARD_POOL_MISSES = Counter('card_pool_misses', 'Cards generated inline because the pool was empty')
+
+VALIDATION_FALLBACKS = Counter(
+    'validation_fallbacks_total',
+    'Requests answered locally because the validation circuit was open',
+    ['method']
+)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 class Game:
-    def __init__(self, game_id, game_name):
+    def __init__(self, game_id, game_name, win_patterns=(), card_pool=None, draw_interval_ms=0):
         self.game_id = game_id
         self.game_name = game_name
+        self.draw_interval_ms = draw_interval_ms  # > 0: só o DrawScheduler sorteia
+        self.win_patterns = list(win_patterns) or [bingo_pb2.BLACKOUT]
+        self.card_pool = card_pool if card_pool is not None else CardPool(capacity=0)
         self.players = {}
+        self.player_order = []  # ids na ordem de registro (cursor do ListPlayers)
+        self.card_keys = set()  # cartelas já entregues neste jogo
         self.drawn_numbers = []
+        self.drawn_mask = 0  # mesmos números como máscara (bit n = número n)
+        self.winner = None
+        self._draw_lock = threading.Lock()  # sorteio manual e automático no mesmo jogo
+        self._register_lock = threading.Lock()  # RegisterPlayer concorrentes no mesmo jogo
 
     def register_player(self, player_name):
+        player_id, card, card_mask = self.deal_card()
+        self.add_player(player_id, player_name, card, card_mask)
+        return player_id, card, card_mask
+
+    def deal_card(self):
+        """Reserva uma cartela inédita neste jogo; o jogador só entra com ``add_player``."""
         player_id = str(uuid.uuid4())
-        card = random.sample(range(1, 76), 24)
-        self.players[player_id] = {"name": player_name, "card": card}
-        return player_id, card
+        with self._register_lock:
+            card = list(self.card_pool.take_unique(self.card_keys))
+        return player_id, card, bitmap.numbers_mask(card)
+
+    def return_card(self, card):
+        """Desfaz ``deal_card`` quando o jogador não chegou a entrar."""
+        with self._register_lock:
+            self.card_keys.discard(tuple(card))
+
+    def add_player(self, player_id, player_name, card, card_mask):
+        self.players[player_id] = {"name": player_name, "card": card, "card_mask": card_mask}
+        self.player_order.append(player_id)
+
+    def draw(self, number):
+        self.drawn_numbers.append(number)
+        self.drawn_mask |= 1 << number
+
+    def draw_random(self):
+        """Sorteia um número ainda não sorteado; None se já saíram todos."""
+        with self._draw_lock:
+            if len(self.drawn_numbers) >= bitmap.MAX_NUMBER:
+                return None
+            number = random.randint(1, bitmap.MAX_NUMBER)
+            while self.was_drawn(number):
+                number = random.randint(1, bitmap.MAX_NUMBER)
+            self.draw(number)
+        NUMBERS_DRAWN.inc()
+        return number
+
+    @property
+    def finished(self):
+        return self.winner is not None or len(self.drawn_numbers) >= bitmap.MAX_NUMBER
+
+    def was_drawn(self, number):
+        return 0 < number <= bitmap.MAX_NUMBER and bool(self.drawn_mask >> number & 1)
 
 class GameServiceServicer(bingo_pb2_grpc.GameServiceServicer):
-    def __init__(self, validation_stub):
+    def __init__(self, validation, card_pool=None, draw_scheduler=None, rate_limiter=None, draw_feed=None,
+                 send_number_lists=True):
         self.games = {}
-        self.validation_stub = validation_stub
+        # Enquanto houver ValidationService sem suporte a bitmap, as chamadas
+        # levam também as listas (card_numbers/numbers); quem já lê o bitmap o prefere
+        self.send_number_lists = send_number_lists
+        self.rate_limiter = rate_limiter
+        # Listas só crescem (nada é removido), então um índice nelas serve de
+        # cursor estável e as listagens leem por fatia sem copiar os dicts
+        self.game_order = []
+        self.player_games = {}  # player_id -> game_id
+        self.player_order = []
+        self.validation = validation
+        self.card_pool = card_pool if card_pool is not None else CardPool(capacity=0)
+        self.draw_scheduler = draw_scheduler
+        self.draw_feed = draw_feed if draw_feed is not None else DrawFeed()
 
     @GRPC_REQUEST_LATENCY.labels(method='CreateGame', status='ok').time()
     def CreateGame(self, request, context):
+        win_patterns = list(dict.fromkeys(request.win_patterns))
+        known = set(bingo_pb2.WinPattern.values()) - {bingo_pb2.WIN_PATTERN_UNSPECIFIED}
+        if any(p not in known for p in win_patterns):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Padrão de vitória desconhecido")
+
+        if request.draw_interval_ms and self.draw_scheduler is None:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Sorteio automático desativado")
+
         game_id = str(uuid.uuid4())
-        self.games[game_id] = Game(game_id, request.game_name)
+        game = Game(game_id, request.game_name, win_patterns, self.card_pool, request.draw_interval_ms)
+        self.games[game_id] = game
+        self.game_order.append(game_id)
+        if request.draw_interval_ms:
+            self.draw_scheduler.schedule(game, request.draw_interval_ms / 1000.0)
 
         GAMES_CREATED.inc()
 
         print(f"\n[GAME SERVICE] ✓ Jogo criado: {request.game_name}")
-        print(f"  Game ID: {game_id}\n")
+        print(f"  Game ID: {game_id}")
+        print(f"  Padrões: {[bingo_pb2.WinPattern.Name(p) for p in self.games[game_id].win_patterns]}\n")
         return bingo_pb2.CreateGameResponse(game_id=game_id)
 
     @GRPC_REQUEST_LATENCY.labels(method='RegisterPlayer', status='ok').time()
@@ -59,28 +156,44 @@ class GameServiceServicer(bingo_pb2_grpc.GameServiceServicer):
             return bingo_pb2.RegisterPlayerResponse(success=False)
 
         game = self.games[request.game_id]
-        player_id, card = game.register_player(request.player_name)
+        player_id, card, card_mask = game.deal_card()
+        card_bitmap = bitmap.encode(card_mask)
 
+        validation_request = bingo_pb2.RegisterCardRequest(
+            player_id=player_id,
+            card_bitmap=card_bitmap,
+            card_numbers=card if self.send_number_lists else (),
+            win_patterns=game.win_patterns
+        )
+        # O jogador só entra no jogo se a cartela foi registrada ou ficou na
+        # fila de reenvio; sem ela todo MarkNumber/CheckBingo dele falharia
+        try:
+            response = self.validation.call_or_defer('RegisterCard', validation_request, context)
+        except grpc.RpcError as e:
+            game.return_card(card)
+            print(f"[GAME SERVICE] ❌ Erro de comunicação com ValidationService: {e.code()}")
+            context.abort(e.code(), f"Cartela não registrada no ValidationService: {e.details()}")
+        if response is not None and not response.success:
+            game.return_card(card)
+            print(f"[GAME SERVICE] ⚠️  Erro ao registrar cartela no ValidationService")
+            return bingo_pb2.RegisterPlayerResponse(success=False)
+
+        game.add_player(player_id, request.player_name, card, card_mask)
+        self.player_games[player_id] = request.game_id
+        self.player_order.append(player_id)
         PLAYERS_REGISTERED.inc()
 
         print(f"\n[GAME SERVICE] ✓ Jogador registrado: {request.player_name}")
-
-        try:
-            validation_request = bingo_pb2.RegisterCardRequest(
-                player_id=player_id,
-                card_numbers=card
-            )
-            response = self.validation_stub.RegisterCard(validation_request)
-            if response.success:
-                print(f"[GAME SERVICE] ✓ Cartela registrada no ValidationService")
-            else:
-                print(f"[GAME SERVICE] ⚠️  Erro ao registrar cartela no ValidationService")
-        except grpc.RpcError as e:
-            print(f"[GAME SERVICE] ❌ Erro de comunicação com ValidationService: {e}")
+        if response is None:
+            # Registra quando o ValidationService voltar; até lá MarkNumber usa a cópia local
+            VALIDATION_FALLBACKS.labels(method='RegisterPlayer').inc()
+        else:
+            print(f"[GAME SERVICE] ✓ Cartela registrada no ValidationService")
 
         return bingo_pb2.RegisterPlayerResponse(
             player_id=player_id,
             card_numbers=card,
+            card_bitmap=card_bitmap,
             success=True
         )
 
@@ -90,76 +203,197 @@ class GameServiceServicer(bingo_pb2_grpc.GameServiceServicer):
             return bingo_pb2.DrawNumberResponse(success=False)
 
         game = self.games[request.game_id]
-
-        if len(game.drawn_numbers) >= 75:
+        if game.draw_interval_ms:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Jogo com sorteio automático; use WatchDraws")
+        number = game.draw_random()
+        if number is None:
             return bingo_pb2.DrawNumberResponse(success=False)
-
-        number = random.randint(1, 75)
-        while number in game.drawn_numbers:
-            number = random.randint(1, 75)
-
-        game.drawn_numbers.append(number)
-
-        NUMBERS_DRAWN.inc()
+        self.draw_feed.publish(game, number)
 
         print(f"[GAME SERVICE] 🎲 Número sorteado: {number}")
         return bingo_pb2.DrawNumberResponse(number=number, success=True)
 
+    def _find_game(self, request):
+        # game_id é opcional quando o jogador já está no índice
+        return self.games.get(request.game_id or self.player_games.get(request.player_id, ''))
+
+    def _check_rate(self, method, request, game, context):
+        # Antes de qualquer chamada ao ValidationService
+        if self.rate_limiter is None:
+            return
+        scope = self.rate_limiter.check(method, request.player_id, game.game_id)
+        if scope is not None:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"Limite de requisições por {scope} excedido")
+
     def MarkNumber(self, request, context):
-        if request.game_id not in self.games:
+        game = self._find_game(request)
+        if game is None:
             return bingo_pb2.MarkNumberResponse(success=False)
+        self._check_rate('MarkNumber', request, game, context)
 
-        game = self.games[request.game_id]
-        if request.number not in game.drawn_numbers:
+        if not game.was_drawn(request.number):
             return bingo_pb2.MarkNumberResponse(success=False)
 
+        validation_request = bingo_pb2.ValidateNumberRequest(
+            player_id=request.player_id,
+            number=request.number
+        )
         try:
-            validation_response = self.validation_stub.ValidateNumber(
-                bingo_pb2.ValidateNumberRequest(
-                    player_id=request.player_id,
-                    number=request.number
-                )
-            )
-            return bingo_pb2.MarkNumberResponse(success=validation_response.success)
+            validation_response = self.validation.call_or_defer('ValidateNumber', validation_request, context)
         except grpc.RpcError:
             return bingo_pb2.MarkNumberResponse(success=False)
+        if validation_response is not None:
+            return bingo_pb2.MarkNumberResponse(success=validation_response.success)
+
+        # Adiada: responde com a cartela guardada aqui; a marcação é reenviada depois
+        player = game.players.get(request.player_id)
+        success = player is not None and bool(player["card_mask"] >> request.number & 1)
+        VALIDATION_FALLBACKS.labels(method='MarkNumber').inc()
+        return bingo_pb2.MarkNumberResponse(success=success)
 
     def CheckBingo(self, request, context):
         BINGO_CQRS.inc()
 
-        if request.game_id not in self.games:
+        game = self._find_game(request)
+        if game is None:
             return bingo_pb2.CheckBingoResponse(bingo=False)
+        self._check_rate('CheckBingo', request, game, context)
 
-        game = self.games[request.game_id]
         try:
-            validation_response = self.validation_stub.ValidateBingo(
+            validation_response = self.validation.call('ValidateBingo',
                 bingo_pb2.ValidateBingoRequest(
                     player_id=request.player_id,
-                    numbers=game.drawn_numbers
-                )
+                    numbers_bitmap=bitmap.encode(game.drawn_mask),
+                    numbers=game.drawn_numbers if self.send_number_lists else ()
+                ),
+                context
             )
             if validation_response.bingo:
-                 print(f"[GAME SERVICE] 🏆 BINGO confirmado para {request.player_id}!")
-
-            return bingo_pb2.CheckBingoResponse(bingo=validation_response.bingo)
+                 game.winner = game.winner or request.player_id
+                 self.draw_feed.publish(game)  # encerra os WatchDraws do jogo
+                 pattern_name = bingo_pb2.WinPattern.Name(validation_response.pattern)
+                 print(f"[GAME SERVICE] 🏆 BINGO ({pattern_name}) confirmado para {request.player_id}!")
+
+            return bingo_pb2.CheckBingoResponse(
+                bingo=validation_response.bingo,
+                pattern=validation_response.pattern
+            )
         except grpc.RpcError:
             return bingo_pb2.CheckBingoResponse(bingo=False)
 
+    def ListGames(self, request, context):
+        start, end = _page(request, context)
+        for index in range(start, min(end, len(self.game_order))):
+            game = self.games[self.game_order[index]]
+            yield bingo_pb2.GameSummary(
+                game_id=game.game_id,
+                game_name=game.game_name,
+                players=len(game.players),
+                numbers_drawn=len(game.drawn_numbers),
+                winner_id=game.winner or '',
+                cursor=str(index + 1)
+            )
+
+    def ListPlayers(self, request, context):
+        if request.game_id:
+            game = self.games.get(request.game_id)
+            if game is None:
+                context.abort(grpc.StatusCode.NOT_FOUND, "Jogo não encontrado")
+            order = game.player_order
+        else:
+            order = self.player_order
+
+        start, end = _page(request, context)
+        for index in range(start, min(end, len(order))):
+            player_id = order[index]
+            game_id = self.player_games.get(player_id, request.game_id)
+            yield bingo_pb2.PlayerSummary(
+                player_id=player_id,
+                player_name=self.games[game_id].players[player_id]["name"],
+                game_id=game_id,
+                cursor=str(index + 1)
+            )
+
+    def WatchDraws(self, request, context):
+        game = self.games.get(request.game_id)
+        if game is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, "Jogo não encontrado")
+        yield from self.draw_feed.watch(game, request.from_round, context)
+
+def _page(request, context):
+    """Converte cursor/limit do pedido no intervalo [início, fim) da listagem."""
+    try:
+        start = int(request.cursor or 0)
+    except ValueError:
+        start = -1
+    if start < 0:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Cursor inválido")
+    limit = min(request.limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    return start, start + limit
+
 def serve():
     print("[GAME SERVICE] 📊 Iniciando servidor de métricas na porta 8001...")
-    start_http_server(8001)
+    # STATE_BYTES_INTERVAL: segundos entre medições de state_approx_bytes (0 desliga)
+    stats = RuntimeStats(bytes_interval=float(os.getenv('STATE_BYTES_INTERVAL', '60')))
+    start_admin_server(8001, routes={'/debug/state': stats.handle})
 
     validation_addr = os.getenv('VALIDATION_SERVICE_ADDR', 'validation-server-service:50052')
     print(f"[GAME SERVICE] Conectando ao ValidationService em {validation_addr}...")
 
-    channel = grpc.insecure_channel(validation_addr)
-    validation_stub = bingo_pb2_grpc.ValidationServiceStub(channel)
+    # Vários canais (conexões HTTP/2) para o ValidationService; VALIDATION_CHANNELS=1 volta a um só
+    channel_pool = pool_from_env(os.environ, validation_addr, bingo_pb2_grpc.ValidationServiceStub)
+    validation_stub = channel_pool.stub
+    print(f"[GAME SERVICE] {len(channel_pool.channels)} canais para o ValidationService ({channel_pool.policy})")
+
+    # Réplica para requisições hedged (opcional)
+    hedge_stub = None
+    hedge_addr = os.getenv('VALIDATION_HEDGE_ADDR')
+    if hedge_addr:
+        print(f"[GAME SERVICE] Hedging de leituras para {hedge_addr}")
+        hedge_channel = grpc.insecure_channel(hedge_addr, options=[('grpc.use_local_subchannel_pool', 1)])
+        hedge_stub = bingo_pb2_grpc.ValidationServiceStub(hedge_channel)
+
+    # VALIDATION_BUDGETS="ValidateBingo=0.3,RegisterCard=1" (segundos por método)
+    budgets = {}
+    for item in filter(None, os.getenv('VALIDATION_BUDGETS', '').split(',')):
+        method, seconds = item.split('=')
+        budgets[method.strip()] = float(seconds)
+
+    breaker = CircuitBreaker(
+        failure_threshold=int(os.getenv('VALIDATION_BREAKER_FAILURES', '5')),
+        reset_timeout=float(os.getenv('VALIDATION_BREAKER_RESET', '5')),
+    )
+    validation = ValidationClient(validation_stub, hedge_stub=hedge_stub, budgets=budgets, breaker=breaker)
+
+    card_pool = CardPool(capacity=int(os.getenv('CARD_POOL_SIZE', '20000')), on_miss=CARD_POOL_MISSES.inc).start()
+    CARD_POOL_AVAILABLE.set_function(lambda: len(card_pool))
 
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    bingo_pb2_grpc.add_GameServiceServicer_to_server(
-        GameServiceServicer(validation_stub),
-        server
+    workers = 10
+    load_shedder = LoadSheddingInterceptor(
+        limiter_from_env(os.environ, workers=workers),
+        priorities={'CheckBingo': CRITICAL},
     )
+
+    # Cada WatchDraws prende um worker: eles têm vagas próprias no executor
+    draw_feed = DrawFeed(max_watchers=int(os.getenv('DRAW_WATCHERS_MAX', '32')))
+    draw_scheduler = DrawScheduler(on_draw=draw_feed.publish).start()
+
+    # Repetições com a mesma idempotency-key não rodam o handler de novo
+    idempotency = interceptor_from_env(os.environ, ('CreateGame', 'RegisterPlayer', 'DrawNumber', 'MarkNumber'))
+
+    executor = stats.watch_executor(futures.ThreadPoolExecutor(max_workers=workers + draw_feed.max_watchers))
+    # O load shedder fica por fora: uma repetição respondida pelo cache não
+    # chama o handler de dentro, e o token do limitador nunca seria liberado
+    server = grpc.server(executor, interceptors=[load_shedder, idempotency, stats.interceptor()],
+                         maximum_concurrent_rpcs=load_shedder.limiter.max_limit)
+    # VALIDATION_SEND_NUMBER_LISTS=0 quando todos os ValidationService já leem os bitmaps
+    servicer = GameServiceServicer(validation, card_pool, draw_scheduler, rate_limiter_from_env(os.environ), draw_feed,
+                                   send_number_lists=os.getenv('VALIDATION_SEND_NUMBER_LISTS', '1') != '0')
+    bingo_pb2_grpc.add_GameServiceServicer_to_server(servicer, server)
+
+    stats.track('games', lambda: servicer.games, exclude=(card_pool, draw_scheduler))
+    stats.track('players', lambda: servicer.player_games)
+    stats.track('card_pool', lambda: card_pool)
     server.add_insecure_port('[::]:50051')
     server.start()
     print("[GAME SERVICE] 🚀 Servidor gRPC rodando na porta 50051...\n")
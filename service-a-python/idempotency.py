@@ -0,0 +1,152 @@
+"""
+Chaves de idempotência para as RPCs que alteram estado no GameService.
+
+O cliente manda a mesma chave (metadata ``idempotency-key``) em todas as
+tentativas de uma mesma operação. A primeira execução roda o handler e a
+resposta fica guardada por ``ttl`` segundos; as repetições recebem a
+resposta original sem rodar o handler de novo (e sem novo RegisterCard no
+ValidationService). Uma repetição que chega enquanto a primeira ainda está
+rodando espera por ela só até ``in_progress_wait`` segundos e então recebe
+ABORTED: a espera prende um worker do executor, e poucas repetições
+esperando muito tempo parariam o servidor. O cliente tenta de novo depois,
+com a mesma chave.
+
+Só respostas bem-sucedidas ficam no cache: se o handler abortar, a próxima
+tentativa com a mesma chave executa normalmente. Reusar a chave com outro
+pedido é INVALID_ARGUMENT. Sem a metadata nada muda.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import grpc
+from prometheus_client import Counter, Gauge
+
+METADATA_KEY = "idempotency-key"
+MAX_KEY_LENGTH = 128
+IN_PROGRESS_WAIT = 0.5  # espera máxima (s) de uma repetição pelo pedido original
+
+IDEMPOTENT_REPLAYS = Counter(
+    'idempotency_replays_total',
+    'Requests answered from the idempotency cache without running the handler',
+    ['method']
+)
+IDEMPOTENCY_ENTRIES = Gauge('idempotency_cache_entries', 'Responses kept in the idempotency cache')
+
+
+class _Entry:
+    __slots__ = ("request", "response", "expires", "done")
+
+    def __init__(self, request):
+        self.request = request
+        self.response = None
+        self.expires = None  # None enquanto o handler roda
+        self.done = threading.Event()
+
+
+class IdempotencyCache:
+    """Cache limitado por tamanho e TTL; o mais antigo sai primeiro."""
+
+    def __init__(self, ttl=600.0, max_entries=100000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        IDEMPOTENCY_ENTRIES.set_function(lambda: len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, now):
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and (entry.expires is None or entry.expires > now):
+                break
+            del self._entries[key]
+
+    def begin(self, key, request):
+        """Retorna (entrada, dona): ``dona`` é True se quem chamou deve rodar o handler."""
+        now = self.clock()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(key)
+            if entry is not None and (entry.expires is None or entry.expires > now):
+                return entry, False
+            entry = self._entries[key] = _Entry(request)
+            return entry, True
+
+    def finish(self, key, entry, response):
+        with self._lock:
+            entry.response = response
+            entry.expires = self.clock() + self.ttl
+            # Começa a contar o TTL agora: move para o fim da fila de expiração
+            if self._entries.get(key) is entry:
+                self._entries.move_to_end(key)
+        entry.done.set()
+
+    def fail(self, key, entry):
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.done.set()
+
+
+class IdempotencyInterceptor(grpc.ServerInterceptor):
+    def __init__(self, methods, cache=None, in_progress_wait=IN_PROGRESS_WAIT):
+        self.methods = frozenset(methods)
+        self.cache = cache or IdempotencyCache()
+        self.in_progress_wait = in_progress_wait
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        if method not in self.methods:
+            return handler
+        key = next((v for k, v in handler_call_details.invocation_metadata or () if k == METADATA_KEY), None)
+        if not key:
+            return handler
+
+        behavior = handler.unary_unary
+        cache = self.cache
+        cache_key = (method, key)
+        max_wait = self.in_progress_wait
+
+        def idempotent(request, context):
+            if len(key) > MAX_KEY_LENGTH:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Chave de idempotência muito longa")
+            while True:
+                entry, owner = cache.begin(cache_key, request)
+                if owner:
+                    break
+                if entry.request != request:
+                    context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                                  "Chave de idempotência já usada com outro pedido")
+                remaining = context.time_remaining()
+                entry.done.wait(max_wait if remaining is None else min(remaining, max_wait))
+                if entry.response is not None:
+                    IDEMPOTENT_REPLAYS.labels(method=method).inc()
+                    return entry.response
+                if not entry.done.is_set():
+                    context.abort(grpc.StatusCode.ABORTED, "Pedido original ainda em andamento, tente de novo")
+                # O pedido original falhou: tenta de novo como dono
+
+            try:
+                response = behavior(request, context)
+            except BaseException:
+                cache.fail(cache_key, entry)
+                raise
+            cache.finish(cache_key, entry, response)
+            return response
+
+        return handler._replace(unary_unary=idempotent)
+
+
+def interceptor_from_env(env, methods):
+    return IdempotencyInterceptor(methods, IdempotencyCache(
+        ttl=float(env.get('IDEMPOTENCY_TTL', '600')),
+        max_entries=int(env.get('IDEMPOTENCY_MAX_ENTRIES', '100000')),
+    ), in_progress_wait=float(env.get('IDEMPOTENCY_IN_PROGRESS_WAIT', str(IN_PROGRESS_WAIT))))
@@ -0,0 +1,164 @@
+"""
+Limite de concorrência adaptativo (AIMD) e descarte de carga para servidores gRPC.
+
+O interceptor conta uma requisição como "em andamento" desde que ela chega
+(inclusive enquanto espera na fila do ThreadPoolExecutor) até a resposta, e
+marca quando um worker começa a atendê-la. O sinal de congestionamento é a
+fila: a média móvel (EWMA) de quantas requisições admitidas ainda esperam
+worker. Medir a espera em segundos não funciona aqui: com o GIL, acordar
+uma thread custa alguns ms, e isso aparece como "fila" mesmo com workers
+sobrando. Pela lei de Little, fila de ``tolerance`` x workers é o mesmo que
+esperar ``tolerance`` x o tempo de execução, sem depender de qual método
+roda (um método rápido não vira referência para um lento).
+
+Se a fila passa disso, o limite cai multiplicativamente; enquanto o limite
+estiver sendo usado sem fila, ele sobe de forma aditiva. O limite nunca
+fica abaixo do número de workers: menos que isso só deixaria threads
+paradas.
+
+Requisições acima do limite são recusadas com RESOURCE_EXHAUSTED pelo
+próprio interceptor (``_reject``): ocupam um worker por um instante, sem
+rodar o handler. O ``maximum_concurrent_rpcs`` público do grpc.server fica
+só como teto fixo (``limiter.max_limit``), definido uma vez ao criar o
+servidor.
+
+Prioridades: cada prioridade só pode ocupar uma fração do limite, então
+quando o servidor aperta as de menor prioridade são descartadas primeiro.
+
+Este arquivo é idêntico em service-a-python e service-b-python.
+"""
+import threading
+import time
+
+import grpc
+from prometheus_client import Counter, Gauge
+
+CRITICAL = "critical"
+NORMAL = "normal"
+LOW = "low"
+
+# Fração do limite que cada prioridade pode ocupar
+PRIORITY_SHARE = {CRITICAL: 1.0, NORMAL: 0.9, LOW: 0.5}
+
+
+class AIMDLimiter:
+    def __init__(self, initial=20, min_limit=4, max_limit=500, backoff=0.9,
+                 tolerance=2.0, smoothing=0.05, stale_after=60.0, workers=1):
+        self.workers = max(1, workers)
+        self.min_limit = max(min_limit, workers)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = float(min(self.max_limit, max(initial, self.min_limit)))
+        self.backoff = backoff
+        self.tolerance = tolerance  # fila tolerada, em múltiplos do número de workers
+        self.smoothing = smoothing  # peso de cada amostra na média móvel da fila
+        self.stale_after = stale_after
+
+        self._lock = threading.Lock()
+        self._inflight = {}  # token -> instante de chegada
+        self._running = set()  # tokens que já estão num worker
+        self._next_token = 0
+        self._queue = 0.0
+        self._last_decrease = 0.0
+
+    @property
+    def inflight(self):
+        return len(self._inflight)
+
+    def try_acquire(self, priority=NORMAL):
+        """Retorna um token ou None se a prioridade já ocupou sua parte do limite."""
+        with self._lock:
+            allowed = max(1, int(self.limit * PRIORITY_SHARE.get(priority, PRIORITY_SHARE[NORMAL])))
+            if len(self._inflight) >= allowed:
+                self._expire_stale()
+                if len(self._inflight) >= allowed:
+                    return None
+            token = self._next_token
+            self._next_token += 1
+            self._inflight[token] = time.monotonic()
+            return token
+
+    def start(self, token):
+        """Um worker começou a atender a requisição do token."""
+        with self._lock:
+            if token in self._inflight:
+                self._running.add(token)
+
+    def release(self, token):
+        with self._lock:
+            arrival = self._inflight.pop(token, None)
+            self._running.discard(token)
+            if arrival is not None:
+                self._update(arrival)
+
+    def _expire_stale(self):
+        # RPCs canceladas antes de chegar a um worker nunca liberam o token
+        cutoff = time.monotonic() - self.stale_after
+        for token in [t for t, start in self._inflight.items() if start < cutoff]:
+            del self._inflight[token]
+            self._running.discard(token)
+
+    def _update(self, arrival):
+        waiting = len(self._inflight) - len(self._running)
+        self._queue += self.smoothing * (waiting - self._queue)
+
+        if self._queue > self.tolerance * self.workers:
+            # Só reduz uma vez por "geração": ignora respostas que já estavam em voo
+            if arrival >= self._last_decrease:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+        elif len(self._inflight) * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+
+class LoadSheddingInterceptor(grpc.ServerInterceptor):
+    """Aplica o limitador a todas as RPCs unárias do servidor."""
+
+    def __init__(self, limiter, priorities=None, metrics_prefix=""):
+        self.limiter = limiter
+        self.priorities = priorities or {}
+        self.shed = Counter(
+            f"{metrics_prefix}grpc_requests_shed_total",
+            "Requests rejected with RESOURCE_EXHAUSTED by the concurrency limiter",
+            ["method"],
+        )
+        Gauge(f"{metrics_prefix}concurrency_limit", "Current adaptive concurrency limit").set_function(
+            lambda: limiter.limit)
+        Gauge(f"{metrics_prefix}concurrency_inflight", "Requests queued or running under the limiter").set_function(
+            lambda: limiter.inflight)
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        token = self.limiter.try_acquire(self.priorities.get(method, NORMAL))
+        if token is None:
+            self.shed.labels(method=method).inc()
+            return handler._replace(unary_unary=_reject)
+
+        behavior = handler.unary_unary
+        limiter = self.limiter
+
+        def limited(request, context):
+            limiter.start(token)
+            try:
+                return behavior(request, context)
+            finally:
+                limiter.release(token)
+
+        return handler._replace(unary_unary=limited)
+
+
+def _reject(request, context):
+    # Roda num worker, mas não faz trabalho nenhum
+    context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Servidor sobrecarregado, tente novamente")
+
+
+def limiter_from_env(env, workers=1):
+    return AIMDLimiter(
+        initial=int(env.get("CONCURRENCY_LIMIT_INITIAL", "20")),
+        min_limit=int(env.get("CONCURRENCY_LIMIT_MIN", "4")),
+        max_limit=int(env.get("CONCURRENCY_LIMIT_MAX", "500")),
+        workers=workers,
+    )
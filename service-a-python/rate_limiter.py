@@ -0,0 +1,121 @@
+"""
+Limite de taxa por jogador e por jogo (token bucket) para o GameService.
+
+Cada bucket é só [fichas, último acesso] e é reabastecido na hora do uso
+(sem thread). Os buckets ficam em um OrderedDict na ordem do último uso;
+um bucket parado por ``burst / rate`` segundos já estaria cheio de novo,
+então descartá-lo não muda nada. A cada chamada os mais antigos nessa
+situação saem do começo da fila.
+
+Uma chamada só passa se houver ficha no bucket do jogador e no do jogo, e
+só então as duas são consumidas. CheckBingo tem um bucket próprio por
+jogador e não gasta fichas do jogo: quem marca números rápido (ou um jogo
+inteiro marcando ao mesmo tempo) ainda consegue pedir o bingo.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter, Gauge
+
+RATE_LIMITED = Counter(
+    'rate_limited_total',
+    'Requests rejected with RESOURCE_EXHAUSTED by the per-player/per-game rate limiter',
+    ['method', 'scope']
+)
+RATE_LIMIT_BUCKETS = Gauge('rate_limiter_buckets', 'Token buckets kept in memory', ['scope'])
+
+PLAYER = "player"
+GAME = "game"
+
+# Métodos com orçamento próprio por jogador, separado do das outras chamadas
+BINGO_METHODS = frozenset({'CheckBingo'})
+
+
+class TokenBuckets:
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.idle = self.burst / self.rate  # depois disso o bucket está cheio
+        self._buckets = OrderedDict()  # chave -> [fichas, último acesso]
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def level(self, key, now):
+        """Fichas disponíveis agora (reabastece o bucket) e o próprio bucket."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def evict(self, now, max_evictions=8):
+        cutoff = now - self.idle
+        for _ in range(max_evictions):
+            if not self._buckets:
+                return
+            key, bucket = next(iter(self._buckets.items()))
+            if bucket[1] > cutoff:
+                return
+            del self._buckets[key]
+
+
+class RateLimiter:
+    def __init__(self, player_rate=20, player_burst=40, game_rate=1000, game_burst=2000,
+                 bingo_rate=5, bingo_burst=10, clock=time.monotonic):
+        self.players = TokenBuckets(player_rate, player_burst)
+        self.games = TokenBuckets(game_rate, game_burst)
+        self.bingo_checks = TokenBuckets(bingo_rate, bingo_burst)
+        self.clock = clock
+        self._lock = threading.Lock()
+        RATE_LIMIT_BUCKETS.labels(scope=PLAYER).set_function(lambda: len(self.players))
+        RATE_LIMIT_BUCKETS.labels(scope=GAME).set_function(lambda: len(self.games))
+        RATE_LIMIT_BUCKETS.labels(scope='bingo_check').set_function(lambda: len(self.bingo_checks))
+
+    def check(self, method, player_id, game_id):
+        """None se a chamada pode seguir; senão o escopo que estourou ("player" ou "game")."""
+        now = self.clock()
+        if method in BINGO_METHODS:
+            with self._lock:
+                self.bingo_checks.evict(now)
+                bucket = self.bingo_checks.level(player_id, now)
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return None
+            RATE_LIMITED.labels(method=method, scope=PLAYER).inc()
+            return PLAYER
+
+        with self._lock:
+            self.players.evict(now)
+            self.games.evict(now)
+            player = self.players.level(player_id, now)
+            if player[0] < 1:
+                scope = PLAYER
+            else:
+                game = self.games.level(game_id, now)
+                if game[0] < 1:
+                    scope = GAME
+                else:
+                    player[0] -= 1
+                    game[0] -= 1
+                    return None
+        RATE_LIMITED.labels(method=method, scope=scope).inc()
+        return scope
+
+
+def limiter_from_env(env):
+    """RateLimiter configurado pelo ambiente; None com RATE_LIMIT_ENABLED=0."""
+    if env.get('RATE_LIMIT_ENABLED', '1') == '0':
+        return None
+    return RateLimiter(
+        player_rate=float(env.get('PLAYER_RATE_LIMIT', '20')),
+        player_burst=float(env.get('PLAYER_RATE_BURST', '40')),
+        game_rate=float(env.get('GAME_RATE_LIMIT', '1000')),
+        game_burst=float(env.get('GAME_RATE_BURST', '2000')),
+        bingo_rate=float(env.get('PLAYER_BINGO_RATE_LIMIT', '5')),
+        bingo_burst=float(env.get('PLAYER_BINGO_RATE_BURST', '10')),
+    )
@@ -0,0 +1,429 @@
+"""
+Cliente do ValidationService usado pelo GameService.
+
+- Propagação de deadline: cada chamada recebe como timeout o menor valor
+  entre o orçamento do método e o tempo que ainda resta na RPC de entrada.
+  Se não sobra tempo, falha na hora com DEADLINE_EXCEEDED sem chamar nada.
+- Requisições "hedged": para métodos somente leitura, se a resposta não
+  chega dentro do p95 observado, a mesma requisição é enviada a um segundo
+  destino e vale a primeira resposta bem-sucedida.
+- Circuit breaker: depois de falhas seguidas o circuito abre e as chamadas
+  falham na hora (CircuitOpenError). Após ``reset_timeout`` uma única
+  chamada de teste (half-open) decide se o circuito fecha de novo.
+- Escritas adiadas: ``call_or_defer`` guarda a escrita numa fila quando o
+  ValidationService falha por um dos RETRYABLE_CODES (inclusive com o
+  circuito ainda fechado) e a fila é reenviada, em ordem, assim que ele
+  volta a responder. Enquanto há fila, as escritas novas entram atrás dela.
+  A fila tem limite: cheia, a escrita nova falha com UNAVAILABLE em vez de
+  descartar uma antiga (normalmente o RegisterCard de que as outras dependem).
+  Erros locais (ex.: o deadline de quem chamou acabou) não são adiados.
+"""
+import threading
+import time
+from collections import deque
+
+import grpc
+from prometheus_client import Counter, Gauge
+
+# Orçamento padrão (s) por método; limitado pelo deadline de quem chamou
+DEFAULT_BUDGETS = {
+    'RegisterCard': 1.0,
+    'ValidateNumber': 0.5,
+    'ValidateBingo': 0.5,
+    'GetCard': 0.5,
+}
+DEFAULT_BUDGET = 1.0
+
+# Métodos sem efeito colateral, seguros para enviar duas vezes
+READ_ONLY_METHODS = ('ValidateBingo', 'GetCard')
+
+# Tempo reservado para o GameService montar a resposta depois da chamada
+DEADLINE_MARGIN = 0.005
+
+VALIDATION_DEADLINE_EXCEEDED = Counter(
+    'validation_client_deadline_exceeded_total',
+    'Validation calls skipped or failed because the deadline ran out',
+    ['method']
+)
+VALIDATION_HEDGES = Counter(
+    'validation_client_hedged_total',
+    'Hedged validation requests sent to a second target',
+    ['method']
+)
+VALIDATION_HEDGE_WINS = Counter(
+    'validation_client_hedge_wins_total',
+    'Hedged validation requests that answered before the primary',
+    ['method']
+)
+
+
+VALIDATION_CIRCUIT_STATE = Gauge(
+    'validation_client_circuit_state',
+    'Validation circuit breaker state (0=closed, 1=half-open, 2=open)'
+)
+VALIDATION_CIRCUIT_TRANSITIONS = Counter(
+    'validation_client_circuit_transitions_total',
+    'Validation circuit breaker state transitions',
+    ['state']
+)
+VALIDATION_DEFERRED = Gauge(
+    'validation_client_deferred_calls',
+    'Validation writes waiting to be replayed after the circuit closes'
+)
+VALIDATION_DEFERRED_REJECTED = Counter(
+    'validation_client_deferred_rejected_total',
+    'Validation writes refused because the deferred queue was full',
+    ['method']
+)
+VALIDATION_DEFERRED_DROPPED = Counter(
+    'validation_client_deferred_dropped_total',
+    'Deferred validation writes dropped on replay after a non-retryable error',
+    ['method', 'code']
+)
+
+# Códigos que indicam problema no ValidationService (e não na requisição)
+BREAKER_FAILURE_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+})
+
+# Códigos em que a escrita vale ser repetida mais tarde. RESOURCE_EXHAUSTED
+# é o load shedder do ValidationService: ele está de pé, só sobrecarregado,
+# então não conta para o circuito, mas a escrita também não pode se perder.
+RETRYABLE_CODES = BREAKER_FAILURE_CODES | {grpc.StatusCode.RESOURCE_EXHAUSTED}
+
+# Espera (s) entre reenvios da fila enquanto o ValidationService descarta carga
+REPLAY_BACKOFF_MIN = 0.05
+REPLAY_BACKOFF_MAX = 2.0
+
+
+class LocalRpcError(grpc.RpcError, grpc.Call):
+    """Erro gerado no próprio GameService, sem ter chamado o ValidationService."""
+
+    status_code = grpc.StatusCode.UNKNOWN
+
+    def __init__(self, details):
+        super().__init__(details)
+
+    def code(self):
+        return self.status_code
+
+    def details(self):
+        return str(self)
+
+    def initial_metadata(self):
+        return ()
+
+    def trailing_metadata(self):
+        return ()
+
+    def is_active(self):
+        return False
+
+    def time_remaining(self):
+        return 0
+
+    def cancel(self):
+        return False
+
+    def add_callback(self, callback):
+        return False
+
+
+class DeadlineExhausted(LocalRpcError):
+    """Não resta tempo para chamar o ValidationService."""
+
+    status_code = grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def __init__(self, method):
+        super().__init__(f"Sem tempo restante para chamar {method}")
+
+
+class CircuitOpenError(LocalRpcError):
+    """O circuito está aberto: a chamada nem foi tentada."""
+
+    status_code = grpc.StatusCode.UNAVAILABLE
+
+    def __init__(self, method):
+        super().__init__(f"Circuito aberto para o ValidationService ({method})")
+
+
+class DeferredQueueFull(LocalRpcError):
+    """A fila de escritas adiadas está cheia: a escrita não foi feita nem guardada."""
+
+    status_code = grpc.StatusCode.UNAVAILABLE
+
+    def __init__(self, method):
+        super().__init__(f"Fila de escritas adiadas cheia ({method})")
+
+
+class CircuitBreaker:
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+    def __init__(self, failure_threshold=5, reset_timeout=5.0, on_close=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_close = on_close
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        VALIDATION_CIRCUIT_STATE.set(self.state)
+
+    def _set_state(self, state):
+        self.state = state
+        VALIDATION_CIRCUIT_STATE.set(state)
+        VALIDATION_CIRCUIT_TRANSITIONS.labels(
+            state={self.CLOSED: 'closed', self.HALF_OPEN: 'half_open', self.OPEN: 'open'}[state]).inc()
+
+    def allow(self):
+        """True se a chamada pode seguir; no half-open só uma chamada de teste por vez."""
+        if self.state == self.CLOSED:
+            return True
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        if self.state == self.CLOSED and not self._failures:
+            return
+        closed = False
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+                closed = True
+        if closed and self.on_close is not None:
+            self.on_close()
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self._set_state(self.OPEN)
+                self._opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Libera a vaga de teste quando a chamada terminou sem dizer nada sobre a saúde do serviço."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class LatencyWindow:
+    """Janela das últimas latências; o quantil é recalculado a cada ``refresh`` amostras."""
+
+    def __init__(self, size=1000, refresh=100):
+        self._samples = deque(maxlen=size)
+        self._refresh = refresh
+        self._since_refresh = 0
+        self._cached = {}
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self._since_refresh += 1
+            if self._since_refresh >= self._refresh:
+                self._cached.clear()
+                self._since_refresh = 0
+
+    def quantile(self, q):
+        with self._lock:
+            if q not in self._cached:
+                if len(self._samples) < self._refresh:
+                    return None
+                ordered = sorted(self._samples)
+                self._cached[q] = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            return self._cached[q]
+
+
+class ValidationClient:
+    def __init__(self, stub, hedge_stub=None, budgets=None, hedge_methods=READ_ONLY_METHODS,
+                 hedge_quantile=0.95, min_hedge_delay=0.002, breaker=None, max_deferred=100000):
+        self.stub = stub
+        self.hedge_stub = hedge_stub
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self.hedge_methods = frozenset(hedge_methods) if hedge_stub is not None else frozenset()
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.latencies = {}
+
+        self.breaker = breaker or CircuitBreaker()
+        self.breaker.on_close = self._replay_deferred
+        self.max_deferred = max_deferred
+        self.deferred = deque()
+        self._deferred_lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        VALIDATION_DEFERRED.set_function(lambda: len(self.deferred))
+
+    def defer(self, method, request):
+        """Guarda uma escrita para reenviar quando o ValidationService voltar.
+
+        Levanta DeferredQueueFull se a fila já tem ``max_deferred`` escritas.
+        """
+        with self._deferred_lock:
+            if len(self.deferred) >= self.max_deferred:
+                VALIDATION_DEFERRED_REJECTED.labels(method=method).inc()
+                raise DeferredQueueFull(method)
+            self.deferred.append((method, request))
+
+    def call_or_defer(self, method, request, context=None):
+        """Escrita: chama agora ou guarda na fila; None quando foi adiada.
+
+        Sobem normalmente: erros da requisição (fora de RETRYABLE_CODES),
+        DeadlineExhausted (o tempo de quem chamou acabou, o ValidationService
+        nem foi chamado) e DeferredQueueFull.
+        """
+        if self.deferred:
+            # Não passa na frente do que está na fila (ex.: MarkNumber antes do RegisterCard)
+            self.defer(method, request)
+            self._replay_deferred()
+            return None
+        try:
+            return self.call(method, request, context)
+        except DeadlineExhausted:
+            raise
+        except grpc.RpcError as e:
+            if e.code() not in RETRYABLE_CODES:
+                raise
+            self.defer(method, request)
+            self._replay_deferred()
+            return None
+
+    def _replay_deferred(self):
+        if self.deferred and not self._replay_lock.locked():
+            threading.Thread(target=self._drain_deferred, name="validation-replay", daemon=True).start()
+
+    def _drain_deferred(self):
+        if not self._replay_lock.acquire(blocking=False):
+            return
+        backoff = REPLAY_BACKOFF_MIN
+        try:
+            while self.deferred:
+                method, request = self.deferred[0]
+                try:
+                    self.call(method, request)
+                except grpc.RpcError as e:
+                    if e.code() in BREAKER_FAILURE_CODES:
+                        return  # continua da mesma escrita quando o serviço responder
+                    if e.code() == grpc.StatusCode.RESOURCE_EXHAUSTED:
+                        # Serviço de pé mas descartando carga: tenta a mesma escrita de novo
+                        time.sleep(backoff)
+                        backoff = min(backoff * 2, REPLAY_BACKOFF_MAX)
+                        continue
+                    # Erro da própria requisição: repetir não adianta
+                    VALIDATION_DEFERRED_DROPPED.labels(method=method, code=e.code().name).inc()
+                    print(f"[GAME SERVICE] ⚠️  Falha ao reenviar {method}: {e.code()}")
+                backoff = REPLAY_BACKOFF_MIN
+                self.deferred.popleft()
+        finally:
+            self._replay_lock.release()
+
+    def _timeout(self, method, context):
+        timeout = self.budgets.get(method, DEFAULT_BUDGET)
+        remaining = context.time_remaining() if context is not None else None
+        if remaining is not None:
+            timeout = min(timeout, remaining - DEADLINE_MARGIN)
+        if timeout <= 0:
+            VALIDATION_DEADLINE_EXCEEDED.labels(method=method).inc()
+            raise DeadlineExhausted(method)
+        return timeout
+
+    def _window(self, method):
+        window = self.latencies.get(method)
+        if window is None:
+            window = self.latencies.setdefault(method, LatencyWindow())
+        return window
+
+    def call(self, method, request, context=None):
+        """Chama ``method`` no ValidationService respeitando o deadline de ``context``.
+
+        Levanta CircuitOpenError sem chamar nada se o circuito estiver aberto.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(method)
+        try:
+            timeout = self._timeout(method, context)
+        except DeadlineExhausted:
+            self.breaker.release_probe()
+            raise
+
+        start = time.monotonic()
+        try:
+            if method in self.hedge_methods:
+                response = self._hedged(method, request, timeout, start)
+            else:
+                response = getattr(self.stub, method)(request, timeout=timeout)
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                VALIDATION_DEADLINE_EXCEEDED.labels(method=method).inc()
+            if e.code() in BREAKER_FAILURE_CODES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        self._window(method).add(time.monotonic() - start)
+        # Falhas abaixo do failure_threshold não abrem o circuito, então o
+        # on_close não dispara: a fila também é reenviada no primeiro sucesso
+        self._replay_deferred()
+        return response
+
+    def _hedged(self, method, request, timeout, start):
+        primary = getattr(self.stub, method).future(request, timeout=timeout)
+
+        delay = self._window(method).quantile(self.hedge_quantile)
+        delay = max(delay, self.min_hedge_delay) if delay is not None else timeout
+        if delay >= timeout:
+            return primary.result()
+        try:
+            return primary.result(timeout=delay)
+        except grpc.FutureTimeoutError:
+            pass
+
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            return primary.result()
+        VALIDATION_HEDGES.labels(method=method).inc()
+        backup = getattr(self.hedge_stub, method).future(request, timeout=remaining)
+
+        # Vale a primeira resposta bem-sucedida; se as duas falharem, o erro do primário
+        done = threading.Condition()
+        finished = []
+
+        def on_done(future):
+            with done:
+                finished.append(future)
+                done.notify()
+
+        primary.add_done_callback(on_done)
+        backup.add_done_callback(on_done)
+        with done:
+            while True:
+                winner = next((f for f in finished if f.exception() is None), None)
+                if winner is not None or len(finished) == 2:
+                    break
+                done.wait()
+
+        if winner is None:
+            return primary.result()
+        loser = backup if winner is primary else primary
+        loser.cancel()
+        if winner is backup:
+            VALIDATION_HEDGE_WINS.labels(method=method).inc()
+        return winner.result()
@@ -39,6 +39,21 @@ class GameServiceStub(object):
                 request_serializer=bingo__pb2.CheckBingoRequest.SerializeToString,
                 response_deserializer=bingo__pb2.CheckBingoResponse.FromString,
                 )
+        self.ListGames = channel.unary_stream(
+                '/bingo.GameService/ListGames',
+                request_serializer=bingo__pb2.ListGamesRequest.SerializeToString,
+                response_deserializer=bingo__pb2.GameSummary.FromString,
+                )
+        self.ListPlayers = channel.unary_stream(
+                '/bingo.GameService/ListPlayers',
+                request_serializer=bingo__pb2.ListPlayersRequest.SerializeToString,
+                response_deserializer=bingo__pb2.PlayerSummary.FromString,
+                )
+        self.WatchDraws = channel.unary_stream(
+                '/bingo.GameService/WatchDraws',
+                request_serializer=bingo__pb2.WatchDrawsRequest.SerializeToString,
+                response_deserializer=bingo__pb2.DrawEvent.FromString,
+                )
 
 
 class GameServiceServicer(object):
@@ -74,6 +89,27 @@ class GameServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ListGames(self, request, context):
+        """Listagens paginadas por cursor: continue com o cursor do último item recebido
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListPlayers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchDraws(self, request, context):
+        """Números sorteados de um jogo: repete os já sorteados a partir de from_round
+        e segue com os novos até o jogo terminar
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GameServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -102,6 +138,21 @@ def add_GameServiceServicer_to_server(servicer, server):
                     request_deserializer=bingo__pb2.CheckBingoRequest.FromString,
                     response_serializer=bingo__pb2.CheckBingoResponse.SerializeToString,
             ),
+            'ListGames': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListGames,
+                    request_deserializer=bingo__pb2.ListGamesRequest.FromString,
+                    response_serializer=bingo__pb2.GameSummary.SerializeToString,
+            ),
+            'ListPlayers': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListPlayers,
+                    request_deserializer=bingo__pb2.ListPlayersRequest.FromString,
+                    response_serializer=bingo__pb2.PlayerSummary.SerializeToString,
+            ),
+            'WatchDraws': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchDraws,
+                    request_deserializer=bingo__pb2.WatchDrawsRequest.FromString,
+                    response_serializer=bingo__pb2.DrawEvent.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'bingo.GameService', rpc_method_handlers)
@@ -197,6 +248,57 @@ class GameService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def ListGames(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/bingo.GameService/ListGames',
+            bingo__pb2.ListGamesRequest.SerializeToString,
+            bingo__pb2.GameSummary.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ListPlayers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/bingo.GameService/ListPlayers',
+            bingo__pb2.ListPlayersRequest.SerializeToString,
+            bingo__pb2.PlayerSummary.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WatchDraws(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/bingo.GameService/WatchDraws',
+            bingo__pb2.WatchDrawsRequest.SerializeToString,
+            bingo__pb2.DrawEvent.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
 
 class ValidationServiceStub(object):
     """Missing associated documentation comment in .proto file."""
@@ -227,6 +329,11 @@ class ValidationServiceStub(object):
                 request_serializer=bingo__pb2.RegisterCardRequest.SerializeToString,
                 response_deserializer=bingo__pb2.RegisterCardResponse.FromString,
                 )
+        self.Replicate = channel.unary_stream(
+                '/bingo.ValidationService/Replicate',
+                request_serializer=bingo__pb2.ReplicateRequest.SerializeToString,
+                response_deserializer=bingo__pb2.ReplicationEntry.FromString,
+                )
 
 
 class ValidationServiceServicer(object):
@@ -257,6 +364,13 @@ class ValidationServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Replicate(self, request, context):
+        """Réplicas seguem o primário por este log ordenado de escritas
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ValidationServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -280,6 +394,11 @@ def add_ValidationServiceServicer_to_server(servicer, server):
                     request_deserializer=bingo__pb2.RegisterCardRequest.FromString,
                     response_serializer=bingo__pb2.RegisterCardResponse.SerializeToString,
             ),
+            'Replicate': grpc.unary_stream_rpc_method_handler(
+                    servicer.Replicate,
+                    request_deserializer=bingo__pb2.ReplicateRequest.FromString,
+                    response_serializer=bingo__pb2.ReplicationEntry.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'bingo.ValidationService', rpc_method_handlers)
@@ -357,3 +476,20 @@ class ValidationService(object):
             bingo__pb2.RegisterCardResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Replicate(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/bingo.ValidationService/Replicate',
+            bingo__pb2.ReplicateRequest.SerializeToString,
+            bingo__pb2.ReplicationEntry.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,73 @@
+"""
+Conjuntos de números 1-75 como bitmap de 10 bytes (campos "*_bitmap" do proto).
+
+Internamente os serviços usam um int como máscara (bit n = número n, o
+mesmo espaço de win_patterns); no fio vai ``mask >> 1`` em 10 bytes
+little-endian (bit n - 1 = número n). Codificar e decodificar custa o mesmo
+para 1 ou 75 números.
+
+Uma cartela em bitmap usa o layout canônico: cada coluna B-I-N-G-O em ordem
+crescente, linhas de cima para baixo, sem a casa FREE do centro.
+
+Este arquivo é idêntico em service-a-python e service-b-python.
+"""
+BITMAP_SIZE = 10
+MAX_NUMBER = 75
+
+GRID_SIZE = 5
+FREE_ROW = FREE_COL = 2
+
+_COLUMN_SIZES = [GRID_SIZE - 1 if c == FREE_COL else GRID_SIZE for c in range(GRID_SIZE)]
+_COLUMN_MASKS = [sum(1 << n for n in range(1 + 15 * c, 16 + 15 * c)) for c in range(GRID_SIZE)]
+
+
+def _canonical_order():
+    # Posição na lista ordenada de cada casa da cartela (linha a linha, sem FREE)
+    offsets = [sum(_COLUMN_SIZES[:c]) for c in range(GRID_SIZE)]
+    order = []
+    for row in range(GRID_SIZE):
+        for col in range(GRID_SIZE):
+            if col == FREE_COL:
+                if row == FREE_ROW:
+                    continue
+                order.append(offsets[col] + (row if row < FREE_ROW else row - 1))
+            else:
+                order.append(offsets[col] + row)
+    return tuple(order)
+
+
+_CANONICAL_ORDER = _canonical_order()
+
+
+def numbers_mask(numbers):
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+
+def encode(mask):
+    return (mask >> 1).to_bytes(BITMAP_SIZE, "little")
+
+
+def decode(data):
+    return int.from_bytes(data, "little") << 1
+
+
+def mask_numbers(mask):
+    """Números da máscara em ordem crescente (percorre só os bits ligados)."""
+    numbers = []
+    while mask:
+        low = mask & -mask
+        numbers.append(low.bit_length() - 1)
+        mask ^= low
+    return numbers
+
+
+def canonical_card(mask):
+    """Lista de 24 números em ordem de linha; fora do layout 5x5 devolve os números em ordem."""
+    numbers = mask_numbers(mask)
+    if any(bin(mask & column).count("1") != size for column, size in zip(_COLUMN_MASKS, _COLUMN_SIZES)):
+        return numbers
+    # Com as colunas em ordem crescente, a cartela é uma permutação fixa da lista ordenada
+    return [numbers[i] for i in _CANONICAL_ORDER]
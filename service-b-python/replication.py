@@ -0,0 +1,223 @@
+"""
+Replicação do ValidationService: um primário e réplicas somente leitura.
+
+Primário: cada escrita que muda estado (cartela registrada, número marcado)
+entra em um log ordenado em memória (``ReplicationLog``, limitado a
+``max_entries``). O RPC ``Replicate`` transmite o log a partir do ponto
+pedido pela réplica e manda heartbeats quando não há escrita.
+
+Cada stream de réplica prende uma thread do executor do primário enquanto
+durar (servidor síncrono do grpcio). O primário aceita no máximo
+``max_streams`` réplicas (VALIDATION_MAX_REPLICAS; as demais recebem
+RESOURCE_EXHAUSTED e tentam de novo) e reserva essa quantidade de workers a
+mais, então seguir o primário não tira capacidade das escritas.
+
+Réplica (``ReplicaFollower``): uma thread segue o stream e aplica as
+entradas em ordem no servicer local. Se a réplica é nova, ficou para trás
+além do que o log guarda ou o primário reiniciou (epoch diferente), o
+primário manda antes um snapshot completo do estado.
+
+Staleness: a réplica guarda o último instante em que estava em dia com o
+primário (aplicou tudo até ``head_seq``). Leituras só são atendidas se isso
+foi há no máximo ``max_staleness`` segundos; senão UNAVAILABLE, e o cliente
+tenta o primário.
+"""
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+
+import grpc
+from prometheus_client import Counter, Gauge
+
+import bingo_pb2
+import bingo_pb2_grpc
+import bitmap
+
+REGISTER = "register"
+MARK = "mark"
+
+REPLICATION_HEAD = Gauge('validation_replication_head_seq', 'Last sequence number written to the replication log')
+REPLICATION_STREAMS = Gauge('validation_replication_streams', 'Replicas currently following this primary')
+REPLICA_APPLIED = Gauge('validation_replica_applied_seq', 'Last replication entry applied by this replica')
+REPLICA_STALENESS = Gauge('validation_replica_staleness_seconds', 'Seconds since this replica was last caught up')
+REPLICA_RESYNCS = Counter('validation_replica_resyncs_total', 'Full snapshots received from the primary')
+
+
+# ==========================================
+# Primário
+# ==========================================
+
+class ReplicationLog:
+    def __init__(self, max_entries=100000, heartbeat=0.1, batch_size=500, max_streams=4):
+        self.epoch = uuid.uuid4().hex
+        self.max_streams = max_streams
+        self.heartbeat = heartbeat
+        self.batch_size = batch_size
+        self.last_seq = 0
+        self._entries = deque(maxlen=max_entries)  # (seq, op, args)
+        self._cond = threading.Condition()
+        self._streams = 0
+        REPLICATION_HEAD.set_function(lambda: self.last_seq)
+        REPLICATION_STREAMS.set_function(lambda: self._streams)
+
+    def append(self, op, *args):
+        with self._cond:
+            self.last_seq += 1
+            self._entries.append((self.last_seq, op, args))
+            self._cond.notify_all()
+
+    def _read(self, seq):
+        """(entradas a partir de ``seq``, head do log); None se ``seq`` já saiu do log.
+
+        O head é lido sob o mesmo lock que as entradas: lido depois, com
+        escritas contínuas ele já teria andado e a réplica nunca se veria em dia.
+        """
+        with self._cond:
+            if not self._entries:
+                return None if seq <= self.last_seq else ([], self.last_seq)
+            first = self._entries[0][0]
+            if seq < first:
+                return None
+            start = seq - first
+            return list(itertools.islice(self._entries, start, start + self.batch_size)), self.last_seq
+
+    def _wait(self, seq, timeout):
+        with self._cond:
+            if self.last_seq < seq:
+                self._cond.wait(timeout)
+
+    def stream(self, request, players, context):
+        """Corpo do RPC Replicate: snapshot se necessário, depois o log e heartbeats."""
+        seq = request.from_seq
+        if request.epoch != self.epoch or seq > self.last_seq + 1:
+            seq = 0  # réplica de outro primário (ou do futuro): recomeça do zero
+
+        with self._cond:
+            if self._streams >= self.max_streams:
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED,
+                              f"Primário já atende {self.max_streams} réplicas")
+            self._streams += 1
+        try:
+            while context.is_active():
+                read = self._read(seq) if seq else None
+                if read is None:
+                    seq = yield from self._snapshot(players)
+                    continue
+                batch, head = read
+                if not batch:
+                    self._wait(seq, self.heartbeat)
+                    if self.last_seq < seq:
+                        yield bingo_pb2.ReplicationEntry(seq=seq - 1, epoch=self.epoch, head_seq=self.last_seq)
+                    continue
+                for entry_seq, op, args in batch:
+                    yield _to_proto(entry_seq, op, args, self.epoch, head)
+                seq = batch[-1][0] + 1
+        finally:
+            with self._cond:
+                self._streams -= 1
+
+    def _snapshot(self, players):
+        snap_seq = self.last_seq
+        yield bingo_pb2.ReplicationEntry(seq=snap_seq, epoch=self.epoch, head_seq=snap_seq, reset=True)
+        # Escritas feitas durante a cópia também estão no log depois de snap_seq,
+        # e reaplicá-las por cima do snapshot dá o mesmo estado final
+        for player_id, player in list(players.items()):
+            yield bingo_pb2.ReplicationEntry(
+                seq=snap_seq, epoch=self.epoch, head_seq=snap_seq,
+                snapshot=bingo_pb2.PlayerState(
+                    player_id=player_id,
+                    card_numbers=player["card"],
+                    win_patterns=player["patterns"],
+                    marked_bitmap=bitmap.encode(player["marked"]),
+                ),
+            )
+        return snap_seq + 1
+
+
+def _to_proto(seq, op, args, epoch, head):
+    if op == REGISTER:
+        player_id, card, patterns = args
+        return bingo_pb2.ReplicationEntry(
+            seq=seq, epoch=epoch, head_seq=head,
+            register=bingo_pb2.RegisterCardRequest(player_id=player_id, card_numbers=card, win_patterns=patterns))
+    player_id, number = args
+    return bingo_pb2.ReplicationEntry(
+        seq=seq, epoch=epoch, head_seq=head,
+        mark=bingo_pb2.ValidateNumberRequest(player_id=player_id, number=number))
+
+
+# ==========================================
+# Réplica
+# ==========================================
+
+class ReplicaFollower:
+    def __init__(self, primary_addr, servicer, max_staleness=1.0, retry_delay=1.0):
+        self.primary_addr = primary_addr
+        self.servicer = servicer
+        self.max_staleness = max_staleness
+        self.retry_delay = retry_delay
+        self.epoch = ""
+        self.applied_seq = 0
+        self.caught_up_at = None
+        self._pending_epoch = None  # snapshot em andamento
+        self._thread = None
+        REPLICA_APPLIED.set_function(lambda: self.applied_seq)
+        REPLICA_STALENESS.set_function(self.staleness)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="replica-follower", daemon=True)
+            self._thread.start()
+        return self
+
+    def staleness(self):
+        if self.caught_up_at is None:
+            return float("inf")
+        return time.monotonic() - self.caught_up_at
+
+    def fresh(self):
+        return self.staleness() <= self.max_staleness
+
+    def _run(self):
+        channel = grpc.insecure_channel(self.primary_addr)
+        stub = bingo_pb2_grpc.ValidationServiceStub(channel)
+        while True:
+            try:
+                request = bingo_pb2.ReplicateRequest(epoch=self.epoch, from_seq=self.applied_seq + 1)
+                for entry in stub.Replicate(request):
+                    self.apply(entry)
+            except grpc.RpcError as e:
+                print(f"[VALIDATION REPLICA] ⚠️  Stream de replicação caiu: {e.code()}; tentando de novo")
+            time.sleep(self.retry_delay)
+
+    def apply(self, entry):
+        servicer = self.servicer
+        if entry.reset:
+            servicer.players = {}
+            # Só adota o epoch quando o snapshot termina; se o stream cair no
+            # meio, a próxima conexão pede outro snapshot
+            self.epoch = ""
+            self._pending_epoch = entry.epoch
+            self.caught_up_at = None
+            REPLICA_RESYNCS.inc()
+            print(f"[VALIDATION REPLICA] 🔄 Snapshot do primário (seq {entry.seq})")
+        op = entry.WhichOneof("op")
+        if op == "register":
+            servicer.register_card(entry.register.player_id, list(entry.register.card_numbers),
+                                   entry.register.win_patterns)
+        elif op == "mark":
+            servicer.mark(entry.mark.player_id, entry.mark.number)
+        elif op == "snapshot":
+            state = entry.snapshot
+            player = servicer.register_card(state.player_id, list(state.card_numbers), state.win_patterns)
+            player["marked"] = bitmap.decode(state.marked_bitmap)
+
+        self.applied_seq = entry.seq
+        if op == "snapshot" or entry.reset:
+            return
+        if self._pending_epoch is not None:
+            self.epoch, self._pending_epoch = self._pending_epoch, None
+        if entry.seq >= entry.head_seq:
+            self.caught_up_at = time.monotonic()
@@ -0,0 +1,223 @@
+"""
+Estado do servidor em tempo real: fila do ThreadPoolExecutor, workers
+ocupados, RPCs em andamento por método e tamanho das estruturas em memória.
+
+Contagens são calculadas na hora da leitura (scrape do Prometheus ou GET
+/debug/state no servidor de administração), sem custo por requisição além
+de um contador no interceptor.
+
+O tamanho em bytes é aproximado: mede a fundo uma amostra de entradas e
+multiplica pelo total, então serve para ver tendência, não para contabilidade.
+Essa medição percorre objetos Python e compete pela GIL com as RPCs, por isso
+o gauge é atualizado por uma thread a cada ``bytes_interval`` segundos e o
+scrape só lê o último valor; apenas /debug/state mede na hora.
+Estruturas de tamanho fixo (``track_fixed``, como o bloco de memória
+compartilhada do ValidationService) informam o tamanho exato e a capacidade.
+
+Este arquivo é idêntico em service-a-python e service-b-python.
+"""
+import itertools
+import json
+import sys
+import threading
+import time
+
+import grpc
+from prometheus_client import Gauge
+
+SAMPLE_SIZE = 100
+MAX_DEPTH = 6
+BYTES_INTERVAL = 60.0  # segundos entre medições do gauge de bytes
+
+
+def deep_sizeof(obj, seen=None, depth=0):
+    """Bytes de ``obj`` e do que ele referencia (containers, __dict__ e __slots__)."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or depth > MAX_DEPTH:
+        return 0
+    if isinstance(obj, int) and -5 <= obj <= 256:  # inteiros pequenos são compartilhados pelo CPython
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        items = itertools.chain.from_iterable(obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = obj
+    elif hasattr(obj, "__dict__"):
+        items = [vars(obj)]
+    elif hasattr(obj, "__slots__"):
+        items = [getattr(obj, name, None) for name in obj.__slots__]
+    else:
+        return size
+    try:
+        return size + sum(deep_sizeof(item, seen, depth + 1) for item in list(items))
+    except RuntimeError:  # mudou durante a leitura (outra thread); fica com o que deu
+        return size
+
+
+def approx_bytes(collection, sample_size=SAMPLE_SIZE, exclude=()):
+    """Estima o tamanho de um dict/list grande a partir de uma amostra das entradas.
+
+    Objetos em ``exclude`` (compartilhados entre entradas, como o pool de
+    cartelas referenciado por todo Game) não entram na conta.
+    """
+    total = len(collection)
+    if not total:
+        return sys.getsizeof(collection)
+    try:
+        if isinstance(collection, dict):
+            sample = list(itertools.islice(collection.items(), sample_size))
+        else:
+            sample = list(itertools.islice(collection, sample_size))
+    except RuntimeError:
+        return 0
+    if not sample:
+        return sys.getsizeof(collection)
+    excluded = {id(obj) for obj in exclude}
+    per_entry = sum(deep_sizeof(entry, set(excluded)) for entry in sample) / len(sample)
+    return int(sys.getsizeof(collection) + per_entry * total)
+
+
+class RuntimeStats:
+    def __init__(self, metrics_prefix="", bytes_interval=BYTES_INTERVAL):
+        self.executor = None
+        self.bytes_interval = bytes_interval
+        self._sizer = None
+        self.inflight = {}  # método -> RPCs rodando em um worker
+        self._structures = {}  # nome -> (função que devolve a estrutura, objetos excluídos)
+        self._fixed = {}  # nome -> (função que devolve o uso, capacidade, bytes)
+        self._lock = threading.Lock()
+
+        Gauge(f"{metrics_prefix}grpc_executor_queue_depth",
+              "RPCs waiting in the ThreadPoolExecutor queue").set_function(self.queue_depth)
+        Gauge(f"{metrics_prefix}grpc_executor_threads",
+              "Threads started by the ThreadPoolExecutor").set_function(self.executor_threads)
+        Gauge(f"{metrics_prefix}grpc_active_workers",
+              "Workers currently running an RPC handler").set_function(self.active_workers)
+        self._inflight_gauge = Gauge(f"{metrics_prefix}grpc_inflight_requests",
+                                     "RPC handlers running, by method", ["method"])
+        self._entries_gauge = Gauge(f"{metrics_prefix}state_entries",
+                                    "Entries in in-memory structures", ["structure"])
+        self._bytes_gauge = Gauge(f"{metrics_prefix}state_approx_bytes",
+                                  "Approximate memory of in-memory structures (sampled)", ["structure"])
+        self._capacity_gauge = Gauge(f"{metrics_prefix}state_capacity",
+                                     "Capacity of fixed-size structures", ["structure"])
+
+    def watch_executor(self, executor):
+        self.executor = executor
+        return executor
+
+    def track(self, name, getter, exclude=()):
+        """Registra uma estrutura (``getter()`` devolve o dict/list atual)."""
+        self._structures[name] = (getter, exclude)
+        self._entries_gauge.labels(structure=name).set_function(lambda: len(getter()))
+        if self._sizer is None and self.bytes_interval:
+            self._sizer = threading.Thread(target=self._size_loop, name="runtime-stats-sizer", daemon=True)
+            self._sizer.start()
+
+    def refresh_bytes(self):
+        """Mede as estruturas de ``track`` e atualiza o gauge de bytes."""
+        for name, (getter, exclude) in list(self._structures.items()):
+            self._bytes_gauge.labels(structure=name).set(approx_bytes(getter(), exclude=exclude))
+
+    def _size_loop(self):
+        while True:
+            time.sleep(self.bytes_interval)
+            self.refresh_bytes()
+
+    def track_fixed(self, name, entries, capacity, size_bytes):
+        """Registra uma estrutura de tamanho fixo: ``entries()`` é o uso atual."""
+        self._fixed[name] = (entries, capacity, size_bytes)
+        self._entries_gauge.labels(structure=name).set_function(entries)
+        self._bytes_gauge.labels(structure=name).set(size_bytes)
+        self._capacity_gauge.labels(structure=name).set(capacity)
+
+    # Leituras (usam atributos privados do ThreadPoolExecutor do CPython)
+
+    def queue_depth(self):
+        return self.executor._work_queue.qsize() if self.executor is not None else 0
+
+    def executor_threads(self):
+        return len(self.executor._threads) if self.executor is not None else 0
+
+    def active_workers(self):
+        return sum(self.inflight.values())
+
+    def _enter(self, method):
+        with self._lock:
+            count = self.inflight.get(method, 0) + 1
+            self.inflight[method] = count
+        if count == 1:
+            self._inflight_gauge.labels(method=method).set_function(lambda: self.inflight.get(method, 0))
+
+    def _exit(self, method):
+        with self._lock:
+            self.inflight[method] -= 1
+
+    def snapshot(self):
+        structures = {}
+        for name, (getter, exclude) in list(self._structures.items()):
+            collection = getter()
+            structures[name] = {"entries": len(collection), "approx_bytes": approx_bytes(collection, exclude=exclude)}
+        for name, (entries, capacity, size_bytes) in list(self._fixed.items()):
+            structures[name] = {"entries": entries(), "capacity": capacity, "approx_bytes": size_bytes}
+        return {
+            "executor": {
+                "queue_depth": self.queue_depth(),
+                "threads": self.executor_threads(),
+                "max_workers": getattr(self.executor, "_max_workers", None),
+                "active_workers": self.active_workers(),
+            },
+            "inflight": {method: count for method, count in list(self.inflight.items()) if count},
+            "structures": structures,
+            "threads": threading.active_count(),
+        }
+
+    def handle(self, params):
+        """Rota /debug/state do servidor de administração."""
+        body = json.dumps(self.snapshot(), indent=2, sort_keys=True)
+        return 200, "application/json", body.encode("utf-8")
+
+    def interceptor(self):
+        return _InFlightInterceptor(self)
+
+
+class _InFlightInterceptor(grpc.ServerInterceptor):
+    def __init__(self, stats):
+        self.stats = stats
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return handler
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        stats = self.stats
+
+        if handler.unary_unary is not None:
+            behavior = handler.unary_unary
+
+            def unary(request, context):
+                stats._enter(method)
+                try:
+                    return behavior(request, context)
+                finally:
+                    stats._exit(method)
+
+            return handler._replace(unary_unary=unary)
+
+        if handler.unary_stream is not None:
+            behavior = handler.unary_stream
+
+            def stream(request, context):
+                stats._enter(method)
+                try:
+                    yield from behavior(request, context)
+                finally:
+                    stats._exit(method)
+
+            return handler._replace(unary_stream=stream)
+
+        return handler
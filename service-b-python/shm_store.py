@@ -0,0 +1,204 @@
+"""
+Cartelas e marcações em memória compartilhada para o ValidationService com
+vários processos (VALIDATION_WORKERS > 1).
+
+Com um processo só, o GIL limita o serviço a um núcleo; com vários, cada um
+teria o seu ``players`` e um jogador só poderia ser atendido pelo processo
+que recebeu o RegisterCard. Aqui o estado fica em um bloco de
+``multiprocessing.shared_memory`` criado antes do fork, e qualquer worker
+atende qualquer jogador.
+
+Layout: uma tabela hash de endereçamento aberto (sondagem linear, crc32 do
+player_id) com ``capacity`` slots de tamanho fixo::
+
+    versão | len(id) | len(cartela) | nº de máscaras | player_id | cartela
+    | bitmap da cartela | máscaras (bitmap + padrão) | marcados (1 byte por número)
+
+- Marcar um número é escrever 1 no byte daquele número: uma escrita de um
+  byte, sem lock e sem perder marcações feitas por outro worker ao mesmo
+  tempo (não há ler-modificar-escrever).
+- Registrar uma cartela passa por um lock entre processos (só quem insere
+  disputa) e usa o byte de versão como seqlock: ímpar enquanto o slot está
+  sendo escrito, par quando pronto, 0 quando vazio. Leitores não travam;
+  copiam o slot e repetem se a versão mudou no meio.
+
+A ordem das escritas vale para x86 (TSO), onde o ValidationService roda.
+Slots não são liberados: o tamanho da tabela (VALIDATION_MAX_PLAYERS) é o
+limite de jogadores registrados.
+"""
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+
+from prometheus_client import Gauge
+
+import bitmap
+
+MAX_ID_LENGTH = 64
+MAX_CARD_LENGTH = 25
+MAX_MASKS = 16
+MASK_SIZE = bitmap.BITMAP_SIZE + 1  # bitmap + padrão
+
+# Offsets dentro de um slot
+_VERSION = 0
+_ID_LEN = 1
+_CARD_LEN = 2
+_MASK_COUNT = 3
+_ID = 4
+_CARD = _ID + MAX_ID_LENGTH
+_CARD_MASK = _CARD + MAX_CARD_LENGTH
+_MASKS = _CARD_MASK + bitmap.BITMAP_SIZE
+_MARKED = _MASKS + MAX_MASKS * MASK_SIZE
+SLOT_SIZE = _MARKED + bitmap.MAX_NUMBER + 1  # byte n = número n (0 não é usado)
+
+_HEADER = struct.Struct("<QQ")  # capacidade, slots ocupados
+_EMPTY_MARKS = bytes(bitmap.MAX_NUMBER + 1)
+_BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+
+SHM_PLAYERS = Gauge('validation_shm_players', 'Players registered in the shared-memory card store')
+SHM_CAPACITY = Gauge('validation_shm_capacity', 'Slots in the shared-memory card store')
+
+
+class StoreFull(Exception):
+    pass
+
+
+def _next_version(version):
+    """Versão ímpar (escrevendo) e a par seguinte (pronto) a partir da atual."""
+    writing = version + 1 if version else 1
+    return writing, (writing + 1 if writing < 255 else 2)
+
+
+class SharedCardStore:
+    def __init__(self, shm, lock):
+        self._shm = shm
+        self._buf = shm.buf
+        self._lock = lock
+        self.capacity, _ = _HEADER.unpack_from(self._buf, 0)
+        self._mask = self.capacity - 1
+        SHM_PLAYERS.set_function(lambda: len(self))
+        SHM_CAPACITY.set(self.capacity)
+
+    @classmethod
+    def create(cls, max_players, lock):
+        """Cria o bloco compartilhado (no processo pai, antes do fork)."""
+        capacity = 1
+        while capacity < max_players * 2:  # carga máxima de 50%
+            capacity *= 2
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity * SLOT_SIZE)
+        _HEADER.pack_into(shm.buf, 0, capacity, 0)
+        return cls(shm, lock)
+
+    def close(self, unlink=False):
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+    def __len__(self):
+        return _HEADER.unpack_from(self._buf, 0)[1]
+
+    @property
+    def size_bytes(self):
+        """Tamanho do bloco compartilhado (o mesmo em todos os workers)."""
+        return self._shm.size
+
+    def __contains__(self, player_id):
+        return self._find(player_id.encode()) is not None
+
+    def _offset(self, index):
+        return _HEADER.size + index * SLOT_SIZE
+
+    def _find(self, key, claim=False):
+        """Offset do slot de ``key``; com ``claim``, o primeiro vazio se não existir."""
+        buf = self._buf
+        index = zlib.crc32(key) & self._mask
+        for _ in range(self.capacity):
+            off = self._offset(index)
+            version = buf[off]
+            if version == 0:
+                return off if claim else None
+            if buf[off + _ID_LEN] == len(key) and buf[off + _ID:off + _ID + len(key)] == key:
+                return off
+            index = (index + 1) & self._mask
+        if claim:
+            raise StoreFull(f"Tabela de jogadores cheia ({self.capacity} slots)")
+        return None
+
+    # Escritas
+
+    def register(self, player_id, card, card_mask, masks):
+        key = player_id.encode()
+        if len(key) > MAX_ID_LENGTH:
+            raise ValueError(f"player_id maior que {MAX_ID_LENGTH} bytes")
+        if len(card) > MAX_CARD_LENGTH or len(masks) > MAX_MASKS:
+            raise ValueError("Cartela fora do tamanho suportado")
+        if any(not 0 < n <= bitmap.MAX_NUMBER for n in card):
+            raise ValueError(f"Números da cartela devem estar entre 1 e {bitmap.MAX_NUMBER}")
+
+        buf = self._buf
+        with self._lock:
+            off = self._find(key, claim=True)
+            version = buf[off]
+            writing, ready = _next_version(version)
+            buf[off + _VERSION] = writing
+            buf[off + _ID_LEN] = len(key)
+            buf[off + _CARD_LEN] = len(card)
+            buf[off + _MASK_COUNT] = len(masks)
+            buf[off + _ID:off + _ID + len(key)] = key
+            buf[off + _CARD:off + _CARD + len(card)] = bytes(card)
+            buf[off + _CARD_MASK:off + _MASKS] = bitmap.encode(card_mask)
+            for i, (mask, pattern) in enumerate(masks):
+                mask_off = off + _MASKS + i * MASK_SIZE
+                buf[mask_off:mask_off + bitmap.BITMAP_SIZE] = bitmap.encode(mask)
+                buf[mask_off + bitmap.BITMAP_SIZE] = pattern
+            buf[off + _MARKED:off + SLOT_SIZE] = _EMPTY_MARKS
+            buf[off + _VERSION] = ready
+            if version == 0:
+                capacity, used = _HEADER.unpack_from(buf, 0)
+                _HEADER.pack_into(buf, 0, capacity, used + 1)
+
+    def mark(self, player_id, number):
+        """Marca ``number`` se ele está na cartela; True se marcou."""
+        if not 0 < number <= bitmap.MAX_NUMBER:
+            return False
+        off = self._find(player_id.encode())
+        if off is None:
+            return False
+        buf = self._buf
+        if buf[off + _VERSION] & 1:  # cartela sendo registrada de novo agora
+            return False
+        bit = number - 1  # bitmap.encode descarta o bit 0
+        if not buf[off + _CARD_MASK + (bit >> 3)] >> (bit & 7) & 1:
+            return False
+        buf[off + _MARKED + number] = 1
+        return True
+
+    # Leituras
+
+    def _read_slot(self, off):
+        buf = self._buf
+        while True:
+            version = buf[off + _VERSION]
+            if not version & 1:
+                raw = bytes(buf[off:off + SLOT_SIZE])
+                if buf[off + _VERSION] == version:
+                    return raw
+            time.sleep(0)
+
+    def get(self, player_id, default=None):
+        """Cópia do jogador no mesmo formato do dict do modo de um processo (sem "patterns", que só a replicação usa)."""
+        off = self._find(player_id.encode())
+        if off is None:
+            return default
+        raw = self._read_slot(off)
+        from_bytes = int.from_bytes
+        return {
+            "card": list(raw[_CARD:_CARD + raw[_CARD_LEN]]),
+            "card_mask": bitmap.decode(raw[_CARD_MASK:_MASKS]),
+            "marked": int(raw[_MARKED:].translate(_BIT_CHARS)[::-1], 2),
+            # Mesmo formato de bitmap.decode (mask >> 1 no slot)
+            "masks": tuple((from_bytes(raw[o:o + bitmap.BITMAP_SIZE], "little") << 1, raw[o + bitmap.BITMAP_SIZE])
+                           for o in range(_MASKS, _MASKS + raw[_MASK_COUNT] * MASK_SIZE, MASK_SIZE)),
+        }
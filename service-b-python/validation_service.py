@@ -1,8 +1,21 @@
 import grpc
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import sys
+import threading
 from concurrent import futures
 import bingo_pb2
 import bingo_pb2_grpc
-from prometheus_client import start_http_server, Counter, Histogram
+import bitmap
+import win_patterns
+from load_shedding import CRITICAL, LOW, LoadSheddingInterceptor, limiter_from_env
+from admin_server import start_admin_server
+from runtime_stats import RuntimeStats
+from replication import MARK, REGISTER, ReplicaFollower, ReplicationLog
+from shm_store import SharedCardStore, StoreFull
+from prometheus_client import Counter, Histogram
 
 # ==========================================
 # MÉTRICAS PROMETHEUS (Padrão Service B)
@@ -18,13 +31,90 @@ GRPC_REQUEST_LATENCY = Histogram(
     ['method', 'status']
 )
 
+# Tuplas de padrões compartilhadas entre jogadores (todos de um jogo usam a mesma)
+_PATTERN_TUPLES = {}
+
 class ValidationServiceServicer(bingo_pb2_grpc.ValidationServiceServicer):
-    def __init__(self):
-        self.players = {}  # player_id -> {"card": [...], "marked": set()}
+    def __init__(self, log=None, replica=None, store=None):
+        # player_id -> {"card": [...], "card_mask": int, "marked": int,
+        #               "masks": ((mask, padrão), ...), "patterns": (padrão, ...)}
+        # Com vários workers é o SharedCardStore, que devolve cópias nesse formato em get()
+        self.players = store if store is not None else {}
+        self.store = store
+        self.log = log          # ReplicationLog quando é primário
+        self.replica = replica  # ReplicaFollower quando é réplica (somente leitura)
+        # Mudança de estado e entrada no log juntas: sem isso um MARK pode
+        # entrar no log antes do REGISTER do mesmo jogador
+        self._write_lock = threading.Lock()
+
+    def register_card(self, player_id, card, patterns, card_mask=None):
+        patterns = tuple(patterns)
+        patterns = _PATTERN_TUPLES.setdefault(patterns, patterns)
+        if card_mask is None:
+            card_mask = bitmap.numbers_mask(card)
+        masks = win_patterns.build_masks(card, patterns)
+        if self.store is not None:
+            self.store.register(player_id, card, card_mask, masks)
+            return None
+        with self._write_lock:
+            player = self.players[player_id] = {
+                "card": card,
+                "card_mask": card_mask,
+                "marked": 0,
+                "masks": masks,
+                "patterns": patterns,
+            }
+            if self.log is not None:
+                self.log.append(REGISTER, player_id, card, patterns)
+        return player
+
+    def mark(self, player_id, number):
+        if self.store is not None:
+            return self.store.mark(player_id, number)
+        if not 0 < number < 76:
+            return False
+        bit = 1 << number
+        with self._write_lock:
+            player = self.players.get(player_id)
+            if player is None or not player["card_mask"] & bit:
+                return False
+            player["marked"] |= bit
+            if self.log is not None:
+                self.log.append(MARK, player_id, number)
+        return True
+
+    def _read_only(self, context):
+        if self.replica is not None:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Réplica somente leitura; escreva no primário")
+
+    def _check_fresh(self, context):
+        if self.replica is not None and not self.replica.fresh():
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Réplica desatualizada; use o primário")
+
+    def _unknown_player(self, context):
+        # Na réplica pode ser um registro que ainda não chegou: quem leu aqui
+        # tenta o primário em vez de aceitar uma resposta vazia
+        if self.replica is not None:
+            context.abort(grpc.StatusCode.NOT_FOUND, "Jogador desconhecido nesta réplica")
 
     @GRPC_REQUEST_LATENCY.labels(method='RegisterCard', status='ok').time()
     def RegisterCard(self, request, context):
-        self.players[request.player_id] = {"card": list(request.card_numbers), "marked": set()}
+        self._read_only(context)
+        if request.card_bitmap:
+            card_mask = bitmap.decode(request.card_bitmap)
+            card = bitmap.canonical_card(card_mask)
+        else:
+            card = list(request.card_numbers)
+            card_mask = None
+        try:
+            self.register_card(request.player_id, card, request.win_patterns, card_mask)
+        except StoreFull as e:
+            # Não é sobrecarga passageira (RESOURCE_EXHAUSTED, que o GameService
+            # reenvia): tentar de novo não abre vaga na tabela
+            print(f"[VALIDATION SERVICE] ❌ {e}")
+            return bingo_pb2.RegisterCardResponse(success=False)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
         
         CARDS_REGISTERED.inc()
         
@@ -33,12 +123,8 @@ class ValidationServiceServicer(bingo_pb2_grpc.ValidationServiceServicer):
 
     @GRPC_REQUEST_LATENCY.labels(method='ValidateNumber', status='ok').time()
     def ValidateNumber(self, request, context):
-        is_valid = False
-        if request.player_id in self.players:
-            card = self.players[request.player_id]["card"]
-            if request.number in card:
-                self.players[request.player_id]["marked"].add(request.number)
-                is_valid = True
+        self._read_only(context)
+        is_valid = self.mark(request.player_id, request.number)
         
         result_label = "valid" if is_valid else "invalid"
         NUMBERS_VALIDATED.labels(result=result_label).inc()
@@ -47,13 +133,22 @@ class ValidationServiceServicer(bingo_pb2_grpc.ValidationServiceServicer):
 
     @GRPC_REQUEST_LATENCY.labels(method='ValidateBingo', status='ok').time()
     def ValidateBingo(self, request, context):
-        is_bingo = False
-        if request.player_id in self.players:
-            card = set(self.players[request.player_id]["card"])
-            marked = set(self.players[request.player_id]["marked"])
-            
-            if card.issubset(marked):
-                is_bingo = True
+        self._check_fresh(context)
+        pattern = None
+        player = self.players.get(request.player_id)
+        if player is None:
+            self._unknown_player(context)
+        else:
+            pattern = win_patterns.match(player["marked"], player["masks"])
+            # Confirma só com números que também foram sorteados; sem padrão
+            # completo o subconjunto também não completa, então nem decodifica
+            if pattern is not None and (request.numbers_bitmap or request.numbers):
+                if request.numbers_bitmap:
+                    drawn = bitmap.decode(request.numbers_bitmap)
+                else:
+                    drawn = bitmap.numbers_mask(request.numbers)
+                pattern = win_patterns.match(player["marked"] & drawn, player["masks"])
+        is_bingo = pattern is not None
 
         result_label = "winner" if is_bingo else "loser"
         BINGO_VALIDATED.labels(result=result_label).inc()
@@ -61,24 +156,107 @@ class ValidationServiceServicer(bingo_pb2_grpc.ValidationServiceServicer):
         if is_bingo:
             print(f"[VALIDATION SERVICE] 🏆 BINGO VALIDADO para {request.player_id}!")
 
-        return bingo_pb2.ValidateBingoResponse(bingo=is_bingo)
+            return bingo_pb2.ValidateBingoResponse(bingo=True, pattern=pattern)
+        return bingo_pb2.ValidateBingoResponse(bingo=False)
 
     @GRPC_REQUEST_LATENCY.labels(method='GetCard', status='ok').time()
     def GetCard(self, request, context):
-        if request.player_id in self.players:
-            return bingo_pb2.GetCardResponse(card_numbers=self.players[request.player_id]["card"])
+        self._check_fresh(context)
+        player = self.players.get(request.player_id)
+        if player is not None:
+            return bingo_pb2.GetCardResponse(card_numbers=player["card"])
+        self._unknown_player(context)
         return bingo_pb2.GetCardResponse(card_numbers=[])
 
-def serve():
-    print("[VALIDATION SERVICE] 📊 Iniciando servidor de métricas na porta 8002...")
-    start_http_server(8002)
+    def Replicate(self, request, context):
+        if self.log is None:
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Este ValidationService não é primário")
+        yield from self.log.stream(request, self.players, context)
 
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    bingo_pb2_grpc.add_ValidationServiceServicer_to_server(ValidationServiceServicer(), server)
-    server.add_insecure_port('[::]:50052')
+def run_server(store=None, worker=0):
+    grpc_port = int(os.getenv('VALIDATION_PORT', '50052'))
+    # Com vários workers cada um tem o seu servidor de métricas: METRICS_PORT + índice
+    metrics_port = int(os.getenv('METRICS_PORT', '8002')) + worker
+    print(f"[VALIDATION SERVICE] 📊 Iniciando servidor de métricas na porta {metrics_port}...")
+    # STATE_BYTES_INTERVAL: segundos entre medições de state_approx_bytes (0 desliga)
+    stats = RuntimeStats(metrics_prefix='validation_',
+                         bytes_interval=float(os.getenv('STATE_BYTES_INTERVAL', '60')))
+    start_admin_server(metrics_port, routes={'/debug/state': stats.handle})
+
+    workers = 10
+    load_shedder = LoadSheddingInterceptor(
+        limiter_from_env(os.environ, workers=workers),
+        priorities={'ValidateBingo': CRITICAL, 'GetCard': LOW},
+        metrics_prefix='validation_',
+    )
+
+    server_options = [
+        ('grpc.max_concurrent_streams', int(os.getenv('GRPC_MAX_CONCURRENT_STREAMS', '100'))),
+        # Aceita os pings de keepalive dos canais do GameService sem responder GOAWAY
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.min_ping_interval_without_data_ms', 10000),
+        # Todos os workers escutam na mesma porta; o kernel distribui as conexões
+        ('grpc.so_reuseport', 1),
+    ]
+    # VALIDATION_PRIMARY_ADDR definido = réplica somente leitura seguindo esse primário
+    primary_addr = os.getenv('VALIDATION_PRIMARY_ADDR')
+    replication_workers = 0
+    if store is not None:
+        # O log de replicação é por processo; com vários workers não há Replicate
+        servicer = ValidationServiceServicer(store=store)
+    elif primary_addr:
+        servicer = ValidationServiceServicer()
+        servicer.replica = ReplicaFollower(
+            primary_addr, servicer, max_staleness=float(os.getenv('VALIDATION_MAX_STALENESS', '1.0'))).start()
+        print(f"[VALIDATION SERVICE] 📡 Réplica seguindo o primário {primary_addr}")
+    else:
+        log = ReplicationLog(int(os.getenv('REPLICATION_LOG_SIZE', '100000')),
+                             max_streams=int(os.getenv('VALIDATION_MAX_REPLICAS', '4')))
+        servicer = ValidationServiceServicer(log=log)
+        # Cada Replicate prende um worker: as réplicas têm vagas próprias no executor
+        replication_workers = log.max_streams
+
+    executor = stats.watch_executor(futures.ThreadPoolExecutor(max_workers=workers + replication_workers))
+    server = grpc.server(executor, interceptors=[load_shedder, stats.interceptor()], options=server_options,
+                         maximum_concurrent_rpcs=load_shedder.limiter.max_limit)
+    bingo_pb2_grpc.add_ValidationServiceServicer_to_server(servicer, server)
+    if store is None:
+        stats.track('cards', lambda: servicer.players)
+    else:
+        stats.track_fixed('cards', lambda: len(store), store.capacity, store.size_bytes)
+    server.add_insecure_port(f'[::]:{grpc_port}')
     server.start()
-    print("[VALIDATION SERVICE] 🚀 Rodando gRPC na porta 50052...")
+    print(f"[VALIDATION SERVICE] 🚀 Worker {worker} rodando gRPC na porta {grpc_port}...")
     server.wait_for_termination()
 
+def serve():
+    workers = int(os.getenv('VALIDATION_WORKERS', '1'))
+    if workers <= 1:
+        run_server()
+        return
+    if os.getenv('VALIDATION_PRIMARY_ADDR'):
+        sys.exit("[VALIDATION SERVICE] ❌ Réplica não suporta VALIDATION_WORKERS > 1")
+
+    # O bloco compartilhado e o lock são criados antes do fork; gRPC e métricas
+    # só são iniciados dentro de cada worker
+    ctx = multiprocessing.get_context('fork')
+    store = SharedCardStore.create(int(os.getenv('VALIDATION_MAX_PLAYERS', '100000')), ctx.Lock())
+    print(f"[VALIDATION SERVICE] 🧠 Memória compartilhada com {store.capacity} slots; iniciando {workers} workers...")
+    procs = [ctx.Process(target=run_server, args=(store, i), name=f'validation-worker-{i}') for i in range(workers)]
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for proc in procs:
+            proc.start()
+        # Se um worker morrer, derruba os outros e deixa o orquestrador reiniciar tudo
+        multiprocessing.connection.wait([proc.sentinel for proc in procs])
+        print("[VALIDATION SERVICE] ⚠️  Um worker terminou; encerrando os demais")
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        for proc in procs:
+            proc.join()
+        store.close(unlink=True)
+
 if __name__ == '__main__':
-    serve()
\ No newline at end of file
+    serve()
@@ -0,0 +1,73 @@
+"""
+Padrões de vitória para a cartela 5x5 (B-I-N-G-O) com FREE no centro.
+
+A cartela chega como uma lista de 24 números em ordem de linha, com a casa
+FREE omitida (mesmo layout usado por renderCard no frontend). No registro,
+cada padrão é convertido em máscaras de bits no espaço dos números
+(bit n = número n), então conferir o bingo custa um AND por máscara.
+"""
+import bingo_pb2
+from bitmap import numbers_mask
+
+GRID_SIZE = 5
+FREE_CELL = 12  # casa (2, 2)
+CARD_SIZE = GRID_SIZE * GRID_SIZE - 1
+
+_ROWS = [tuple(r * GRID_SIZE + c for c in range(GRID_SIZE)) for r in range(GRID_SIZE)]
+_COLUMNS = [tuple(r * GRID_SIZE + c for r in range(GRID_SIZE)) for c in range(GRID_SIZE)]
+_DIAGONALS = [
+    tuple(i * GRID_SIZE + i for i in range(GRID_SIZE)),
+    tuple(i * GRID_SIZE + (GRID_SIZE - 1 - i) for i in range(GRID_SIZE)),
+]
+_CORNERS = [(0, GRID_SIZE - 1, GRID_SIZE * (GRID_SIZE - 1), GRID_SIZE * GRID_SIZE - 1)]
+_BLACKOUT = [tuple(range(GRID_SIZE * GRID_SIZE))]
+
+# padrão -> lista de conjuntos de casas que completam o padrão
+PATTERN_CELLS = {
+    bingo_pb2.BLACKOUT: _BLACKOUT,
+    bingo_pb2.ROW: _ROWS,
+    bingo_pb2.COLUMN: _COLUMNS,
+    bingo_pb2.DIAGONAL: _DIAGONALS,
+    bingo_pb2.CORNERS: _CORNERS,
+}
+
+DEFAULT_PATTERNS = (bingo_pb2.BLACKOUT,)
+
+
+def build_masks(card, patterns):
+    """Retorna uma tupla de (máscara, padrão) para a cartela, da menor para a maior.
+
+    Máscaras que contêm outra máscara são descartadas: se a menor estiver
+    completa a maior nunca será consultada.
+    """
+    patterns = [p for p in patterns if p in PATTERN_CELLS] or list(DEFAULT_PATTERNS)
+
+    if len(card) != CARD_SIZE:
+        # Cartela fora do layout 5x5: só dá para conferir a cartela cheia
+        return ((numbers_mask(card), bingo_pb2.BLACKOUT),)
+
+    cell_bits = [0] * (GRID_SIZE * GRID_SIZE)
+    for index, number in enumerate(card):
+        cell_bits[index if index < FREE_CELL else index + 1] = 1 << number
+
+    candidates = {}
+    for pattern in patterns:
+        for cells in PATTERN_CELLS[pattern]:
+            mask = 0
+            for cell in cells:
+                mask |= cell_bits[cell]
+            candidates.setdefault(mask, pattern)
+
+    masks = []
+    for mask in sorted(candidates, key=lambda m: bin(m).count("1")):
+        if not any(mask & kept == kept for kept, _ in masks):
+            masks.append((mask, candidates[mask]))
+    return tuple(masks)
+
+
+def match(marked_mask, masks):
+    """Retorna o primeiro padrão completo pela máscara marcada, ou None."""
+    for mask, pattern in masks:
+        if marked_mask & mask == mask:
+            return pattern
+    return None
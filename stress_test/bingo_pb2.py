@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: bingo.proto
+# Protobuf Python Version: 4.25.0
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0b\x62ingo.proto\x12\x05\x62ingo\"i\n\x11\x43reateGameRequest\x12\x11\n\tgame_name\x18\x01 \x01(\t\x12\'\n\x0cwin_patterns\x18\x02 \x03(\x0e\x32\x11.bingo.WinPattern\x12\x18\n\x10\x64raw_interval_ms\x18\x03 \x01(\r\"%\n\x12\x43reateGameResponse\x12\x0f\n\x07game_id\x18\x01 \x01(\t\"=\n\x15RegisterPlayerRequest\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x13\n\x0bplayer_name\x18\x02 \x01(\t\"g\n\x16RegisterPlayerResponse\x12\x11\n\tplayer_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63\x61rd_numbers\x18\x02 \x03(\x05\x12\x0f\n\x07success\x18\x03 \x01(\x08\x12\x13\n\x0b\x63\x61rd_bitmap\x18\x04 \x01(\x0c\"$\n\x11\x44rawNumberRequest\x12\x0f\n\x07game_id\x18\x01 \x01(\t\"5\n\x12\x44rawNumberResponse\x12\x0e\n\x06number\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\"G\n\x11MarkNumberRequest\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x11\n\tplayer_id\x18\x02 \x01(\t\x12\x0e\n\x06number\x18\x03 \x01(\x05\"%\n\x12MarkNumberResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"7\n\x11\x43heckBingoRequest\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x11\n\tplayer_id\x18\x02 \x01(\t\"G\n\x12\x43heckBingoResponse\x12\r\n\x05\x62ingo\x18\x01 \x01(\x08\x12\"\n\x07pattern\x18\x02 \x01(\x0e\x32\x11.bingo.WinPattern\"1\n\x10ListGamesRequest\x12\x0e\n\x06\x63ursor\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\r\"|\n\x0bGameSummary\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x11\n\tgame_name\x18\x02 \x01(\t\x12\x0f\n\x07players\x18\x03 \x01(\r\x12\x15\n\rnumbers_drawn\x18\x04 \x01(\r\x12\x11\n\twinner_id\x18\x05 \x01(\t\x12\x0e\n\x06\x63ursor\x18\x06 \x01(\t\"D\n\x12ListPlayersRequest\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\r\"X\n\rPlayerSummary\x12\x11\n\tplayer_id\x18\x01 \x01(\t\x12\x13\n\x0bplayer_name\x18\x02 \x01(\t\x12\x0f\n\x07game_id\x18\x03 \x01(\t\x12\x0e\n\x06\x63ursor\x18\x04 \x01(\t\"8\n\x11WatchDrawsRequest\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x12\n\nfrom_round\x18\x02 \x01(\r\"*\n\tDrawEvent\x12\x0e\n\x06number\x18\x01 \x01(\x05\x12\r\n\x05round\x18\x02 \x01(\r\":\n\x15ValidateNumberRequest\x12\x11\n\tplayer_id\x18\x01 \x01(\t\x12\x0e\n\x06number\x18\x02 \x01(\x05\")\n\x16ValidateNumberResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"R\n\x14ValidateBingoRequest\x12\x11\n\tplayer_id\x18\x01 \x01(\t\x12\x0f\n\x07numbers\x18\x02 \x03(\x05\x12\x16\n\x0enumbers_bitmap\x18\x03 \x01(\x0c\"J\n\x15ValidateBingoResponse\x12\r\n\x05\x62ingo\x18\x01 \x01(\x08\x12\"\n\x07pattern\x18\x02 \x01(\x0e\x32\x11.bingo.WinPattern\"#\n\x0eGetCardRequest\x12\x11\n\tplayer_id\x18\x01 \x01(\t\"\'\n\x0fGetCardResponse\x12\x14\n\x0c\x63\x61rd_numbers\x18\x01 \x03(\x05\"|\n\x13RegisterCardRequest\x12\x11\n\tplayer_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63\x61rd_numbers\x18\x02 \x03(\x05\x12\'\n\x0cwin_patterns\x18\x03 \x03(\x0e\x32\x11.bingo.WinPattern\x12\x13\n\x0b\x63\x61rd_bitmap\x18\x04 \x01(\x0c\"\'\n\x14RegisterCardResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"3\n\x10ReplicateRequest\x12\r\n\x05\x65poch\x18\x01 \x01(\t\x12\x10\n\x08\x66rom_seq\x18\x02 \x01(\x04\"v\n\x0bPlayerState\x12\x11\n\tplayer_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63\x61rd_numbers\x18\x02 \x03(\x05\x12\'\n\x0cwin_patterns\x18\x03 \x03(\x0e\x32\x11.bingo.WinPattern\x12\x15\n\rmarked_bitmap\x18\x04 \x01(\x0c\"\xdb\x01\n\x10ReplicationEntry\x12\x0b\n\x03seq\x18\x01 \x01(\x04\x12\r\n\x05\x65poch\x18\x02 \x01(\t\x12\x10\n\x08head_seq\x18\x03 \x01(\x04\x12\r\n\x05reset\x18\x04 \x01(\x08\x12.\n\x08register\x18\x05 \x01(\x0b\x32\x1a.bingo.RegisterCardRequestH\x00\x12,\n\x04mark\x18\x06 \x01(\x0b\x32\x1c.bingo.ValidateNumberRequestH\x00\x12&\n\x08snapshot\x18\x07 \x01(\x0b\x32\x12.bingo.PlayerStateH\x00\x42\x04\n\x02op*g\n\nWinPattern\x12\x1b\n\x17WIN_PATTERN_UNSPECIFIED\x10\x00\x12\x0c\n\x08\x42LACKOUT\x10\x01\x12\x07\n\x03ROW\x10\x02\x12\n\n\x06\x43OLUMN\x10\x03\x12\x0c\n\x08\x44IAGONAL\x10\x04\x12\x0b\n\x07\x43ORNERS\x10\x05\x32\xa2\x04\n\x0bGameService\x12\x41\n\nCreateGame\x12\x18.bingo.CreateGameRequest\x1a\x19.bingo.CreateGameResponse\x12M\n\x0eRegisterPlayer\x12\x1c.bingo.RegisterPlayerRequest\x1a\x1d.bingo.RegisterPlayerResponse\x12\x41\n\nDrawNumber\x12\x18.bingo.DrawNumberRequest\x1a\x19.bingo.DrawNumberResponse\x12\x41\n\nMarkNumber\x12\x18.bingo.MarkNumberRequest\x1a\x19.bingo.MarkNumberResponse\x12\x41\n\nCheckBingo\x12\x18.bingo.CheckBingoRequest\x1a\x19.bingo.CheckBingoResponse\x12:\n\tListGames\x12\x17.bingo.ListGamesRequest\x1a\x12.bingo.GameSummary0\x01\x12@\n\x0bListPlayers\x12\x19.bingo.ListPlayersRequest\x1a\x14.bingo.PlayerSummary0\x01\x12:\n\nWatchDraws\x12\x18.bingo.WatchDrawsRequest\x1a\x10.bingo.DrawEvent0\x01\x32\xf2\x02\n\x11ValidationService\x12M\n\x0eValidateNumber\x12\x1c.bingo.ValidateNumberRequest\x1a\x1d.bingo.ValidateNumberResponse\x12J\n\rValidateBingo\x12\x1b.bingo.ValidateBingoRequest\x1a\x1c.bingo.ValidateBingoResponse\x12\x38\n\x07GetCard\x12\x15.bingo.GetCardRequest\x1a\x16.bingo.GetCardResponse\x12G\n\x0cRegisterCard\x12\x1a.bingo.RegisterCardRequest\x1a\x1b.bingo.RegisterCardResponse\x12?\n\tReplicate\x12\x17.bingo.ReplicateRequest\x1a\x17.bingo.ReplicationEntry0\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'bingo_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_WINPATTERN']._serialized_start=2013
+  _globals['_WINPATTERN']._serialized_end=2116
+  _globals['_CREATEGAMEREQUEST']._serialized_start=22
+  _globals['_CREATEGAMEREQUEST']._serialized_end=127
+  _globals['_CREATEGAMERESPONSE']._serialized_start=129
+  _globals['_CREATEGAMERESPONSE']._serialized_end=166
+  _globals['_REGISTERPLAYERREQUEST']._serialized_start=168
+  _globals['_REGISTERPLAYERREQUEST']._serialized_end=229
+  _globals['_REGISTERPLAYERRESPONSE']._serialized_start=231
+  _globals['_REGISTERPLAYERRESPONSE']._serialized_end=334
+  _globals['_DRAWNUMBERREQUEST']._serialized_start=336
+  _globals['_DRAWNUMBERREQUEST']._serialized_end=372
+  _globals['_DRAWNUMBERRESPONSE']._serialized_start=374
+  _globals['_DRAWNUMBERRESPONSE']._serialized_end=427
+  _globals['_MARKNUMBERREQUEST']._serialized_start=429
+  _globals['_MARKNUMBERREQUEST']._serialized_end=500
+  _globals['_MARKNUMBERRESPONSE']._serialized_start=502
+  _globals['_MARKNUMBERRESPONSE']._serialized_end=539
+  _globals['_CHECKBINGOREQUEST']._serialized_start=541
+  _globals['_CHECKBINGOREQUEST']._serialized_end=596
+  _globals['_CHECKBINGORESPONSE']._serialized_start=598
+  _globals['_CHECKBINGORESPONSE']._serialized_end=669
+  _globals['_LISTGAMESREQUEST']._serialized_start=671
+  _globals['_LISTGAMESREQUEST']._serialized_end=720
+  _globals['_GAMESUMMARY']._serialized_start=722
+  _globals['_GAMESUMMARY']._serialized_end=846
+  _globals['_LISTPLAYERSREQUEST']._serialized_start=848
+  _globals['_LISTPLAYERSREQUEST']._serialized_end=916
+  _globals['_PLAYERSUMMARY']._serialized_start=918
+  _globals['_PLAYERSUMMARY']._serialized_end=1006
+  _globals['_WATCHDRAWSREQUEST']._serialized_start=1008
+  _globals['_WATCHDRAWSREQUEST']._serialized_end=1064
+  _globals['_DRAWEVENT']._serialized_start=1066
+  _globals['_DRAWEVENT']._serialized_end=1108
+  _globals['_VALIDATENUMBERREQUEST']._serialized_start=1110
+  _globals['_VALIDATENUMBERREQUEST']._serialized_end=1168
+  _globals['_VALIDATENUMBERRESPONSE']._serialized_start=1170
+  _globals['_VALIDATENUMBERRESPONSE']._serialized_end=1211
+  _globals['_VALIDATEBINGOREQUEST']._serialized_start=1213
+  _globals['_VALIDATEBINGOREQUEST']._serialized_end=1295
+  _globals['_VALIDATEBINGORESPONSE']._serialized_start=1297
+  _globals['_VALIDATEBINGORESPONSE']._serialized_end=1371
+  _globals['_GETCARDREQUEST']._serialized_start=1373
+  _globals['_GETCARDREQUEST']._serialized_end=1408
+  _globals['_GETCARDRESPONSE']._serialized_start=1410
+  _globals['_GETCARDRESPONSE']._serialized_end=1449
+  _globals['_REGISTERCARDREQUEST']._serialized_start=1451
+  _globals['_REGISTERCARDREQUEST']._serialized_end=1575
+  _globals['_REGISTERCARDRESPONSE']._serialized_start=1577
+  _globals['_REGISTERCARDRESPONSE']._serialized_end=1616
+  _globals['_REPLICATEREQUEST']._serialized_start=1618
+  _globals['_REPLICATEREQUEST']._serialized_end=1669
+  _globals['_PLAYERSTATE']._serialized_start=1671
+  _globals['_PLAYERSTATE']._serialized_end=1789
+  _globals['_REPLICATIONENTRY']._serialized_start=1792
+  _globals['_REPLICATIONENTRY']._serialized_end=2011
+  _globals['_GAMESERVICE']._serialized_start=2119
+  _globals['_GAMESERVICE']._serialized_end=2665
+  _globals['_VALIDATIONSERVICE']._serialized_start=2668
+  _globals['_VALIDATIONSERVICE']._serialized_end=3038
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,154 @@
+"""
+Usuário Locust que fala gRPC direto com GameService e ValidationService,
+sem passar pelo gateway Node. Usa a mesma mistura de tarefas do
+http_test.py, então rodar os dois isola o custo do gateway.
+
+Endereços (variáveis de ambiente):
+  GAME_GRPC_ADDR        (padrão localhost:50051)
+  VALIDATION_GRPC_ADDR  (padrão localhost:50052)
+
+Uso:
+  locust -f stress_test/grpc_test.py --host grpc://localhost:50051
+"""
+import os
+import random
+import time
+import uuid
+
+import grpc
+import grpc.experimental.gevent as grpc_gevent
+from locust import User, between, task
+
+import bingo_pb2
+import bingo_pb2_grpc
+
+# O gRPC precisa cooperar com o gevent usado pelo Locust
+grpc_gevent.init_gevent()
+
+
+def random_name():
+    return f"player-{uuid.uuid4().hex[:8]}"
+
+
+class LocustInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Reporta cada RPC nas estatísticas do Locust (tipo "grpc", nome = método)."""
+
+    def __init__(self, environment):
+        self.environment = environment
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        name = client_call_details.method.rsplit("/", 1)[-1]
+        start = time.perf_counter()
+        response = None
+        exception = None
+        try:
+            call = continuation(client_call_details, request)
+            response = call.result()
+        except grpc.RpcError as e:
+            exception = e
+            call = e
+        self.environment.events.request.fire(
+            request_type="grpc",
+            name=name,
+            response_time=(time.perf_counter() - start) * 1000,
+            response_length=response.ByteSize() if response is not None else 0,
+            response=response,
+            context=None,
+            exception=exception,
+        )
+        return call
+
+
+class GrpcUser(User):
+    abstract = True
+
+    game_addr = os.environ.get("GAME_GRPC_ADDR", "localhost:50051")
+    validation_addr = os.environ.get("VALIDATION_GRPC_ADDR", "localhost:50052")
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        interceptor = LocustInterceptor(environment)
+        game_addr = self.host.split("://", 1)[-1] if self.host else self.game_addr
+        self._channels = [
+            grpc.intercept_channel(grpc.insecure_channel(game_addr), interceptor),
+            grpc.intercept_channel(grpc.insecure_channel(self.validation_addr), interceptor),
+        ]
+        self.game_stub = bingo_pb2_grpc.GameServiceStub(self._channels[0])
+        self.validation_stub = bingo_pb2_grpc.ValidationServiceStub(self._channels[1])
+
+    def on_stop(self):
+        for channel in self._channels:
+            channel.close()
+
+
+class BingoGrpcUser(GrpcUser):
+    wait_time = between(0.5, 2.0)
+
+    def on_start(self):
+        self.game_id = None
+        self.player_id = None
+        self.last_drawn = None
+        self.card = []
+
+        try:
+            resp = self.game_stub.CreateGame(
+                bingo_pb2.CreateGameRequest(game_name=f"stress-game-{uuid.uuid4().hex[:6]}"))
+            self.game_id = resp.game_id
+        except grpc.RpcError:
+            return
+
+        try:
+            resp = self.game_stub.RegisterPlayer(
+                bingo_pb2.RegisterPlayerRequest(game_id=self.game_id, player_name=random_name()))
+            if resp.success:
+                self.player_id = resp.player_id
+                self.card = list(resp.card_numbers)
+        except grpc.RpcError:
+            pass
+
+    @task(2)
+    def get_card(self):
+        if not self.player_id:
+            return
+        try:
+            resp = self.validation_stub.GetCard(bingo_pb2.GetCardRequest(player_id=self.player_id))
+            self.card = list(resp.card_numbers)
+        except grpc.RpcError:
+            pass
+
+    @task(1)
+    def draw_number(self):
+        if not self.game_id:
+            return
+        try:
+            resp = self.game_stub.DrawNumber(bingo_pb2.DrawNumberRequest(game_id=self.game_id))
+            if resp.success:
+                self.last_drawn = resp.number
+        except grpc.RpcError:
+            pass
+
+    @task(3)
+    def mark_number(self):
+        if not self.player_id:
+            return
+        number = self.last_drawn or random.randint(1, 75)
+        try:
+            self.game_stub.MarkNumber(bingo_pb2.MarkNumberRequest(
+                game_id=self.game_id, player_id=self.player_id, number=number))
+        except grpc.RpcError:
+            pass
+
+    @task(1)
+    def check_bingo(self):
+        if not self.player_id:
+            return
+        try:
+            self.game_stub.CheckBingo(bingo_pb2.CheckBingoRequest(
+                game_id=self.game_id, player_id=self.player_id))
+        except grpc.RpcError:
+            pass
+
+
+if __name__ == "__main__":
+    host = os.environ.get("LOCUST_HOST", "grpc://localhost:50051")
+    os.system(f"locust -f stress_test/grpc_test.py --host={host}")
@@ -87,6 +87,13 @@ const bingoProto = grpc.loadPackageDefinition(packageDefinition).bingo;
 // Cria os stubs gRPC (clientes)
 const gameClient = new bingoProto.GameService('game-server-service:50051', grpc.credentials.createInsecure());
 const validationClient = new bingoProto.ValidationService('validation-server-service:50052', grpc.credentials.createInsecure());
+// Leituras (GetCard) vão para a réplica quando VALIDATION_READ_ADDR está definido;
+// se ela estiver atrasada ou fora do ar (UNAVAILABLE) ou ainda não recebeu o
+// registro do jogador (NOT_FOUND), cai para o primário
+const READ_FALLBACK_CODES = [grpc.status.UNAVAILABLE, grpc.status.NOT_FOUND];
+const validationReadClient = process.env.VALIDATION_READ_ADDR
+  ? new bingoProto.ValidationService(process.env.VALIDATION_READ_ADDR, grpc.credentials.createInsecure())
+  : validationClient;
 
 const app = express();
 
@@ -132,6 +139,16 @@ app.get('/', (req, res) => {
 // ENDPOINTS COMPATÍVEIS COM O TESTE
 // ===================================
 
+// Repassa o header Idempotency-Key como metadata gRPC (retries não duplicam a operação)
+function idempotencyMetadata(req) {
+  const metadata = new grpc.Metadata();
+  const key = req.get('Idempotency-Key');
+  if (key) {
+    metadata.set('idempotency-key', key);
+  }
+  return metadata;
+}
+
 /**
  * @openapi
  * /game/create:
@@ -146,13 +163,21 @@ app.get('/', (req, res) => {
  *             properties:
  *               game_name:
  *                 type: string
+ *               win_patterns:
+ *                 type: array
+ *                 items:
+ *                   type: string
+ *                   enum: [BLACKOUT, ROW, COLUMN, DIAGONAL, CORNERS]
+ *               draw_interval_ms:
+ *                 type: integer
+ *                 description: Se > 0, o servidor sorteia sozinho nesse intervalo
  *     responses:
  *       200:
  *         description: Jogo criado
  */
 app.post('/game/create', (req, res) => {
-  const { game_name } = req.body;
-  gameClient.CreateGame({ game_name }, (err, response) => {
+  const { game_name, win_patterns = [], draw_interval_ms = 0 } = req.body;
+  gameClient.CreateGame({ game_name, win_patterns, draw_interval_ms }, idempotencyMetadata(req), (err, response) => {
     if (err) {
       console.error('Erro no gRPC CreateGame:', err);
       return res.status(500).json({ success: false, error: err.message });
@@ -184,7 +209,7 @@ app.post('/game/create', (req, res) => {
  */
 app.post('/game/register', (req, res) => {
   const { game_id, player_name } = req.body;
-  gameClient.RegisterPlayer({ game_id, player_name }, (err, response) => {
+  gameClient.RegisterPlayer({ game_id, player_name }, idempotencyMetadata(req), (err, response) => {
     if (err) {
       console.error('Erro no gRPC RegisterPlayer:', err);
       return res.status(500).json({ success: false, error: err.message });
@@ -218,10 +243,12 @@ app.post('/game/register', (req, res) => {
  */
 app.post('/game/draw', (req, res) => {
   const { game_id } = req.body;
-  gameClient.DrawNumber({ game_id }, (err, response) => {
+  gameClient.DrawNumber({ game_id }, idempotencyMetadata(req), (err, response) => {
     if (err) {
       console.error('Erro no gRPC DrawNumber:', err);
-      return res.status(500).json({ success: false, error: err.message });
+      // Jogo com sorteio automático: os números chegam por /game/draws
+      const status = err.code === grpc.status.FAILED_PRECONDITION ? 409 : 500;
+      return res.status(status).json({ success: false, error: err.message });
     }
     numbersDrawn.inc();
     res.json({
@@ -231,6 +258,90 @@ app.post('/game/draw', (req, res) => {
   });
 });
 
+// Um WatchDraws por jogo, compartilhado por todos os clientes SSE desse jogo:
+// cada stream prende um worker do GameService, que só aceita alguns ao mesmo tempo
+const drawWatches = new Map(); // game_id -> { call, numbers, clients, done }
+
+function sseEvent(type, data) {
+  return `event: ${type}\ndata: ${JSON.stringify(data)}\n\n`;
+}
+
+function watchDraws(game_id) {
+  let watch = drawWatches.get(game_id);
+  if (watch) {
+    return watch;
+  }
+  watch = { numbers: [], clients: new Set(), done: false };
+  watch.call = gameClient.WatchDraws({ game_id, from_round: 0 });
+  watch.call.on('data', (event) => {
+    watch.numbers.push(event.number);
+    const payload = sseEvent('draw', { number: event.number, round: event.round });
+    watch.clients.forEach((res) => res.write(payload));
+  });
+  const finish = (err) => {
+    if (watch.done) {
+      return;
+    }
+    watch.done = true;
+    if (drawWatches.get(game_id) === watch) {
+      drawWatches.delete(game_id);
+    }
+    if (err && err.code !== grpc.status.CANCELLED) {
+      console.error('Erro no gRPC WatchDraws:', err);
+    }
+    // Sem erro: o jogo terminou
+    const payload = err ? sseEvent('error', { error: err.message }) : sseEvent('end', {});
+    watch.clients.forEach((res) => {
+      res.write(payload);
+      res.end();
+    });
+    watch.clients.clear();
+  };
+  watch.call.on('end', () => finish());
+  watch.call.on('error', finish);
+  drawWatches.set(game_id, watch);
+  return watch;
+}
+
+/**
+ * @openapi
+ * /game/draws:
+ *   get:
+ *     summary: Números sorteados do jogo (Server-Sent Events)
+ *     description: >
+ *       Envia os números já sorteados e segue com os novos (evento "draw",
+ *       com number e round) até o jogo terminar (evento "end").
+ *       Necessário para jogos criados com draw_interval_ms.
+ *     parameters:
+ *       - name: game_id
+ *         in: query
+ *         required: true
+ *         schema:
+ *           type: string
+ *     responses:
+ *       200:
+ *         description: Stream text/event-stream
+ */
+app.get('/game/draws', (req, res) => {
+  const { game_id } = req.query;
+  if (!game_id) {
+    return res.status(400).json({ error: 'game_id é obrigatório' });
+  }
+  res.set({ 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no' });
+  res.flushHeaders();
+
+  const watch = watchDraws(game_id);
+  watch.numbers.forEach((number, index) => res.write(sseEvent('draw', { number, round: index + 1 })));
+  watch.clients.add(res);
+  req.on('close', () => {
+    watch.clients.delete(res);
+    if (!watch.clients.size && !watch.done) {
+      drawWatches.delete(game_id);
+      watch.call.cancel();
+    }
+  });
+});
+
 /**
  * @openapi
  * /game/mark:
@@ -255,7 +366,7 @@ app.post('/game/draw', (req, res) => {
  */
 app.post('/game/mark', (req, res) => {
   const { game_id, player_id, number } = req.body;
-  gameClient.MarkNumber({ game_id, player_id, number }, (err, response) => {
+  gameClient.MarkNumber({ game_id, player_id, number }, idempotencyMetadata(req), (err, response) => {
     if (err) {
       console.error('Erro no gRPC MarkNumber:', err);
       return res.status(500).json({ success: false, error: err.message });
@@ -292,7 +403,7 @@ app.post('/game/bingo', (req, res) => {
       return res.status(500).json({ bingo: false, error: err.message });
     }
     bingoChecks.inc();
-    res.json({ bingo: response.bingo });
+    res.json({ bingo: response.bingo, pattern: response.pattern === 'WIN_PATTERN_UNSPECIFIED' ? null : response.pattern });
   });
 });
 
@@ -313,12 +424,18 @@ app.post('/game/bingo', (req, res) => {
  */
 app.get('/game/card', (req, res) => {
   const { player_id } = req.query;
-  validationClient.GetCard({ player_id }, (err, response) => {
+  const reply = (err, response) => {
     if (err) {
       console.error('Erro no gRPC GetCard:', err);
       return res.status(500).json({ card: [], error: err.message });
     }
     res.json({ card: response.card_numbers });
+  };
+  validationReadClient.GetCard({ player_id }, (err, response) => {
+    if (err && READ_FALLBACK_CODES.includes(err.code) && validationReadClient !== validationClient) {
+      return validationClient.GetCard({ player_id }, reply);
+    }
+    reply(err, response);
   });
 });
 
@@ -5,6 +5,7 @@ Usa os endpoints corretos do stub Node.js
 
 import requests
 import time
+import uuid
 import threading
 import json
 
@@ -50,15 +51,33 @@ class BingoPlayer:
         """Registra o jogador no jogo"""
         self.game_id = game_id
 
-        try:
-            response = self.session.post(
-                f"{self.stub_url}/register-player",  # ✅ Endpoint correto
-                json={
-                    "game_id": game_id,
-                    "player_name": self.player_name
-                },
-                timeout=10
-            )
+        max_retries = 3
+        idempotency_key = str(uuid.uuid4())  # mesma chave em todas as tentativas: uma cartela só
+        for attempt in range(max_retries):
+            try:
+                response = self.session.post(
+                    f"{self.stub_url}/register-player",  # ✅ Endpoint correto
+                    json={
+                        "game_id": game_id,
+                        "player_name": self.player_name
+                    },
+                    headers={"Idempotency-Key": idempotency_key},
+                    timeout=10
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # O servidor pode ter registrado antes de a resposta se perder
+                print(f"  Erro de conexão ao registrar ({attempt + 1}/{max_retries}): {e}")
+                time.sleep(2)
+                continue
+            except requests.exceptions.RequestException as e:
+                print(f"✗ Erro de conexão ao registrar: {e}")
+                return False
+
+            if response.status_code >= 500 and attempt < max_retries - 1:
+                # Inclui o pedido original ainda em andamento (ABORTED no GameService)
+                print(f"  Registro falhou com HTTP {response.status_code}, tentando de novo...")
+                time.sleep(1)
+                continue
 
             if response.status_code == 200:
                 data = response.json()
@@ -77,9 +96,8 @@ class BingoPlayer:
             print(f"   Resposta: {response.text}")
             return False
 
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Erro de conexão ao registrar: {e}")
-            return False
+        print(f"✗ Erro ao registrar {self.player_name} após {max_retries} tentativas")
+        return False
 
     def listen_drawing(self):
         """Escuta o sorteio de números (em thread separada)"""
@@ -142,6 +160,7 @@ class BingoPlayer:
     def mark_number(self, number):
         """Marca um número na cartela"""
         max_retries = 3
+        idempotency_key = str(uuid.uuid4())  # mesma chave em todas as tentativas
         for attempt in range(max_retries):
             try:
                 response = self.session.post(
@@ -151,6 +170,7 @@ class BingoPlayer:
                         "player_id": self.player_id,
                         "number": number
                     },
+                    headers={"Idempotency-Key": idempotency_key},
                     timeout=60
                 )
 
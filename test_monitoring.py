@@ -1,112 +1,279 @@
-import requests
+"""
+Simulador de carga assíncrono para o Bingo.
+
+Cada jogo é uma corrotina (não uma thread), e todas as chamadas passam por
+um pool de conexões compartilhado, então dá para simular dezenas de
+milhares de jogos e jogadores simultâneos em um único processo.
+
+Alvos:
+  gateway - endpoints HTTP do stub Node (/game/*), via httpx.AsyncClient
+  grpc    - GameService direto, via grpc.aio
+
+Chegada dos jogos:
+  --arrival-rate 0   todos os jogos começam juntos (rajada)
+  --arrival-rate N   laço aberto: jogos chegam como processo de Poisson com
+                     N jogos/s, independente de quanto os anteriores demoram
+
+As latências de cada operação vão para histogramas HDR (µs, 3 dígitos
+significativos); --hdr-output grava os histogramas codificados para plotar.
+
+Uso:
+  python test_monitoring.py
+  python test_monitoring.py --games 20000 --arrival-rate 500 --target grpc
+"""
+import argparse
+import asyncio
+import json
+import os
 import random
-import time
 import sys
-from concurrent.futures import ThreadPoolExecutor
+import time
+
+from hdrh.histogram import HdrHistogram
 
-# Configuração
+# Configuração padrão
 BASE_URL = "http://localhost:30080"  # Endereço do seu port-forward
+GRPC_ADDR = "localhost:50051"
 NUM_GAMES = 10                       # Quantos jogos simultâneos criar
-PLAYERS_PER_GAME = 4                # Jogadores por jogo
-DRAW_SPEED = 0.1                    # Segundos entre sorteios (quanto menor, mais rápido gera métricas)
+PLAYERS_PER_GAME = 4                 # Jogadores por jogo
+DRAW_SPEED = 0.1                     # Segundos entre sorteios (quanto menor, mais rápido gera métricas)
+BINGO_CHECK_EVERY = 5                # Confere BINGO a cada N números sorteados
+
+OPERATIONS = ("create", "register", "draw", "mark", "bingo")
 
 def log(msg):
     print(f"[TESTE] {msg}")
 
-def run_game_simulation(game_index):
-    game_name = f"Bingo Load Test {game_index}-{random.randint(1000, 9999)}"
 
-    # 1. Criar Jogo
+# ==========================================
+# Backends (mesma interface para gateway e gRPC)
+# ==========================================
+
+class GatewayBackend:
+    def __init__(self, base_url, max_connections):
+        import httpx
+        self.client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            timeout=30.0,
+        )
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def _post(self, path, payload):
+        resp = await self.client.post(path, json=payload)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def create_game(self, name):
+        return (await self._post("/game/create", {"game_name": name})).get("game_id")
+
+    async def register(self, game_id, name):
+        data = await self._post("/game/register", {"game_id": game_id, "player_name": name})
+        return data.get("player_id") if data.get("success") else None
+
+    async def draw(self, game_id):
+        data = await self._post("/game/draw", {"game_id": game_id})
+        return data.get("number") if data.get("success") else None
+
+    async def mark(self, game_id, player_id, number):
+        data = await self._post("/game/mark", {"game_id": game_id, "player_id": player_id, "number": number})
+        return data.get("success", False)
+
+    async def check(self, game_id, player_id):
+        data = await self._post("/game/bingo", {"game_id": game_id, "player_id": player_id})
+        return data.get("bingo", False)
+
+
+class GrpcBackend:
+    def __init__(self, addr, channels):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "service-a-python"))
+        import grpc
+        import bingo_pb2
+        import bingo_pb2_grpc
+        self.pb = bingo_pb2
+        # Vários canais = várias conexões HTTP/2; cada jogo usa sempre o mesmo
+        self.channels = [grpc.aio.insecure_channel(addr, options=[("grpc.use_local_subchannel_pool", 1)])
+                         for _ in range(max(1, channels))]
+        self.stubs = [bingo_pb2_grpc.GameServiceStub(c) for c in self.channels]
+
+    async def close(self):
+        for channel in self.channels:
+            await channel.close()
+
+    def _stub(self, key):
+        return self.stubs[hash(key) % len(self.stubs)]
+
+    async def create_game(self, name):
+        resp = await self._stub(name).CreateGame(self.pb.CreateGameRequest(game_name=name))
+        return resp.game_id
+
+    async def register(self, game_id, name):
+        resp = await self._stub(game_id).RegisterPlayer(
+            self.pb.RegisterPlayerRequest(game_id=game_id, player_name=name))
+        return resp.player_id if resp.success else None
+
+    async def draw(self, game_id):
+        resp = await self._stub(game_id).DrawNumber(self.pb.DrawNumberRequest(game_id=game_id))
+        return resp.number if resp.success else None
+
+    async def mark(self, game_id, player_id, number):
+        resp = await self._stub(game_id).MarkNumber(
+            self.pb.MarkNumberRequest(game_id=game_id, player_id=player_id, number=number))
+        return resp.success
+
+    async def check(self, game_id, player_id):
+        resp = await self._stub(game_id).CheckBingo(
+            self.pb.CheckBingoRequest(game_id=game_id, player_id=player_id))
+        return resp.bingo
+
+
+# ==========================================
+# Simulação
+# ==========================================
+
+class Stats:
+    def __init__(self):
+        # 1 µs a 60 s, 3 dígitos significativos
+        self.histograms = {op: HdrHistogram(1, 60_000_000, 3) for op in OPERATIONS}
+        self.errors = {op: 0 for op in OPERATIONS}
+        self.games_started = 0
+        self.games_finished = 0
+        self.winners = 0
+        self.max_arrival_lag = 0.0  # maior atraso de uma chegada em relação ao horário sorteado
+
+    async def timed(self, op, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        except Exception:
+            self.errors[op] += 1
+            return None
+        finally:
+            self.histograms[op].record_value(max(1, int((time.perf_counter() - start) * 1_000_000)))
+
+
+async def run_game_simulation(backend, stats, game_index, args):
+    stats.games_started += 1
     try:
-        resp = requests.post(f"{BASE_URL}/game/create", json={"game_name": game_name})
-        if resp.status_code != 200:
-            log(f"Erro ao criar jogo: {resp.text}")
+        game_name = f"Bingo Load Test {game_index}-{random.randint(1000, 9999)}"
+
+        # 1. Criar Jogo
+        game_id = await stats.timed("create", backend.create_game(game_name))
+        if not game_id:
             return
 
-        game_data = resp.json()
-        game_id = game_data.get('game_id')
-        log(f"🎮 Jogo criado: {game_name} (ID: {game_id})")
-    except Exception as e:
-        log(f"Erro de conexão: {e}")
-        return
-
-    # 2. Registrar Jogadores
-    players = []
-    for i in range(PLAYERS_PER_GAME):
-        p_name = f"Player-{game_index}-{i}"
-        try:
-            r = requests.post(f"{BASE_URL}/game/register", json={
-                "game_id": game_id,
-                "player_name": p_name
-            })
-            if r.status_code == 200:
-                p_data = r.json()
-                players.append({
-                    "id": p_data['player_id'],
-                    "name": p_name,
-                    "card": p_data.get('card', [])
-                })
-        except:
-            pass
-
-    log(f"👥 {len(players)} jogadores registrados no jogo {game_index}")
-
-    # 3. Loop de Sorteio (Game Loop)
-    drawn_numbers = []
-    game_over = False
-
-    # Sorteia até 75 números ou alguém ganhar
-    for _ in range(75):
-        if game_over: break
-
-        # Sorteia número
-        try:
-            r = requests.post(f"{BASE_URL}/game/draw", json={"game_id": game_id})
-            if r.status_code != 200: continue
+        # 2. Registrar Jogadores (em paralelo)
+        player_ids = await asyncio.gather(*[
+            stats.timed("register", backend.register(game_id, f"Player-{game_index}-{i}"))
+            for i in range(args.players_per_game)
+        ])
+        players = [p for p in player_ids if p]
 
-            data = r.json()
-            if not data.get('success'): break
+        # 3. Loop de Sorteio
+        for round_number in range(1, 76):
+            number = await stats.timed("draw", backend.draw(game_id))
+            if not number:
+                break
 
-            number = data.get('number')
-            drawn_numbers.append(number)
-            log(f"🎲 Jogo {game_index}: Sorteado {number}")
-        except:
+            # Todos tentam marcar (mesmo sem o número, gera tráfego de validação)
+            await asyncio.gather(*[stats.timed("mark", backend.mark(game_id, p, number)) for p in players])
+
+            if round_number % args.bingo_every == 0:
+                results = await asyncio.gather(*[stats.timed("bingo", backend.check(game_id, p)) for p in players])
+                if any(results):
+                    stats.winners += 1
+                    break
+
+            await asyncio.sleep(args.draw_interval)
+    finally:
+        stats.games_finished += 1
+
+
+async def report_progress(stats, interval=5.0):
+    while True:
+        await asyncio.sleep(interval)
+        active = stats.games_started - stats.games_finished
+        requests = sum(h.get_total_count() for h in stats.histograms.values())
+        log(f"⏱  jogos ativos: {active} | finalizados: {stats.games_finished} | requisições: {requests}")
+
+
+async def simulate(args):
+    if args.target == "grpc":
+        backend = GrpcBackend(args.grpc_addr, args.grpc_channels)
+    else:
+        backend = GatewayBackend(args.base_url, args.max_connections)
+
+    stats = Stats()
+    progress = asyncio.create_task(report_progress(stats))
+    tasks = []
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    next_arrival = loop.time()
+    try:
+        for i in range(args.games):
+            tasks.append(asyncio.create_task(run_game_simulation(backend, stats, i + 1, args)))
+            if args.arrival_rate > 0:
+                # Laço aberto: cada chegada tem horário absoluto sorteado; se o loop
+                # atrasar, as próximas saem logo em seguida em vez de empurrar o resto
+                next_arrival += random.expovariate(args.arrival_rate)
+                delay = next_arrival - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    stats.max_arrival_lag = max(stats.max_arrival_lag, -delay)
+        await asyncio.gather(*tasks)
+    finally:
+        progress.cancel()
+        await backend.close()
+    return stats, time.perf_counter() - start
+
+
+def print_report(stats, elapsed):
+    total = sum(h.get_total_count() for h in stats.histograms.values())
+    log(f"🏁 {stats.games_finished} jogos em {elapsed:.1f}s, {stats.winners} com vencedor, "
+        f"{total} requisições ({total / elapsed:,.0f} req/s)")
+    if stats.max_arrival_lag > 0.1:
+        log(f"⚠️  Chegadas atrasaram até {stats.max_arrival_lag * 1000:.0f} ms: o gerador de carga está saturado")
+    print(f"\n{'op':<9} {'count':>9} {'err':>6} {'mean ms':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8}")
+    for op, h in stats.histograms.items():
+        if not h.get_total_count():
             continue
+        ms = lambda v: v / 1000.0  # noqa: E731
+        print(f"{op:<9} {h.get_total_count():>9} {stats.errors[op]:>6} {ms(h.get_mean_value()):>9.2f} "
+              f"{ms(h.get_value_at_percentile(50)):>8.2f} {ms(h.get_value_at_percentile(90)):>8.2f} "
+              f"{ms(h.get_value_at_percentile(99)):>8.2f} {ms(h.get_value_at_percentile(99.9)):>8.2f} "
+              f"{ms(h.get_max_value()):>8.2f}")
 
-        # Simula jogadores marcando e conferindo
-        for player in players:
-            # Tenta marcar (mesmo se não tiver na cartela, gera tráfego de erro/validação)
-            try:
-                requests.post(f"{BASE_URL}/game/mark", json={
-                    "game_id": game_id,
-                    "player_id": player['id'],
-                    "number": number
-                })
-
-                # A cada 5 números sorteados, confere BINGO
-                if len(drawn_numbers) % 5 == 0:
-                    b_resp = requests.post(f"{BASE_URL}/game/bingo", json={
-                        "game_id": game_id,
-                        "player_id": player['id']
-                    })
-                    if b_resp.json().get('bingo'):
-                        log(f"🏆 BINGO! O vencedor do jogo {game_index} é {player['name']}!")
-                        game_over = True
-                        break
-            except:
-                pass
-
-        time.sleep(DRAW_SPEED)
-
-    log(f"🏁 Jogo {game_index} finalizado.")
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("gateway", "grpc"), default="gateway")
+    parser.add_argument("--base-url", default=BASE_URL, help="URL do gateway HTTP")
+    parser.add_argument("--grpc-addr", default=GRPC_ADDR, help="endereço do GameService gRPC")
+    parser.add_argument("--grpc-channels", type=int, default=4, help="canais (conexões) gRPC no pool")
+    parser.add_argument("--max-connections", type=int, default=200, help="conexões HTTP no pool")
+    parser.add_argument("--games", type=int, default=NUM_GAMES)
+    parser.add_argument("--players-per-game", type=int, default=PLAYERS_PER_GAME)
+    parser.add_argument("--draw-interval", type=float, default=DRAW_SPEED)
+    parser.add_argument("--bingo-every", type=int, default=BINGO_CHECK_EVERY)
+    parser.add_argument("--arrival-rate", type=float, default=0.0, help="jogos/s (0 = todos de uma vez)")
+    parser.add_argument("--hdr-output", help="arquivo JSON com os histogramas HDR codificados")
+    args = parser.parse_args()
+
     log("🚀 Iniciando teste de carga...")
-    log(f"Config: {NUM_GAMES} jogos, {PLAYERS_PER_GAME} players cada.")
+    log(f"Config: {args.games} jogos, {args.players_per_game} players cada, alvo {args.target}, "
+        f"chegada {'rajada' if args.arrival_rate <= 0 else f'{args.arrival_rate}/s'}.")
+
+    stats, elapsed = asyncio.run(simulate(args))
+    print_report(stats, elapsed)
 
-    with ThreadPoolExecutor(max_workers=NUM_GAMES) as executor:
-        for i in range(NUM_GAMES):
-            executor.submit(run_game_simulation, i+1)
+    if args.hdr_output:
+        with open(args.hdr_output, "w") as f:
+            json.dump({op: h.encode().decode("ascii") for op, h in stats.histograms.items()}, f, indent=2)
+        log(f"Histogramas salvos em {args.hdr_output}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,7 @@
+"""Os módulos dos serviços não são pacotes: entram no sys.path como em benchmarks/microbench.py."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "service-b-python"))
+sys.path.insert(0, os.path.join(ROOT, "service-a-python"))
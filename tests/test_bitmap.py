@@ -0,0 +1,67 @@
+import random
+
+import bingo_pb2
+import bitmap
+from card_generator import generate_card
+from game_service import GameServiceServicer
+from validation_client import ValidationClient
+
+
+def test_wire_layout_is_ten_bytes_with_number_n_at_bit_n_minus_1():
+    assert bitmap.encode(0) == bytes(10)
+    assert bitmap.encode(bitmap.numbers_mask([1])) == b"\x01" + bytes(9)
+    assert bitmap.encode(bitmap.numbers_mask([75])) == bytes(9) + b"\x04"
+    everything = bitmap.encode(bitmap.numbers_mask(range(1, 76)))
+    assert len(everything) == bitmap.BITMAP_SIZE
+    assert bitmap.decode(everything) == bitmap.numbers_mask(range(1, 76))
+
+
+def test_round_trip_keeps_the_numbers():
+    rng = random.Random(3)
+    for _ in range(100):
+        numbers = sorted(rng.sample(range(1, 76), rng.randint(0, 75)))
+        mask = bitmap.numbers_mask(numbers)
+        assert bitmap.decode(bitmap.encode(mask)) == mask
+        assert bitmap.mask_numbers(mask) == numbers
+
+
+def test_canonical_card_rebuilds_generated_cards():
+    rng = random.Random(4)
+    for _ in range(100):
+        card = list(generate_card(rng))
+        mask = bitmap.decode(bitmap.encode(bitmap.numbers_mask(card)))
+        assert bitmap.canonical_card(mask) == card
+
+
+def test_canonical_card_falls_back_to_sorted_numbers_outside_the_5x5_layout():
+    numbers = [1, 2, 3, 16, 75]
+    assert bitmap.canonical_card(bitmap.numbers_mask(numbers)) == numbers
+
+
+class RecordingStub:
+    def __init__(self):
+        self.received = []
+
+    def RegisterCard(self, request, timeout=None):
+        self.received.append(request)
+        return bingo_pb2.RegisterCardResponse(success=True)
+
+
+class Context:
+    def time_remaining(self):
+        return None
+
+
+def test_register_card_carries_the_number_list_for_services_without_bitmaps():
+    stub = RecordingStub()
+    servicer = GameServiceServicer(validation=ValidationClient(stub))
+    game_id = servicer.CreateGame(bingo_pb2.CreateGameRequest(game_name="jogo"), Context()).game_id
+    response = servicer.RegisterPlayer(bingo_pb2.RegisterPlayerRequest(game_id=game_id, player_name="p1"), Context())
+
+    request, = stub.received
+    assert list(request.card_numbers) == list(response.card_numbers)
+    assert bitmap.canonical_card(bitmap.decode(request.card_bitmap)) == list(response.card_numbers)
+
+    servicer.send_number_lists = False
+    servicer.RegisterPlayer(bingo_pb2.RegisterPlayerRequest(game_id=game_id, player_name="p2"), Context())
+    assert not stub.received[-1].card_numbers
@@ -0,0 +1,47 @@
+import random
+import threading
+import time
+
+from card_generator import CardPool, generate_cards
+from game_service import Game
+
+DECK = generate_cards(40, random.Random(1))
+
+
+class DuplicatingPool(CardPool):
+    """Devolve cartelas de um baralho pequeno, então repetições são comuns."""
+
+    def take(self):
+        return random.choice(DECK)
+
+
+class SlowSet(set):
+    """Abre a janela entre conferir e registrar, como uma troca de thread."""
+
+    def __contains__(self, card):
+        found = super().__contains__(card)
+        time.sleep(0.001)
+        return found
+
+
+def test_concurrent_registrations_get_distinct_cards():
+    game = Game("g1", "jogo", card_pool=DuplicatingPool(capacity=0))
+    game.card_keys = SlowSet()
+    threads = [threading.Thread(target=lambda: [game.register_player("p") for _ in range(4)])
+               for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    cards = [tuple(p["card"]) for p in game.players.values()]
+    assert len(cards) == 40
+    assert len(set(cards)) == 40
+
+
+def test_misses_are_counted():
+    misses = []
+    pool = CardPool(capacity=0, on_miss=lambda: misses.append(1))
+    for _ in range(3):
+        pool.take()
+    assert pool.misses == 3 and len(misses) == 3
@@ -0,0 +1,39 @@
+import threading
+import time
+
+import grpc
+import pytest
+
+from channel_pool import LEAST_OUTSTANDING, ROUND_ROBIN, ChannelPool, ChannelsSaturated
+
+
+class EchoStub:
+    def __init__(self, channel):
+        self.channel = channel
+
+
+@pytest.mark.parametrize("policy", [ROUND_ROBIN, LEAST_OUTSTANDING])
+def test_full_channels_are_skipped(policy):
+    pool = ChannelPool("localhost:1", EchoStub, size=2, policy=policy, max_outstanding=2)
+    try:
+        taken = [pool.acquire(timeout=0) for _ in range(4)]
+        assert sorted(taken) == [0, 0, 1, 1]
+        assert pool.outstanding == [2, 2]
+    finally:
+        pool.close()
+
+
+def test_saturated_pool_waits_for_a_slot_then_times_out():
+    pool = ChannelPool("localhost:1", EchoStub, size=1, max_outstanding=1)
+    try:
+        index = pool.acquire()
+        with pytest.raises(ChannelsSaturated) as error:
+            pool.acquire(timeout=0.05)
+        assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+        threading.Timer(0.05, pool.release, args=(index,)).start()
+        started = time.monotonic()
+        assert pool.acquire(timeout=2) == 0
+        assert time.monotonic() - started < 1
+    finally:
+        pool.close()
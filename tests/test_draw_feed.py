@@ -0,0 +1,87 @@
+import threading
+
+import grpc
+import pytest
+
+import bingo_pb2
+from draw_feed import DrawFeed
+from draw_scheduler import DrawScheduler
+from game_service import Game, GameServiceServicer
+
+
+class Aborted(Exception):
+    pass
+
+
+class Context:
+    def __init__(self):
+        self.active = True
+
+    def abort(self, code, details):
+        self.code = code
+        raise Aborted(details)
+
+    def is_active(self):
+        return self.active
+
+
+def test_manual_draw_is_refused_on_scheduled_games():
+    servicer = GameServiceServicer(validation=None, draw_scheduler=DrawScheduler())
+    context = Context()
+    game_id = servicer.CreateGame(bingo_pb2.CreateGameRequest(game_name="auto", draw_interval_ms=1000),
+                                  context).game_id
+    with pytest.raises(Aborted):
+        servicer.DrawNumber(bingo_pb2.DrawNumberRequest(game_id=game_id), context)
+    assert context.code == grpc.StatusCode.FAILED_PRECONDITION
+    assert servicer.games[game_id].drawn_numbers == []
+
+
+def test_watch_replays_then_follows_scheduled_draws():
+    feed = DrawFeed()
+    scheduler = DrawScheduler(on_draw=feed.publish)
+    game = Game("g1", "jogo", draw_interval_ms=1000)
+    for _ in range(3):
+        scheduler.run_due([(0.0, 0, 1.0, game)])
+
+    events = []
+    stream = feed.watch(game, 2, Context())
+    events.extend(next(stream) for _ in range(2))
+    # Próximo sorteio chega por on_draw enquanto o stream espera
+    threading.Timer(0.05, scheduler.run_due, args=([(0.0, 0, 1.0, game)],)).start()
+    events.append(next(stream))
+
+    assert [e.round for e in events] == [2, 3, 4]
+    assert [e.number for e in events] == game.drawn_numbers[1:]
+
+    game.winner = "p1"
+    feed.publish(game)
+    assert list(stream) == []
+    assert feed._watchers == 0
+
+
+def test_from_round_is_inclusive():
+    feed = DrawFeed()
+    game = Game("g1", "jogo")
+    for number in (7, 21, 40):
+        game.draw(number)
+    game.winner = "p1"
+
+    assert [(e.round, e.number) for e in feed.watch(game, 1, Context())] == [(1, 7), (2, 21), (3, 40)]
+    assert [e.round for e in feed.watch(game, 0, Context())] == [1, 2, 3]
+    assert [e.round for e in feed.watch(game, 3, Context())] == [3]
+    assert list(feed.watch(game, 4, Context())) == []
+
+
+def test_watchers_are_capped():
+    feed = DrawFeed(max_watchers=1)
+    game = Game("g1", "jogo")
+    game.draw(7)
+    first = feed.watch(game, 0, Context())
+    assert next(first).number == 7
+
+    context = Context()
+    with pytest.raises(Aborted):
+        next(feed.watch(game, 0, context))
+    assert context.code == grpc.StatusCode.RESOURCE_EXHAUSTED
+    first.close()
+    assert feed._watchers == 0
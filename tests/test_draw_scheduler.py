@@ -0,0 +1,26 @@
+from draw_scheduler import DrawScheduler
+from game_service import Game
+
+
+def test_finished_game_is_not_drawn_again():
+    # Entrada já no heap quando o bingo foi confirmado
+    game = Game("g1", "jogo")
+    game.winner = "p1"
+    scheduler = DrawScheduler()
+    scheduler.run_due([(0.0, 0, 1.0, game)])
+    assert game.drawn_numbers == []
+    assert len(scheduler) == 0
+
+
+def test_first_draws_are_spread_over_the_interval():
+    now = 100.0
+    scheduler = DrawScheduler(clock=lambda: now)
+    for i in range(1000):
+        scheduler.schedule(Game(str(i), "jogo"), 1.0)
+    dues = sorted(entry[0] for entry in scheduler._heap)
+    assert now < dues[0] and dues[-1] <= now + 1.0
+    # Nada de lote: nenhum milissegundo concentra muito mais que a média (1 jogo/ms)
+    per_ms = {}
+    for due in dues:
+        per_ms[int((due - now) * 1000)] = per_ms.get(int((due - now) * 1000), 0) + 1
+    assert max(per_ms.values()) < 20
@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+
+from idempotency import METADATA_KEY, IdempotencyInterceptor
+from load_shedding import LoadSheddingInterceptor, limiter_from_env
+
+
+def test_replays_release_the_load_shedder_slot():
+    # Mesma ordem do GameService: o load shedder por fora do cache
+    shedder = LoadSheddingInterceptor(limiter_from_env({}, workers=10), metrics_prefix="test_replay_")
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         interceptors=[shedder, IdempotencyInterceptor(("Create",))])
+    runs = []
+    lock = threading.Lock()
+
+    def create(request, context):
+        with lock:
+            runs.append(request)
+        return b"game-1"
+
+    server.add_generic_rpc_handlers([grpc.method_handlers_generic_handler(
+        "test.Games", {"Create": grpc.unary_unary_rpc_method_handler(create)})])
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            method = channel.unary_unary("/test.Games/Create")
+            for _ in range(30):
+                assert method(b"jogo", metadata=((METADATA_KEY, "k1"),), timeout=5) == b"game-1"
+            assert len(runs) == 1
+            assert shedder.limiter.inflight == 0
+            assert method(b"outro", timeout=5) == b"game-1"
+    finally:
+        server.stop(None)
+
+
+def test_duplicate_of_a_running_request_is_aborted_quickly():
+    release = threading.Event()
+
+    def create(request, context):
+        release.wait(5)
+        return b"game-1"
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4),
+                         interceptors=[IdempotencyInterceptor(("Create",), in_progress_wait=0.1)])
+    server.add_generic_rpc_handlers([grpc.method_handlers_generic_handler(
+        "test.Games", {"Create": grpc.unary_unary_rpc_method_handler(create)})])
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            method = channel.unary_unary("/test.Games/Create")
+            metadata = ((METADATA_KEY, "k1"),)
+            original = method.future(b"jogo", metadata=metadata)
+            time.sleep(0.1)
+
+            # Sem deadline: antes esperava até 60 s presa num worker
+            started = time.monotonic()
+            with pytest.raises(grpc.RpcError) as error:
+                method(b"jogo", metadata=metadata)
+            assert error.value.code() == grpc.StatusCode.ABORTED
+            assert time.monotonic() - started < 1
+
+            release.set()
+            assert original.result(timeout=5) == b"game-1"
+            assert method(b"jogo", metadata=metadata, timeout=5) == b"game-1"
+    finally:
+        server.stop(None)
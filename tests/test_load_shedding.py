@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+
+from load_shedding import LoadSheddingInterceptor, limiter_from_env
+
+WORKERS = 10
+
+
+def _handler(delay):
+    def behavior(request, context):
+        time.sleep(delay)
+        return request
+
+    return grpc.unary_unary_rpc_method_handler(behavior)
+
+
+def test_sixteen_clients_are_not_shed():
+    # Dez workers e dezesseis clientes em laço fechado: fila de no máximo seis,
+    # carga normal. Um método rápido e um lento juntos, como DrawNumber e
+    # MarkNumber (que chama o ValidationService).
+    shedder = LoadSheddingInterceptor(limiter_from_env({}, workers=WORKERS), metrics_prefix="test_sixteen_")
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=WORKERS), interceptors=[shedder])
+    server.add_generic_rpc_handlers([grpc.method_handlers_generic_handler(
+        "test.Bench", {"Fast": _handler(0), "Slow": _handler(0.005)})])
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    errors = []
+    calls = [0]
+    deadline = time.monotonic() + 2.0
+
+    def client(index):
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            method = channel.unary_unary("/test.Bench/" + ("Slow" if index % 2 else "Fast"))
+            while time.monotonic() < deadline:
+                try:
+                    method(b"x", timeout=5)
+                    calls[0] += 1
+                except grpc.RpcError as e:
+                    errors.append(e.code())
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.stop(None)
+
+    assert errors == []
+    assert calls[0] > 100
+    assert shedder.limiter.limit >= WORKERS
+    assert shedder.limiter.inflight == 0
+
+
+def test_limit_never_drops_below_workers():
+    limiter = limiter_from_env({"CONCURRENCY_LIMIT_INITIAL": "4", "CONCURRENCY_LIMIT_MIN": "1"}, workers=WORKERS)
+    assert limiter.limit == WORKERS
+
+    # Fila muito acima do tolerado: só admite, ninguém chega a um worker
+    tokens = [limiter.try_acquire() for _ in range(WORKERS - 1)]
+    for token in tokens:
+        limiter._last_decrease = 0.0
+        limiter._queue = 1000.0
+        limiter.release(token)
+    assert limiter.limit == WORKERS
+
+
+def test_calls_over_the_limit_are_rejected():
+    limiter = limiter_from_env({"CONCURRENCY_LIMIT_MIN": "1", "CONCURRENCY_LIMIT_MAX": "1"}, workers=1)
+    shedder = LoadSheddingInterceptor(limiter, metrics_prefix="test_over_limit_")
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), interceptors=[shedder])
+    server.add_generic_rpc_handlers([grpc.method_handlers_generic_handler(
+        "test.Bench", {"Slow": _handler(0.5)})])
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    with grpc.insecure_channel(f"localhost:{port}") as channel:
+        method = channel.unary_unary("/test.Bench/Slow")
+        first = method.future(b"x", timeout=5)
+        time.sleep(0.1)
+        try:
+            method(b"x", timeout=5)
+            code = grpc.StatusCode.OK
+        except grpc.RpcError as e:
+            code = e.code()
+        assert first.result() == b"x"
+    server.stop(None)
+
+    assert code == grpc.StatusCode.RESOURCE_EXHAUSTED
+    assert limiter.inflight == 0
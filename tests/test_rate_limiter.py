@@ -0,0 +1,19 @@
+from rate_limiter import PLAYER, RateLimiter, limiter_from_env
+
+
+def test_check_bingo_has_its_own_budget():
+    now = [0.0]
+    limiter = RateLimiter(player_rate=1, player_burst=3, bingo_rate=1, bingo_burst=2, clock=lambda: now[0])
+    for _ in range(3):
+        assert limiter.check('MarkNumber', 'p1', 'g1') is None
+    assert limiter.check('MarkNumber', 'p1', 'g1') == PLAYER
+
+    # Marcações esgotaram o bucket do jogador, mas o bingo ainda passa
+    assert limiter.check('CheckBingo', 'p1', 'g1') is None
+    assert limiter.check('CheckBingo', 'p1', 'g1') is None
+    assert limiter.check('CheckBingo', 'p1', 'g1') == PLAYER
+
+
+def test_rate_limit_can_be_disabled():
+    assert limiter_from_env({'RATE_LIMIT_ENABLED': '0'}) is None
+    assert limiter_from_env({}) is not None
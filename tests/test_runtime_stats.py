@@ -0,0 +1,25 @@
+from prometheus_client import REGISTRY
+
+import runtime_stats
+from runtime_stats import RuntimeStats
+
+
+def test_scrape_reads_cached_bytes_without_walking_structures(monkeypatch):
+    walks = []
+    real_approx_bytes = runtime_stats.approx_bytes
+    monkeypatch.setattr(runtime_stats, 'approx_bytes',
+                        lambda *args, **kwargs: walks.append(args) or real_approx_bytes(*args, **kwargs))
+    stats = RuntimeStats(metrics_prefix='test_sizer_', bytes_interval=0)
+    games = {f"g{i}": {"players": list(range(100))} for i in range(10)}
+    stats.track('games', lambda: games)
+
+    assert REGISTRY.get_sample_value('test_sizer_state_entries', {'structure': 'games'}) == 10
+    assert REGISTRY.get_sample_value('test_sizer_state_approx_bytes', {'structure': 'games'}) is None
+    assert not walks
+
+    stats.refresh_bytes()
+    assert len(walks) == 1
+    assert REGISTRY.get_sample_value('test_sizer_state_approx_bytes', {'structure': 'games'}) > 0
+    # /debug/state continua medindo na hora
+    assert stats.snapshot()["structures"]["games"]["approx_bytes"] > 0
+    assert len(walks) == 2
@@ -0,0 +1,98 @@
+import multiprocessing
+
+import pytest
+
+import bingo_pb2
+import bitmap
+import shm_store
+from shm_store import SharedCardStore, StoreFull
+from validation_service import ValidationServiceServicer
+
+CARD = list(range(1, 25))
+PATTERNS = [bingo_pb2.ROW, bingo_pb2.CORNERS]
+
+ctx = multiprocessing.get_context('fork')
+
+
+@pytest.fixture
+def store():
+    store = SharedCardStore.create(8, ctx.Lock())
+    yield store
+    store.close(unlink=True)
+
+
+def register(servicer, player_id, card=CARD):
+    servicer.register_card(player_id, card, PATTERNS)
+
+
+def version(store, player_id):
+    return store._buf[store._find(player_id.encode())]
+
+
+def test_get_matches_the_single_process_format(store):
+    single = ValidationServiceServicer()
+    shared = ValidationServiceServicer(store=store)
+    for servicer in (single, shared):
+        register(servicer, "p1")
+        assert servicer.mark("p1", 1)
+        assert servicer.mark("p1", 24)
+
+    expected = dict(single.players["p1"])
+    del expected["patterns"]  # só a replicação usa, e ela não roda com vários workers
+    assert store.get("p1") == expected
+    assert store.get("p1")["marked"] == bitmap.numbers_mask([1, 24])
+    assert "p1" in store and "p2" not in store
+    assert store.get("p2") is None and len(store) == 1
+
+
+def test_mark_outside_the_card_is_refused(store):
+    register(ValidationServiceServicer(store=store), "p1", list(range(30, 54)))
+    assert not store.mark("p1", 1)
+    assert not store.mark("p1", 0)
+    assert not store.mark("p1", 76)
+    assert not store.mark("desconhecido", 30)
+    assert store.mark("p1", 30)
+    assert store.get("p1")["marked"] == bitmap.numbers_mask([30])
+
+
+def test_register_again_resets_marks_and_bumps_the_version(store):
+    servicer = ValidationServiceServicer(store=store)
+    register(servicer, "p1")
+    assert version(store, "p1") == 2
+    store.mark("p1", 5)
+
+    register(servicer, "p1", list(range(30, 54)))
+    assert version(store, "p1") == 4
+    player = store.get("p1")
+    assert player["marked"] == 0
+    assert player["card"] == list(range(30, 54))
+    assert len(store) == 1
+
+    # A versão é um byte: depois de 254 volta para 2 (par, nunca 0 = vazio)
+    seen = []
+    for _ in range(130):
+        register(servicer, "p1")
+        seen.append(version(store, "p1"))
+    assert all(v and v % 2 == 0 for v in seen)
+    assert seen[seen.index(254) + 1] == 2
+    assert shm_store._next_version(254) == (255, 2)
+
+
+def test_full_table_raises_store_full(store):
+    servicer = ValidationServiceServicer(store=store)
+    for i in range(store.capacity):
+        register(servicer, f"p{i}")
+    with pytest.raises(StoreFull):
+        register(servicer, "outro")
+    # Quem já tem slot continua podendo se registrar de novo
+    register(servicer, "p0")
+    assert len(store) == store.capacity
+
+
+def test_mark_in_forked_worker_is_seen_by_the_parent(store):
+    register(ValidationServiceServicer(store=store), "p1")
+    child = ctx.Process(target=store.mark, args=("p1", 7))
+    child.start()
+    child.join(timeout=10)
+    assert child.exitcode == 0
+    assert store.get("p1")["marked"] == bitmap.numbers_mask([7])
@@ -0,0 +1,144 @@
+import time
+
+import grpc
+import pytest
+
+import bingo_pb2
+import validation_client
+from game_service import GameServiceServicer
+from validation_client import CircuitBreaker, DeadlineExhausted, DeferredQueueFull, LocalRpcError, ValidationClient
+
+
+class Unavailable(LocalRpcError):
+    status_code = grpc.StatusCode.UNAVAILABLE
+
+
+class Shed(LocalRpcError):
+    status_code = grpc.StatusCode.RESOURCE_EXHAUSTED
+
+
+class FlakyStub:
+    """Stub do ValidationService que responde ``error`` (UNAVAILABLE) enquanto ``down``."""
+
+    def __init__(self, error=Unavailable):
+        self.down = False
+        self.error = error
+        self.received = []
+
+    def __getattr__(self, method):
+        def call(request, timeout=None):
+            if self.down:
+                raise self.error(method)
+            self.received.append((method, request))
+            return method
+
+        return call
+
+
+def _wait_drained(client, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while (client.deferred or client._replay_lock.locked()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_writes_failing_below_threshold_are_replayed_in_order():
+    stub = FlakyStub()
+    client = ValidationClient(stub, breaker=CircuitBreaker(failure_threshold=5))
+
+    stub.down = True
+    assert client.call_or_defer('RegisterCard', 'card-1') is None
+    # Circuito ainda fechado, mas a marcação não passa na frente do registro
+    stub.down = False
+    assert client.call_or_defer('ValidateNumber', 'mark-1') is None
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+    _wait_drained(client)
+    assert stub.received == [('RegisterCard', 'card-1'), ('ValidateNumber', 'mark-1')]
+    assert client.call_or_defer('ValidateNumber', 'mark-2') == 'ValidateNumber'
+
+
+def test_replay_keeps_the_write_when_the_service_fails_again():
+    stub = FlakyStub()
+    client = ValidationClient(stub, breaker=CircuitBreaker(failure_threshold=5))
+    client.defer('RegisterCard', 'card-1')
+
+    stub.down = True
+    client._drain_deferred()
+    assert list(client.deferred) == [('RegisterCard', 'card-1')]
+
+    stub.down = False
+    client._drain_deferred()
+    assert not client.deferred
+    assert stub.received == [('RegisterCard', 'card-1')]
+
+
+class Aborted(Exception):
+    pass
+
+
+class Context:
+    def __init__(self, remaining=None):
+        self.remaining = remaining
+
+    def time_remaining(self):
+        return self.remaining
+
+    def abort(self, code, details):
+        self.code = code
+        raise Aborted(details)
+
+
+def test_shed_writes_are_deferred_and_replayed_with_backoff(monkeypatch):
+    monkeypatch.setattr(validation_client, 'REPLAY_BACKOFF_MIN', 0.01)
+    stub = FlakyStub(error=Shed)
+    client = ValidationClient(stub, breaker=CircuitBreaker(failure_threshold=1))
+
+    stub.down = True
+    assert client.call_or_defer('RegisterCard', 'card-1') is None
+    assert client.call_or_defer('ValidateNumber', 'mark-1') is None
+    # Descarte de carga não abre o circuito
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    time.sleep(0.05)
+    assert list(client.deferred)[0] == ('RegisterCard', 'card-1')
+
+    stub.down = False
+    _wait_drained(client)
+    assert stub.received == [('RegisterCard', 'card-1'), ('ValidateNumber', 'mark-1')]
+
+
+def test_full_queue_rejects_new_writes_instead_of_dropping_old_ones():
+    stub = FlakyStub()
+    client = ValidationClient(stub, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+                              max_deferred=2)
+    stub.down = True
+    client.call_or_defer('RegisterCard', 'card-1')
+    client.call_or_defer('ValidateNumber', 'mark-1')
+
+    with pytest.raises(DeferredQueueFull) as error:
+        client.call_or_defer('ValidateNumber', 'mark-2')
+    assert error.value.code() == grpc.StatusCode.UNAVAILABLE
+    assert list(client.deferred) == [('RegisterCard', 'card-1'), ('ValidateNumber', 'mark-1')]
+
+
+def test_caller_deadline_is_not_deferred():
+    client = ValidationClient(FlakyStub())
+    with pytest.raises(DeadlineExhausted):
+        client.call_or_defer('RegisterCard', 'card-1', Context(remaining=0))
+    assert not client.deferred
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_register_player_fails_when_the_card_is_not_registered():
+    stub = FlakyStub()
+    client = ValidationClient(stub, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+                              max_deferred=0)
+    servicer = GameServiceServicer(validation=client)
+    context = Context()
+    game_id = servicer.CreateGame(bingo_pb2.CreateGameRequest(game_name="jogo"), context).game_id
+
+    stub.down = True
+    with pytest.raises(Aborted):
+        servicer.RegisterPlayer(bingo_pb2.RegisterPlayerRequest(game_id=game_id, player_name="p1"), context)
+    assert context.code == grpc.StatusCode.UNAVAILABLE
+    game = servicer.games[game_id]
+    assert not game.players and not game.card_keys and not servicer.player_games
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import grpc
+import pytest
+
+import bingo_pb2
+from replication import MARK, REGISTER, ReplicaFollower, ReplicationLog
+from validation_service import ValidationServiceServicer
+
+CARD = list(range(1, 25))
+
+
+class Aborted(Exception):
+    pass
+
+
+class Context:
+    def abort(self, code, details):
+        self.code = code
+        raise Aborted(details)
+
+
+class SlowLog(ReplicationLog):
+    """Demora para gravar o REGISTER: abre a janela entre o estado e o log."""
+
+    def append(self, op, *args):
+        if op == REGISTER:
+            time.sleep(0.001)
+        super().append(op, *args)
+
+
+class FreshReplica:
+    def fresh(self):
+        return True
+
+
+def test_replica_answers_not_found_for_unknown_player():
+    replica = ValidationServiceServicer(replica=FreshReplica())
+    context = Context()
+    with pytest.raises(Aborted):
+        replica.GetCard(bingo_pb2.GetCardRequest(player_id="novo"), context)
+    assert context.code == grpc.StatusCode.NOT_FOUND
+
+    # No primário continua a resposta vazia
+    primary = ValidationServiceServicer(log=ReplicationLog())
+    assert list(primary.GetCard(bingo_pb2.GetCardRequest(player_id="novo"), Context()).card_numbers) == []
+
+
+def test_log_order_matches_state_under_concurrent_writes():
+    primary = ValidationServiceServicer(log=SlowLog())
+    players = [f"p{i}" for i in range(50)]
+
+    def register():
+        for player_id in players:
+            primary.register_card(player_id, CARD, [bingo_pb2.BLACKOUT])
+
+    def mark():
+        for player_id in players:
+            while not primary.mark(player_id, 7):
+                time.sleep(0)
+
+    threads = [threading.Thread(target=register), threading.Thread(target=mark)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Reaplicar o log (como a réplica faz) dá o mesmo estado do primário
+    replica = ValidationServiceServicer()
+    for _, op, args in primary.log._entries:
+        if op == REGISTER:
+            replica.register_card(*args)
+        elif op == MARK:
+            replica.mark(*args)
+    assert {p: replica.players[p]["marked"] for p in players} == {p: primary.players[p]["marked"] for p in players}
+
+
+class StreamContext(Context):
+    def is_active(self):
+        return True
+
+
+def test_primary_refuses_replicas_over_the_cap():
+    log = ReplicationLog(max_streams=1)
+    primary = ValidationServiceServicer(log=log)
+    request = bingo_pb2.ReplicateRequest()
+
+    first = primary.Replicate(request, StreamContext())
+    assert next(first).reset
+
+    context = StreamContext()
+    with pytest.raises(Aborted):
+        next(primary.Replicate(request, context))
+    assert context.code == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+    first.close()
+    assert next(primary.Replicate(request, StreamContext())).reset
+
+
+class BusyLog(ReplicationLog):
+    """Uma escrita nova chega logo depois de cada leitura do log."""
+
+    def _read(self, seq):
+        read = super()._read(seq)
+        self.append(MARK, "p1", 1)
+        return read
+
+
+def test_replica_keeping_up_under_constant_writes_stays_fresh():
+    log = BusyLog(batch_size=10)
+    log.append(REGISTER, "p1", CARD, (bingo_pb2.BLACKOUT,))
+    stream = log.stream(bingo_pb2.ReplicateRequest(epoch=log.epoch, from_seq=1), {}, StreamContext())
+    follower = ReplicaFollower("primario:50052", ValidationServiceServicer())
+
+    for _ in range(5):
+        follower.apply(next(stream))
+    assert follower.fresh()
+    stream.close()
@@ -0,0 +1,99 @@
+import pytest
+
+import bingo_pb2
+import bitmap
+import win_patterns
+from validation_service import ValidationServiceServicer
+
+# Cartela em ordem de linha sem a casa FREE: casa c tem o número c + 1 antes
+# do centro e c depois dele (a casa 12 não tem número)
+CARD = list(range(1, 25))
+
+
+def cell_number(cell):
+    return cell + 1 if cell < win_patterns.FREE_CELL else cell
+
+
+def cells_mask(cells):
+    return bitmap.numbers_mask(cell_number(c) for c in cells if c != win_patterns.FREE_CELL)
+
+
+ROW_CELLS = [[r * 5 + c for c in range(5)] for r in range(5)]
+COLUMN_CELLS = [[r * 5 + c for r in range(5)] for c in range(5)]
+
+
+@pytest.mark.parametrize("pattern, cells", [
+    (bingo_pb2.ROW, ROW_CELLS),
+    (bingo_pb2.COLUMN, COLUMN_CELLS),
+    (bingo_pb2.DIAGONAL, [[0, 6, 12, 18, 24], [4, 8, 12, 16, 20]]),
+    (bingo_pb2.CORNERS, [[0, 4, 20, 24]]),
+    (bingo_pb2.BLACKOUT, [range(25)]),
+])
+def test_each_pattern_maps_to_its_cells(pattern, cells):
+    masks = win_patterns.build_masks(CARD, [pattern])
+    assert sorted(masks) == sorted((cells_mask(c), pattern) for c in cells)
+
+    for line in cells:
+        marked = cells_mask(line)
+        assert win_patterns.match(marked, masks) == pattern
+        # Sem qualquer número da linha o padrão não fecha (FREE não conta como marcado)
+        missing = next(cell_number(c) for c in line if c != win_patterns.FREE_CELL)
+        assert win_patterns.match(marked & ~(1 << missing), masks) is None
+
+
+def test_free_cell_completes_lines_through_the_center():
+    masks = win_patterns.build_masks(CARD, [bingo_pb2.ROW])
+    center_row = cells_mask(ROW_CELLS[2])
+    assert bin(center_row).count("1") == 4
+    assert win_patterns.match(center_row, masks) == bingo_pb2.ROW
+
+
+def test_masks_containing_another_mask_are_dropped():
+    masks = win_patterns.build_masks(CARD, [bingo_pb2.BLACKOUT, bingo_pb2.ROW])
+    # A cartela cheia contém todas as linhas: nunca seria consultada
+    assert [pattern for _, pattern in masks] == [bingo_pb2.ROW] * 5
+
+    masks = win_patterns.build_masks(CARD, [bingo_pb2.CORNERS, bingo_pb2.DIAGONAL])
+    sizes = [bin(mask).count("1") for mask, _ in masks]
+    assert sizes == sorted(sizes)
+    assert {pattern for _, pattern in masks} == {bingo_pb2.CORNERS, bingo_pb2.DIAGONAL}
+
+
+def test_unknown_or_missing_patterns_fall_back_to_blackout():
+    full = ((bitmap.numbers_mask(CARD), bingo_pb2.BLACKOUT),)
+    assert win_patterns.build_masks(CARD, []) == full
+    assert win_patterns.build_masks(CARD, [bingo_pb2.WIN_PATTERN_UNSPECIFIED]) == full
+
+
+def test_cards_outside_the_5x5_layout_only_win_by_blackout():
+    card = [3, 17, 40, 52, 70]
+    masks = win_patterns.build_masks(card, [bingo_pb2.ROW, bingo_pb2.CORNERS])
+    assert masks == ((bitmap.numbers_mask(card), bingo_pb2.BLACKOUT),)
+    assert win_patterns.match(bitmap.numbers_mask(card[:-1]), masks) is None
+    assert win_patterns.match(bitmap.numbers_mask(card), masks) == bingo_pb2.BLACKOUT
+
+
+class Context:
+    def abort(self, code, details):
+        raise AssertionError(details)
+
+
+def test_validate_bingo_only_counts_marks_that_were_drawn():
+    servicer = ValidationServiceServicer()
+    servicer.register_card("p1", CARD, [bingo_pb2.ROW])
+    first_row = [cell_number(c) for c in ROW_CELLS[0]]
+    for number in first_row:
+        assert servicer.ValidateNumber(bingo_pb2.ValidateNumberRequest(player_id="p1", number=number), Context()).success
+
+    def validate(**drawn):
+        return servicer.ValidateBingo(bingo_pb2.ValidateBingoRequest(player_id="p1", **drawn), Context())
+
+    drawn = bitmap.numbers_mask(first_row + [60, 75])
+    response = validate(numbers_bitmap=bitmap.encode(drawn))
+    assert response.bingo and response.pattern == bingo_pb2.ROW
+    assert validate(numbers=first_row).bingo
+
+    # Marcou um número que não saiu: a linha não vale
+    not_drawn = drawn & ~(1 << first_row[2])
+    assert not validate(numbers_bitmap=bitmap.encode(not_drawn)).bingo
+    assert not validate(numbers=first_row[:4]).bingo